@@ -0,0 +1,94 @@
+"""Compare fixed and adaptive throttling while the mock server degrades and recovers.
+
+    python -m benchmarks.bench_adaptive --per-phase 400 --workers 16
+
+Each mode scrapes the same registrations in three phases: a healthy server, an
+overloaded one (slow, serving only --capacity concurrent requests and failing
+the rest with 503) and a recovered one. The mock server runs in its own
+process so its response times are not skewed by the scraper's threads.
+"""
+
+import argparse
+import time
+
+import requests
+
+from benchmarks.mock_server import spawn
+from results import ResultScraper, WorkerPool
+from store import FAILED
+from throttle import CircuitBreaker
+
+
+def phases(args):
+    """(name, latency, capacity, error_rate) per phase"""
+    return [
+        ("healthy", args.latency, None, 0.0),
+        ("degraded", args.latency * 5, args.capacity, args.error_rate),
+        ("recovered", args.latency, None, 0.0),
+    ]
+
+
+def start_server(args):
+    """Start the mock server process, return (process, url)"""
+    last = args.start + 3 * args.per_phase - 1
+    return spawn("--students", args.start, last, "--seed", args.seed)
+
+
+def control(url, **settings):
+    return requests.get(f"{url}/_control", params=settings, timeout=5).json()
+
+
+def run_mode(adaptive, args):
+    process, url = start_server(args)
+    scraper = ResultScraper(base_url=url, workers=args.workers, rate=args.rate, burst=args.workers,
+                            adaptive=adaptive)
+    if adaptive:  # Shorter pauses than the production default so the benchmark stays quick
+        scraper.breaker = CircuitBreaker(cooldown=args.cooldown, max_cooldown=args.cooldown * 8,
+                                         log=scraper.log_control)
+
+    rows = []
+    try:
+        with WorkerPool(scraper) as pool:
+            for number, (name, latency, capacity, error_rate) in enumerate(phases(args)):
+                control(url, latency=latency, capacity=capacity or 0, error_rate=error_rate, reset=1)
+                first = args.start + number * args.per_phase
+                started = time.perf_counter()
+                results = list(pool.map(range(first, first + args.per_phase), "B.Sc", "2023"))
+                seconds = time.perf_counter() - started
+                failed = sum(1 for result in results if result["Name"] == FAILED)
+                counts = control(url)
+                rows.append((name, len(results) - failed, failed, counts["requests"], counts["errors"], seconds))
+    finally:
+        scraper.close()
+        process.terminate()
+        process.wait()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", type=int, default=20230000000)
+    parser.add_argument("--per-phase", type=int, default=400, help="Registrations scraped per phase")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=400.0, help="Rate limit for the local server")
+    parser.add_argument("--latency", type=float, default=0.01, help="Healthy response time in seconds")
+    parser.add_argument("--capacity", type=int, default=3, help="Concurrent requests served while degraded")
+    parser.add_argument("--error-rate", type=float, default=0.05, help="Random 503 share while degraded")
+    parser.add_argument("--cooldown", type=float, default=2.0, help="Circuit breaker pause in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    results = {}
+    for mode, adaptive in (("fixed", False), ("adaptive", True)):
+        print(f"--- {mode} ---")
+        results[mode] = run_mode(adaptive, args)
+
+    print(f"{'mode':<10}{'phase':<11}{'ok':>6}{'failed':>8}{'requests':>10}{'503s':>7}{'seconds':>9}{'ok/s':>8}")
+    for mode, rows in results.items():
+        for name, ok, failed, served, errors, seconds in rows:
+            print(f"{mode:<10}{name:<11}{ok:>6}{failed:>8}{served:>10}{errors:>7}{seconds:>9.2f}"
+                  f"{ok / seconds:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Load time of a results CSV against the memory-mapped columnar format.
+
+    python -m benchmarks.bench_columnar --rows 1m
+
+Times what each ranking engine does before it can rank: the python engine's
+per-row CSV load, the numpy engine's bulk CSV load, and the columnar load.
+Each load runs in a fresh interpreter, so the page cache is the only thing shared.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import parse_rows, write_results_csv
+from columnar import csv_to_columnar
+
+LOADERS = ("python csv", "numpy csv", "columnar")
+
+
+def run_single(loader, path):
+    """Load `path` with one loader in this process and print the timing as JSON"""
+    started = time.perf_counter()
+    if loader == "python csv":
+        from rank import RankingCreator
+        count = len(RankingCreator(path).load_student_data())
+    else:
+        from fastrank import ColumnarResults
+        load = ColumnarResults.from_columnar if loader == "columnar" else ColumnarResults.from_csv
+        count = len(load(path))
+    print(json.dumps({"seconds": time.perf_counter() - started, "students": count}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=parse_rows, default=parse_rows("1m"), help="Row count or 1k/100k/1m")
+    parser.add_argument("--csv", help="Use an existing results CSV instead of generating one")
+    parser.add_argument("--single", nargs=2, metavar=("LOADER", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(*args.single)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = args.csv or write_results_csv(os.path.join(tmp, "nu_results.csv"), args.rows)
+        started = time.perf_counter()
+        columnar_dir, rows = csv_to_columnar(csv_path, os.path.join(tmp, "nu_results.cols"))
+        convert = time.perf_counter() - started
+        sizes = {
+            "csv": os.path.getsize(csv_path),
+            "columnar": sum(entry.stat().st_size for entry in os.scandir(columnar_dir)),
+        }
+        print(f"{rows} rows: CSV {sizes['csv'] / 1e6:.1f} MB, columnar {sizes['columnar'] / 1e6:.1f} MB, "
+              f"converted in {convert:.2f}s")
+
+        print(f"{'loader':<14}{'students':>10}{'seconds':>10}{'speedup':>10}")
+        baseline = None
+        for loader in LOADERS:
+            path = columnar_dir if loader == "columnar" else csv_path
+            command = [sys.executable, "-m", "benchmarks.bench_columnar", "--single", loader, path]
+            result = json.loads(subprocess.run(command, capture_output=True, text=True, check=True).stdout)
+            baseline = baseline or result["seconds"]
+            print(f"{loader:<14}{result['students']:>10}{result['seconds']:>10.2f}"
+                  f"{baseline / result['seconds']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
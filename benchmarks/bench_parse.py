@@ -0,0 +1,135 @@
+"""Check the result-page parsers against the golden pages and compare their throughput.
+
+    python -m benchmarks.bench_parse --pages 5000
+
+The baseline is the old text path: render the page to text, then scan the lines.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from html.parser import HTMLParser
+
+from benchmarks.mock_server import PAGES_DIR, render_result
+from fetchers import NOT_REGISTERED_MARKER
+from result_parser import PARSERS, UnrecognizedPage, etree, parse_result
+from results import ResultScraper
+
+GOLDEN = os.path.join(PAGES_DIR, "golden.json")
+
+
+class _TextParser(HTMLParser):
+    """Render HTML to text roughly the way Selenium's element.text does"""
+
+    BLOCK_TAGS = {"p", "div", "br", "tr", "table", "li", "ul", "ol", "h1", "h2", "h3",
+                  "h4", "h5", "h6", "form", "center", "hr", "tbody", "thead"}
+    CELL_TAGS = {"td", "th"}
+    SKIP_TAGS = {"script", "style", "head", "title"}
+
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self._current = []
+        self._skip = 0
+
+    def _break(self):
+        line = " ".join(" ".join(self._current).split())
+        if line:
+            self.lines.append(line)
+        self._current = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag in self.BLOCK_TAGS:
+            self._break()
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in self.BLOCK_TAGS:
+            self._break()
+        elif tag in self.CELL_TAGS:
+            self._current.append(" ")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self._current.append(data)
+
+    def text(self):
+        self._break()
+        return "\n".join(self.lines)
+
+
+def html_to_text(html):
+    """Render page HTML to the line-oriented text extract_result_data expects (the old text path)"""
+    parser = _TextParser()
+    parser.feed(html)
+    parser.close()
+    return parser.text()
+
+
+def classify(source, reg_no, parse):
+    """Result dict, or the status string the scraper would record"""
+    if NOT_REGISTERED_MARKER in source:
+        return "not_registered"
+    try:
+        return parse(source, reg_no)
+    except UnrecognizedPage:
+        return "unrecognized"
+
+
+def check_golden(parsers):
+    """Compare every parser with the golden file, return the number of mismatches"""
+    with open(GOLDEN, encoding="utf-8") as file:
+        golden = json.load(file)
+    failures = 0
+    for name, expected in golden.items():
+        with open(os.path.join(PAGES_DIR, name), encoding="utf-8") as file:
+            source = file.read()
+        for label, parse in parsers.items():
+            if classify(source, name[:-len(".html")], parse) != expected:
+                print(f"MISMATCH {label}: {name}")
+                failures += 1
+    print(f"Golden pages: {len(golden)} pages, {failures} mismatch(es)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=5000, help="Synthetic result pages to parse")
+    args = parser.parse_args()
+
+    scraper = ResultScraper()
+    parsers = {"text (baseline)": lambda source, reg_no: scraper.extract_result_data(html_to_text(source), reg_no)}
+    for name in PARSERS:
+        if name == "lxml" and etree is None:
+            print("lxml is not installed, skipping the lxml parser")
+            continue
+        parsers[name] = lambda source, reg_no, name=name: parse_result(source, reg_no, name)
+
+    failures = check_golden({label: parse for label, parse in parsers.items() if label in PARSERS})
+
+    pages = [(str(reg_no), render_result(reg_no)) for reg_no in range(20230000000, 20230000000 + args.pages)]
+    results = {}
+    print(f"{'parser':<18}{'seconds':>10}{'pages/s':>12}{'speedup':>10}")
+    baseline = None
+    for label, parse in parsers.items():
+        started = time.perf_counter()
+        results[label] = [parse(source, reg_no) for reg_no, source in pages]
+        seconds = time.perf_counter() - started
+        baseline = baseline or seconds
+        print(f"{label:<18}{seconds:>10.2f}{len(pages) / seconds:>12.0f}{baseline / seconds:>9.1f}x")
+
+    expected = results.pop("text (baseline)")
+    for label, parsed in results.items():
+        if parsed != expected:
+            print(f"MISMATCH {label}: output differs from the text path on synthetic pages")
+            failures += 1
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Wall-clock time and peak RSS of PDF report rendering for one large group.
+
+    python -m benchmarks.bench_pdf --students 50000
+
+Each mode runs in a fresh interpreter so peak RSS is measured per mode. --baseline adds
+the old single-document rendering, which is very slow for large groups.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_results_csv
+
+MODES = [
+    ("detailed", 1),
+    ("detailed", None),
+    ("compact", 1),
+    ("compact", None),
+]
+
+
+def run_single(csv_path, output_dir, layout, processes, chunk_size):
+    """Render the reports in this process and print the measurements as JSON"""
+    import rank
+    from rank import RankingCreator, peak_rss_mb
+
+    rank.console.quiet = True
+    creator = RankingCreator(csv_path, output_dir, layout=layout, processes=processes, chunk_size=chunk_size)
+    started = time.perf_counter()
+    creator.generate_rankings()
+    seconds = time.perf_counter() - started
+    main_mb, workers_mb = peak_rss_mb()
+    size = sum(os.path.getsize(os.path.join(output_dir, name)) for name in os.listdir(output_dir))
+    print(json.dumps({"seconds": seconds, "main_mb": main_mb, "workers_mb": workers_mb, "bytes": size}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=50000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--baseline", action="store_true", help="Also time single-document rendering")
+    parser.add_argument("--single", nargs=4, metavar=("CSV", "OUTPUT", "LAYOUT", "PROCESSES"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        csv_path, output_dir, layout, processes = args.single
+        run_single(csv_path, output_dir, layout, int(processes), args.chunk_size)
+        return
+
+    processes = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = write_results_csv(os.path.join(tmp, "nu_results.csv"), args.students,
+                                     groups=["B.Sc"], unregistered=0.0)
+        print(f"One group of {args.students} students, {processes} CPU(s)")
+        print(f"{'layout':<10}{'processes':>10}{'parts of':>10}{'seconds':>10}{'main MB':>10}{'worker MB':>10}{'file MB':>10}")
+        modes = [(layout, mode_processes or processes, args.chunk_size) for layout, mode_processes in MODES]
+        if args.baseline:
+            modes.insert(0, ("detailed", 1, args.students))
+        for layout, mode_processes, chunk_size in modes:
+            output_dir = tempfile.mkdtemp(dir=tmp)
+            command = [sys.executable, "-m", "benchmarks.bench_pdf", "--chunk-size", str(chunk_size),
+                       "--single", csv_path, output_dir, layout, str(mode_processes)]
+            result = json.loads(subprocess.run(command, capture_output=True, text=True, check=True).stdout)
+            workers = f"{result['workers_mb']:.0f}" if mode_processes > 1 and result['workers_mb'] else "-"
+            main_mb = f"{result['main_mb']:.0f}" if result['main_mb'] is not None else "-"
+            print(f"{layout:<10}{mode_processes:>10}{chunk_size:>10}{result['seconds']:>10.1f}{main_mb:>10}{workers:>10}"
+                  f"{result['bytes'] / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Time from the last fetch to finished reports: scrape-then-rank against the streaming pipeline.
+
+    python -m benchmarks.bench_pipeline --registrations 5000
+
+The sequential mode is the old pipeline command: scrape to the CSV, then rank it
+with RankingCreator. The streaming mode ranks every result as it is recorded and
+only renders once the scrape ends. Both scrape the same mock server, which runs
+in its own process; the streamed ranks are checked against ranking the CSV.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.mock_server import spawn
+from jobs import make_job
+import pipeline
+import rank
+import results
+from pipeline import StreamingRanker
+from rank import RankingCreator
+
+
+def run_mode(streaming, url, args, tmp):
+    """(scrape seconds, seconds after the last fetch, ranks or None)"""
+    csv_path = os.path.join(tmp, "streaming" if streaming else "sequential", "nu_results.csv")
+    scraper = results.ResultScraper(csv_path, base_url=url, workers=args.workers, rate=10000, burst=args.workers,
+                                    verbose=False, adaptive=False)
+    creator = RankingCreator(csv_path, os.path.join(os.path.dirname(csv_path), "reports"), layout=args.layout,
+                             processes=args.processes)
+    jobs = [make_job("B.Sc", "2023", args.start, args.start + args.registrations - 1)]
+    ranks = None
+
+    started = time.perf_counter()
+    if streaming:
+        ranker = StreamingRanker(top=0).start()
+        scraper.on_result = ranker.put
+        try:
+            scraper.run_jobs(jobs)
+        finally:
+            ranker.close()
+        scraped = time.perf_counter()
+        ranker.render(creator, csv_path)
+        ranks = {(group, year, exam): [(s.reg, s.rank) for s in students]
+                 for group, year, exam, students in ranker.ranked_groups()}
+    else:
+        scraper.run_jobs(jobs)
+        scraped = time.perf_counter()
+        creator.generate_rankings()
+    finished = time.perf_counter()
+    return scraped - started, finished - scraped, ranks, csv_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", type=int, default=20230000000)
+    parser.add_argument("--registrations", type=int, default=5000, help="Registrations scraped per mode")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock server response time in seconds")
+    parser.add_argument("--layout", choices=rank.LAYOUTS, default="compact")
+    parser.add_argument("--processes", type=int, default=None, help="Report render processes")
+    args = parser.parse_args()
+
+    results.console.quiet = rank.console.quiet = pipeline.console.quiet = True
+    process, url = spawn("--students", args.start, args.start + args.registrations - 1, "--latency", args.latency)
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for label, streaming in (("sequential", False), ("streaming", True)):
+                scrape, tail, ranks, csv_path = run_mode(streaming, url, args, tmp)
+                rows.append((label, scrape, tail))
+            expected = {(group, year, exam): [(s.reg, s.rank) for s in students]
+                        for group, year, exam, students in RankingCreator(csv_path).ranked_groups()}
+    finally:
+        process.terminate()
+        process.wait()
+
+    print(f"{args.registrations} registered students, {args.layout} layout")
+    print(f"{'mode':<12}{'scrape s':>10}{'after last fetch s':>20}{'total s':>10}")
+    for label, scrape, tail in rows:
+        print(f"{label:<12}{scrape:>10.1f}{tail:>20.2f}{scrape + tail:>10.1f}")
+    print(f"Identical ranks: {ranks == expected}")
+    sys.exit(0 if ranks == expected else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compare a linear sweep with sparse-range discovery against the mock server.
+
+    python -m benchmarks.bench_prober --start 20230000000 --size 20000 --bands 5 --band-size 200
+"""
+
+import argparse
+import threading
+import time
+
+from benchmarks.mock_server import MockResultServer, sparse_registrations
+from prober import SparseProber, is_registered
+from results import ResultScraper, WorkerPool
+
+
+def run(fetch, start_reg, end_reg):
+    started = time.perf_counter()
+    found = sum(1 for result in fetch(start_reg, end_reg) if is_registered(result))
+    return found, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", type=int, default=20230000000)
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--bands", type=int, default=5)
+    parser.add_argument("--band-size", type=int, default=200)
+    parser.add_argument("--stride", type=int, default=100)
+    parser.add_argument("--gap", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=2000.0, help="Rate limit for the local server")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    start_reg, end_reg = args.start, args.start + args.size - 1
+    students = sparse_registrations(start_reg, end_reg, args.bands, args.band_size, args.seed)
+    server = MockResultServer(students=students)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    scraper = ResultScraper(base_url=server.url, workers=args.workers, rate=args.rate, burst=args.workers)
+    group, year = "B.Sc", "2023"
+    try:
+        with WorkerPool(scraper) as pool:
+            fetch_many = lambda regs: pool.map(regs, group, year)
+
+            server.request_count = 0
+            linear_found, linear_time = run(lambda a, b: fetch_many(range(a, b + 1)), start_reg, end_reg)
+            linear_requests = server.request_count
+
+            server.request_count = 0
+            prober = SparseProber(fetch_many, args.stride, args.gap, args.workers * 2)
+            probe_found, probe_time = run(prober.scan, start_reg, end_reg)
+            probe_requests = server.request_count
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"Range: {args.size} registrations, {len(students)} registered in {args.bands} bands")
+    print(f"{'mode':<10}{'requests':>10}{'found':>8}{'seconds':>10}{'req/s':>10}")
+    for mode, requests, found, seconds in (("linear", linear_requests, linear_found, linear_time),
+                                          ("discover", probe_requests, probe_found, probe_time)):
+        print(f"{mode:<10}{requests:>10}{found:>8}{seconds:>10.2f}{requests / seconds:>10.0f}")
+    print(f"Requests saved: {prober.saved_requests} ({prober.saved_requests / prober.linear_requests:.1%}), "
+          f"coverage: {probe_found}/{linear_found}")
+
+
+if __name__ == "__main__":
+    main()
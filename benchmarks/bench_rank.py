@@ -0,0 +1,59 @@
+"""Time the python and numpy ranking engines on a synthetic results CSV.
+
+    python -m benchmarks.bench_rank --rows 1m
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import parse_rows, write_results_csv
+from fastrank import ColumnarRanker
+from rank import RankingCreator
+
+
+def python_ranks(csv_path):
+    """Load and rank with RankingCreator, returning {(group, year, exam): [(reg, rank), ...]}"""
+    creator = RankingCreator(csv_path, engine="python")
+    return {(group, year, exam): [(s['Registration No'], s['Rank']) for s in students]
+            for group, year, exam, students in creator.ranked_groups()}
+
+
+def numpy_ranks(csv_path):
+    """Load and rank with the columnar engine, returning {(group, year, exam): [(reg, rank), ...]}"""
+    ranker = ColumnarRanker(csv_path)
+    return {key: list(zip(regs, ranks.tolist())) for key, regs, ranks in ranker.rank_table()}
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=parse_rows, default=parse_rows("1m"), help="Row count or 1k/100k/1m")
+    parser.add_argument("--csv", help="Use an existing results CSV instead of generating one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = args.csv or write_results_csv(os.path.join(tmp, "nu_results.csv"), args.rows)
+        python_time, expected = timed(python_ranks, csv_path)
+        numpy_time, actual = timed(numpy_ranks, csv_path)
+        ranker = ColumnarRanker(csv_path)
+        report_time, _ = timed(lambda: sum(len(students) for *_, students in ranker.ranked_groups()))
+
+    rows = sum(len(ranks) for ranks in expected.values())
+    print(f"Ranked {rows} students in {len(expected)} groups (load + GPA + rank)")
+    print(f"python engine: {python_time:8.2f}s")
+    print(f"numpy engine:  {numpy_time:8.2f}s  ({python_time / numpy_time:.1f}x)")
+    print(f"numpy engine incl. report records: {report_time:8.2f}s")
+    print(f"Identical ranks: {expected == actual}")
+    sys.exit(0 if expected == actual else 1)
+
+
+if __name__ == "__main__":
+    main()
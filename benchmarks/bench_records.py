@@ -0,0 +1,104 @@
+"""Memory and ranking time of StudentRecords against the old per-student dicts.
+
+    python -m benchmarks.bench_records --rows 100k
+
+The baseline is the old load_student_data, which built a ten-key dict with three
+lists of strings per student. Memory is what tracemalloc sees allocated by each load.
+"""
+
+import argparse
+import csv
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic import parse_rows, write_results_csv
+from rank import GRADE_POINTS, RankingCreator
+from records import normalize_grade
+from store import NOT_RECOGNIZED, NOT_REGISTERED
+
+
+def dict_students(csv_path):
+    """The old dict layout"""
+    students = []
+    with open(csv_path, mode='r', encoding='utf-8') as file:
+        for row in csv.DictReader(file):
+            if NOT_REGISTERED in row['Name'] or NOT_RECOGNIZED in row['Name']:
+                continue
+            raw_grades = [g.strip().lower() for g in row['Grades'].split(',')]
+            grades = [normalize_grade(g) for g in raw_grades]
+            courses = [c.strip() for c in row['Courses'].split(',')]
+            if len(courses) != len(grades):
+                continue
+            point = sum(GRADE_POINTS.get(g, -1.00) for g in grades) / len(grades)
+            students.append({
+                'Name': row['Name'], 'Exam Roll': row['Exam Roll'], 'Registration No': row['Registration No'],
+                'Result': row['Result'], 'Courses': courses, 'Grades': grades, 'Raw Grades': raw_grades,
+                'Point': round(point, 2), 'Group': row.get('Group', 'Unknown'), 'Year': row.get('Year', ''),
+                'Exam': row.get('Exam', '')
+            })
+    return students
+
+
+def rank_dicts(students):
+    """The old rank_students"""
+    students.sort(key=lambda x: (-x['Point'], [GRADE_POINTS.get(g, -1.00) for g in x['Grades']]))
+    current_rank = 1
+    for i, student in enumerate(students):
+        if i > 0:
+            prev = students[i - 1]
+            if not (student['Point'] == prev['Point'] and student['Grades'] == prev['Grades']):
+                current_rank = i + 1
+        student['Rank'] = current_rank
+    return students
+
+
+def measure(load):
+    """(students, MB held after loading, load seconds)"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    students = load()
+    seconds = time.perf_counter() - started
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return students, held / 1024 ** 2, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=parse_rows, default=200000, help="Row count or 1k/100k/1m")
+    args = parser.parse_args()
+
+    creator = RankingCreator()
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = write_results_csv(os.path.join(tmp, "nu_results.csv"), args.rows, groups=["B.Sc"])
+        creator.INPUT_CSV = csv_path
+        dicts, dict_mb, dict_load = measure(lambda: dict_students(csv_path))
+        started = time.perf_counter()
+        rank_dicts(dicts)
+        dict_rank = time.perf_counter() - started
+        expected = [(s['Registration No'], s['Rank']) for s in dicts]
+        del dicts
+
+        records, record_mb, record_load = measure(creator.load_student_data)
+        started = time.perf_counter()
+        creator.rank_students(records)
+        record_rank = time.perf_counter() - started
+        actual = [(s['Registration No'], s['Rank']) for s in records]
+
+    count = len(records)
+    print(f"{count} students in one group")
+    print(f"{'layout':<10}{'MB':>10}{'bytes/student':>15}{'load s':>10}{'rank s':>10}")
+    for label, mb, load, ranking in (("dict", dict_mb, dict_load, dict_rank),
+                                     ("record", record_mb, record_load, record_rank)):
+        print(f"{label:<10}{mb:>10.1f}{mb * 1024 ** 2 / max(1, count):>15.0f}{load:>10.2f}{ranking:>10.2f}")
+    print(f"Memory saved: {1 - record_mb / dict_mb:.0%}, identical ranks: {expected == actual}")
+    sys.exit(0 if expected == actual else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Time the single-pass CSV and HTML report writers against PDF rendering for one large group.
+
+    python -m benchmarks.bench_reports --students 100000 --pdf-students 5000
+
+The group is loaded and ranked once; every writer then gets the same ranked list.
+PDF rendering is timed on the first --pdf-students students in one process (in
+parts of --chunk-size, as rank.py renders large groups) and projected to the whole
+group, since rendering 100k students takes many minutes.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import write_results_csv
+from rank import CHUNK_SIZE, RankingCreator
+from report_formats import WRITERS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--pdf-students", type=int, default=5000, help="Students actually rendered to PDF")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = write_results_csv(os.path.join(tmp, "nu_results.csv"), args.students,
+                                     groups=["B.Sc"], unregistered=0.0)
+        started = time.perf_counter()
+        (group, year, exam, students), = RankingCreator(csv_path).ranked_groups()
+        print(f"Loaded and ranked {len(students)} students in {time.perf_counter() - started:.2f}s")
+
+        rows = []
+        for name, write in WRITERS.items():
+            path = os.path.join(tmp, f"report.{name}")
+            started = time.perf_counter()
+            write(students, group, year, path, exam)
+            rows.append((name, len(students), time.perf_counter() - started, os.path.getsize(path)))
+
+        sample = students[:args.pdf_students]
+        for layout in ("compact", "detailed"):
+            creator = RankingCreator(csv_path, os.path.join(tmp, layout), layout=layout, processes=1,
+                                     chunk_size=args.chunk_size)
+            started = time.perf_counter()
+            path = creator.generate_pdf_report(sample, group, year, exam)
+            rows.append((f"pdf {layout}", len(sample), time.perf_counter() - started, os.path.getsize(path)))
+
+    print(f"{'format':<14}{'students':>10}{'seconds':>10}{'students/s':>12}{'MB':>8}{f's for {len(students)}':>14}")
+    for name, count, seconds, size in rows:
+        projected = seconds * len(students) / count
+        print(f"{name:<14}{count:>10}{seconds:>10.2f}{count / seconds:>12.0f}{size / 1e6:>8.1f}{projected:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
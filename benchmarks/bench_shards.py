@@ -0,0 +1,94 @@
+"""Scrape one range as a single process and as N shard processes, then merge and validate the shards.
+
+    python -m benchmarks.bench_shards --shards 4 --registrations 2000 --rate 50
+
+Each process gets its own --rate, standing in for one machine with its own IP and
+politeness limit. The shards run at the same time against one mock server process;
+their stores are merged with shards.py and compared with the single-process store.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.mock_server import spawn
+from shards import ShardMerge, shard_path, parse_shard
+from store import ResultStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def scrape_command(args, url, csv_path, shard=None):
+    command = [sys.executable, "results.py", "--group", "B.Sc", "--year", "2023",
+               "--start", str(args.start), "--end", str(args.start + args.registrations - 1),
+               "--base-url", url, "--workers", str(args.workers), "--rate", str(args.rate),
+               "--burst", str(args.workers), "--csv", csv_path, "--quiet", "--no-adaptive"]
+    if shard is not None:
+        command += ["--shard", f"{shard}/{args.shards}", "--shard-mode", args.mode]
+    return command
+
+
+def stored_rows(path):
+    store = ResultStore(path)
+    try:
+        return sorted((row["Registration No"], row["Name"], row["Grades"]) for row in store.rows())
+    finally:
+        store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", type=int, default=20230000000)
+    parser.add_argument("--registrations", type=int, default=2000)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--mode", choices=("interleaved", "blocked"), default="interleaved")
+    parser.add_argument("--workers", type=int, default=4, help="Workers per process")
+    parser.add_argument("--rate", type=float, default=50.0, help="Requests per second per process")
+    args = parser.parse_args()
+
+    end = args.start + args.registrations - 1
+    process, url = spawn("--synthetic", args.start, end, "--bands", max(1, args.registrations // 1000),
+                         "--band-size", 500)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            single_csv = os.path.join(tmp, "single", "nu_results.csv")
+            started = time.perf_counter()
+            subprocess.run(scrape_command(args, url, single_csv), cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+            single = time.perf_counter() - started
+
+            sharded_csv = os.path.join(tmp, "sharded", "nu_results.csv")
+            started = time.perf_counter()
+            shards = [subprocess.Popen(scrape_command(args, url, sharded_csv, index), cwd=ROOT,
+                                       stdout=subprocess.DEVNULL) for index in range(1, args.shards + 1)]
+            if any(shard.wait() for shard in shards):
+                raise RuntimeError("A shard process failed")
+            sharded = time.perf_counter() - started
+
+            merged_db = os.path.join(tmp, "merged.db")
+            merger = ShardMerge(merged_db)
+            started = time.perf_counter()
+            for index in range(1, args.shards + 1):
+                shard = parse_shard(f"{index}/{args.shards}", args.mode)
+                merger.add(os.path.splitext(shard_path(sharded_csv, shard))[0] + ".db")
+            coverage = merger.validate()
+            merge = time.perf_counter() - started
+            merger.close()
+            identical = stored_rows(merged_db) == stored_rows(os.path.splitext(single_csv)[0] + ".db")
+    finally:
+        process.terminate()
+        process.wait()
+
+    print(f"{args.registrations} registrations, {args.rate:g} requests/s per process")
+    print(f"{'single process:':<24}{single:8.1f}s")
+    print(f"{f'{args.shards} {args.mode} shards:':<24}{sharded:8.1f}s  ({single / sharded:.1f}x)")
+    print(f"{'merge + validate:':<24}{merge:8.2f}s, {len(merger.problems)} problem(s), "
+          f"{sum(row[3] for row in coverage)} missing")
+    print(f"Merged store identical to the single run: {identical}")
+    sys.exit(0 if identical else 1)
+
+
+if __name__ == "__main__":
+    main()
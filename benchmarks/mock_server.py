@@ -0,0 +1,256 @@
+"""Local stand-in for result.nu.ac.bd that serves recorded result pages.
+
+Run from the repository root:
+
+    python -m benchmarks.mock_server --port 8000
+    python results.py --base-url http://127.0.0.1:8000
+
+With --synthetic the server also answers for generated students laid out in
+dense bands across an otherwise unregistered range. --latency, --jitter,
+--error-rate and --capacity slow result requests down and answer a share of
+them (or everything above `capacity` concurrent requests) with 503, to
+exercise the scraper's adaptive throttling. The same settings can be changed
+while the server runs with GET /_control?latency=0.05&capacity=2&reset=1,
+which answers with the current settings and counters as JSON.
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pages")
+GRADES = ["A+", "A", "A-", "B+", "B", "B-", "C+", "C", "D", "F", "Absent"]
+GRADE_WEIGHTS = [6, 10, 12, 14, 14, 12, 10, 8, 6, 5, 3]
+COURSES = ["211501", "211503", "211505", "211507", "211509", "211511", "211513"]
+
+RESULT_TEMPLATE = """<html>
+<head><title>National University Bangladesh - Result</title></head>
+<body>
+<div class="result">
+<table width="100%">
+<tr><td>Name of Student</td><td>{name}</td></tr>
+<tr><td>Exam. Roll</td><td>{roll}</td></tr>
+<tr><td>Registration No</td><td>{reg_no}</td></tr>
+<tr><td>Result</td><td>{result}</td></tr>
+<tr><td colspan="2">Published on: 2024-11-12</td></tr>
+</table>
+<table border="1">
+<tr><th>Course Code</th><th>Obtained Grade</th></tr>
+{rows}
+</table>
+</div>
+</body>
+</html>
+"""
+
+
+def sparse_registrations(start_reg, end_reg, bands=5, band_size=200, seed=1):
+    """Pick `bands` runs of `band_size` consecutive registered numbers inside the range"""
+    rng = random.Random(seed)
+    span = end_reg - start_reg + 1
+    registered = set()
+    for _ in range(bands):
+        first = start_reg + rng.randrange(max(1, span - band_size))
+        registered.update(range(first, min(end_reg, first + band_size - 1) + 1))
+    return registered
+
+
+def render_result(reg_no):
+    """Deterministic synthetic result page for one registration"""
+    rng = random.Random(reg_no)
+    grades = rng.choices(GRADES, weights=GRADE_WEIGHTS, k=rng.randint(4, len(COURSES)))
+    rows = "\n".join(f"<tr><td>{course}</td><td>{grade}</td></tr>" for course, grade in zip(COURSES, grades))
+    failed = any(grade in ("F", "Absent") for grade in grades)
+    return RESULT_TEMPLATE.format(
+        name=f"STUDENT {reg_no}", roll=str(reg_no)[-7:], reg_no=reg_no,
+        result="Failed" if failed else "Passed", rows=rows
+    )
+
+
+class MockResultServer(ThreadingHTTPServer):
+    """HTTP server answering the result form from a directory of saved pages"""
+
+    daemon_threads = True
+
+    def __init__(self, address=("127.0.0.1", 0), pages_dir=PAGES_DIR, students=None,
+                 latency=0.0, jitter=0.0, error_rate=0.0, capacity=None, seed=1):
+        super().__init__(address, _Handler)
+        self.pages_dir = pages_dir
+        self.students = students if students is not None else set()
+        self.form_page = self.read_page("form.html")
+        self.not_registered_page = self.read_page("not_registered.html")
+        self.request_count = 0
+        # Fault injection for result requests; may be changed while the server runs
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.capacity = capacity  # Concurrent result requests served before answering 503
+        self.in_flight = 0
+        self.error_count = 0
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def read_page(self, name):
+        with open(os.path.join(self.pages_dir, name), encoding="utf-8") as file:
+            return file.read()
+
+    def page_for(self, fields):
+        """Return the result page for the submitted form fields"""
+        reg_no = fields.get("reg_no", "")
+        if reg_no.isdigit() and int(reg_no) in self.students:
+            return render_result(int(reg_no))
+        path = os.path.join(self.pages_dir, f"{reg_no}.html")
+        if reg_no.isdigit() and os.path.exists(path):
+            return self.read_page(f"{reg_no}.html")
+        return self.not_registered_page
+
+    def control(self, fields):
+        """Apply /_control settings; capacity=0 removes the limit"""
+        with self.rng_lock:
+            for name in ("latency", "jitter", "error_rate"):
+                if name in fields:
+                    setattr(self, name, float(fields[name]))
+            if "capacity" in fields:
+                self.capacity = int(fields["capacity"]) or None
+            if fields.get("reset"):
+                self.request_count = self.error_count = 0
+            return {"latency": self.latency, "jitter": self.jitter, "error_rate": self.error_rate,
+                    "capacity": self.capacity, "requests": self.request_count, "errors": self.error_count}
+
+    def degrade(self):
+        """Sleep the injected latency; return True if this request should fail"""
+        with self.rng_lock:
+            self.in_flight += 1
+            delay = self.latency + self.rng.uniform(0, self.jitter) if self.jitter else self.latency
+            failed = (self.rng.random() < self.error_rate
+                      or (self.capacity is not None and self.in_flight > self.capacity))
+            if failed:
+                self.error_count += 1
+        try:
+            if delay > 0:
+                time.sleep(delay)
+        finally:
+            with self.rng_lock:
+                self.in_flight -= 1
+        return failed
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, keep-alive clients wait for a delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body, status=200, content_type="text/html; charset=utf-8"):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _answer(self, fields):
+        path = urlparse(self.path).path
+        if path == "/_control":
+            self._send(json.dumps(self.server.control(fields)), content_type="application/json")
+            return
+        self.server.request_count += 1
+        if path in ("", "/", "/index.php"):
+            self._send(self.server.form_page)
+        elif path.endswith("result_show.php"):
+            if self.server.degrade():
+                self._send("Service Unavailable", status=503)
+            else:
+                self._send(self.server.page_for(fields))
+        else:
+            self._send("Not Found", status=404)
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        self._answer({key: values[0] for key, values in query.items()})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8")
+        self._answer({key: values[0] for key, values in parse_qs(body).items()})
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn(*options):
+    """Start the server in its own process with these command-line options, return (process, url)
+
+    A separate process keeps the server's response times apart from the scraper's threads.
+    """
+    port = _free_port()
+    process = subprocess.Popen([sys.executable, "-m", "benchmarks.mock_server", "--port", str(port),
+                                *map(str, options)], stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return process, url
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Mock server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded NU result pages locally")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--pages", default=PAGES_DIR, help="Directory of recorded pages")
+    parser.add_argument("--synthetic", nargs=2, type=int, metavar=("START", "END"),
+                        help="Also serve generated students inside this registration range")
+    parser.add_argument("--bands", type=int, default=5, help="Dense bands of students (default: 5)")
+    parser.add_argument("--band-size", type=int, default=200, help="Students per band (default: 200)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every result request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of result requests answered with 503")
+    parser.add_argument("--capacity", type=int, help="Concurrent result requests served before answering 503")
+    parser.add_argument("--students", type=int, nargs=2, metavar=("START", "END"),
+                        help="Serve a generated student for every registration in this range")
+    args = parser.parse_args()
+
+    students = None
+    if args.synthetic:
+        students = sparse_registrations(*args.synthetic, bands=args.bands, band_size=args.band_size, seed=args.seed)
+    if args.students:
+        students = (students or set()) | set(range(args.students[0], args.students[1] + 1))
+    server = MockResultServer((args.host, args.port), pages_dir=args.pages, students=students,
+                              latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                              capacity=args.capacity, seed=args.seed)
+    print(f"Mock result server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
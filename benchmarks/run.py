@@ -0,0 +1,259 @@
+"""Benchmark suite: scrape throughput, parse rate, ranking time and PDF render time.
+
+    python -m benchmarks.run --size 100k
+    python -m benchmarks.run --suites rank pdf --compare HEAD~1
+    python -m benchmarks.run --diff benchmarks/results/1a2b3c4.json benchmarks/results/5d6e7f8.json
+
+Every run writes benchmarks/results/<commit>.json (<commit>-dirty.json for a tree with
+uncommitted changes) holding the settings, the environment and one flat dict of
+metrics. Metric names end in their unit: `_per_s` is better when higher, `_s` and
+`_mb` when lower. --compare takes a results file or a git revision whose results
+are on disk and exits with status 1 when a metric got worse by more than --threshold.
+
+The scrape suite runs against the mock server in its own process, with registered
+students in dense bands covering --density of the range, once as a linear sweep
+and once in discovery mode. The other suites use synthetic data of --size rows.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.bench_rank import numpy_ranks, python_ranks
+from benchmarks.mock_server import render_result, spawn
+from benchmarks.synthetic import SIZES, parse_rows, write_results_csv
+from columnar import csv_to_columnar
+from fastrank import np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+SUITES = ("scrape", "parse", "rank", "pdf")
+START_REG = 20230000000
+
+
+def git(*arguments):
+    try:
+        return subprocess.run(["git", *arguments], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def revision():
+    """(short commit, has uncommitted changes to tracked files)"""
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    return commit, bool(git("status", "--porcelain", "--untracked-files=no"))
+
+
+def best_of(repeat, function):
+    """Shortest of `repeat` timings of function() and its last result"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def scrape_suite(args, tmp):
+    """Sweep and discovery throughput against the mock server"""
+    import results
+    from jobs import make_job
+
+    end = START_REG + args.registrations - 1
+    band_size = 200
+    bands = max(1, round(args.registrations * args.density / band_size))
+    process, url = spawn("--synthetic", START_REG, end, "--bands", bands, "--band-size", band_size,
+                         "--latency", args.latency)
+    metrics = {}
+    results.console.quiet = True
+    try:
+        for mode, discover in (("sweep", False), ("discover", True)):
+            scraper = results.ResultScraper(os.path.join(tmp, f"scrape_{mode}", "nu_results.csv"), base_url=url,
+                                            workers=args.workers, rate=10000, burst=args.workers, verbose=False,
+                                            adaptive=False)
+            os.makedirs(os.path.dirname(scraper.INPUT_CSV), exist_ok=True)
+            try:
+                scraper.scrape_jobs([make_job("B.Sc", "2023", START_REG, end)], discover=discover)
+            finally:
+                scraper.close()
+            report = scraper.metrics.report()
+            requests = sum(report["outcomes"].values())
+            metrics[f"{mode}_s"] = report["elapsed_s"]
+            metrics[f"{mode}_registrations_per_s"] = args.registrations / report["elapsed_s"]
+            metrics[f"{mode}_requests_per_s"] = requests / report["elapsed_s"]
+            metrics[f"{mode}_results"] = report["outcomes"].get("ok", 0)
+            for stage in ("fetch", "parse"):
+                summary = report["stages"].get(stage)
+                if summary:
+                    metrics[f"{mode}_{stage}_p50_s"] = summary["p50_s"]
+    finally:
+        results.console.quiet = False
+        process.terminate()
+        process.wait()
+    return metrics
+
+
+def parse_suite(args, tmp):
+    """Result pages parsed per second by each parser"""
+    from result_parser import PARSERS, etree, parse_result
+
+    pages = [(str(reg_no), render_result(reg_no)) for reg_no in range(START_REG, START_REG + args.pages)]
+    metrics = {}
+    for name in PARSERS:
+        if name == "lxml" and etree is None:
+            continue
+        seconds, _ = best_of(args.repeat, lambda: [parse_result(source, reg_no, name) for reg_no, source in pages])
+        metrics[f"{name}_pages_per_s"] = len(pages) / seconds
+    return metrics
+
+
+def rank_suite(args, tmp):
+    """Load + GPA + rank time of each engine, and of the columnar format"""
+    csv_path = write_results_csv(os.path.join(tmp, "nu_results.csv"), args.rows)
+    metrics = {}
+    seconds, ranked = best_of(args.repeat, lambda: python_ranks(csv_path))
+    metrics["python_s"] = seconds
+    metrics["students"] = sum(len(ranks) for ranks in ranked.values())
+    if np is None:
+        return metrics
+    metrics["numpy_s"], _ = best_of(args.repeat, lambda: numpy_ranks(csv_path))
+    metrics["students_per_s"] = metrics["students"] / metrics["numpy_s"]
+    seconds, (columnar_dir, _) = best_of(1, lambda: csv_to_columnar(csv_path, os.path.join(tmp, "nu_results.cols")))
+    metrics["columnar_convert_s"] = seconds
+    metrics["columnar_s"], _ = best_of(args.repeat, lambda: numpy_ranks(columnar_dir))
+    return metrics
+
+
+def pdf_suite(args, tmp):
+    """Render time and peak RSS of one group's report per layout, one process each"""
+    csv_path = write_results_csv(os.path.join(tmp, "nu_results_pdf.csv"), args.pdf_students,
+                                 groups=["B.Sc"], unregistered=0.0)
+    metrics = {}
+    for layout in ("detailed", "compact"):
+        output_dir = tempfile.mkdtemp(dir=tmp)
+        command = [sys.executable, "-m", "benchmarks.bench_pdf", "--single", csv_path, output_dir, layout, "1"]
+        result = json.loads(subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True).stdout)
+        metrics[f"{layout}_s"] = result["seconds"]
+        metrics[f"{layout}_students_per_s"] = args.pdf_students / result["seconds"]
+        if result["main_mb"] is not None:
+            metrics[f"{layout}_peak_mb"] = result["main_mb"]
+    return metrics
+
+
+RUNNERS = {"scrape": scrape_suite, "parse": parse_suite, "rank": rank_suite, "pdf": pdf_suite}
+
+
+def run(args):
+    commit, dirty = revision()
+    report = {
+        "commit": commit,
+        "dirty": dirty,
+        "subject": git("log", "-1", "--format=%s"),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "settings": {name: getattr(args, name) for name in
+                     ("suites", "rows", "registrations", "density", "latency", "workers", "pages",
+                      "pdf_students", "repeat")},
+        "metrics": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for suite in args.suites:
+            print(f"--- {suite} ---", flush=True)
+            started = time.perf_counter()
+            metrics = RUNNERS[suite](args, tmp)
+            for name, value in metrics.items():
+                report["metrics"][f"{suite}.{name}"] = value
+                print(f"{name:<36}{value:>14.3f}" if isinstance(value, float) else f"{name:<36}{value:>14}")
+            print(f"({time.perf_counter() - started:.1f}s)")
+
+    path = args.output or os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Saved {path}")
+    return report
+
+
+def load_report(reference):
+    """A results file, or the stored results of a git revision"""
+    if os.path.exists(reference):
+        path = reference
+    else:
+        commit = git("rev-parse", "--short", reference)
+        paths = [os.path.join(RESULTS_DIR, f"{commit}{suffix}.json") for suffix in ("", "-dirty")]
+        path = next((path for path in paths if commit and os.path.exists(path)), None)
+        if path is None:
+            raise SystemExit(f"No benchmark results for {reference!r} (looked for {paths[0]})")
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def higher_is_better(name):
+    return name.endswith("_per_s")
+
+
+def compare(old, new, threshold):
+    """Print every shared metric side by side, return the names that regressed beyond `threshold`"""
+    label = lambda report: report["commit"] + ("-dirty" if report.get("dirty") else "")
+    print(f"{'metric':<40}{label(old):>14}{label(new):>14}{'change':>9}")
+    settings = lambda report: {key: value for key, value in report.get("settings", {}).items() if key != "suites"}
+    if settings(old) != settings(new):
+        print("Note: the runs used different settings, differences may not be meaningful")
+    regressions = []
+    for name, before in old["metrics"].items():
+        after = new["metrics"].get(name)
+        if after is None or not (name.endswith("_s") or name.endswith("_mb")) or not before:
+            continue
+        change = after / before - 1
+        worse = -change if higher_is_better(name) else change
+        flag = ""
+        if worse > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        elif worse < -threshold:
+            flag = "  faster" if not name.endswith("_mb") else "  smaller"
+        print(f"{name:<40}{before:>14.3f}{after:>14.3f}{change:>+9.1%}{flag}")
+    print(f"{len(regressions)} regression(s) beyond {threshold:.0%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("--size", choices=SIZES, default="1k", help="Synthetic CSV size for rank (default: 1k)")
+    parser.add_argument("--rows", type=parse_rows, help="Exact row count for rank, overrides --size")
+    parser.add_argument("--registrations", type=int, default=2000, help="Registration range scraped (default: 2000)")
+    parser.add_argument("--density", type=float, default=0.2, help="Registered share of the range (default: 0.2)")
+    parser.add_argument("--latency", type=float, default=0.005, help="Mock server response time in seconds")
+    parser.add_argument("--workers", type=int, default=8, help="Scraper workers (default: 8)")
+    parser.add_argument("--pages", type=int, default=2000, help="Pages parsed per parser (default: 2000)")
+    parser.add_argument("--pdf-students", type=int, default=2000, help="Students in the rendered group")
+    parser.add_argument("--repeat", type=int, default=3, help="Parse and rank timings keep the best of N runs")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Results file or git revision to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Regression threshold (default: 0.1 = 10%%)")
+    parser.add_argument("--diff", nargs=2, metavar=("OLD", "NEW"), help="Only compare two stored runs")
+    args = parser.parse_args()
+
+    if args.diff:
+        regressions = compare(load_report(args.diff[0]), load_report(args.diff[1]), args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    baseline = load_report(args.compare) if args.compare else None  # Fail before a long run, not after
+    args.rows = args.rows or SIZES[args.size]
+    report = run(args)
+    if baseline is not None:
+        sys.exit(1 if compare(baseline, report, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Synthetic nu_results.csv generators for benchmarks.
+
+    python -m benchmarks.synthetic --rows 100000 --output /tmp/nu_results_100k.csv
+"""
+
+import argparse
+import csv
+import random
+
+from store import CSV_FIELDS, NOT_REGISTERED
+
+GROUPS = ["B.A", "B.S.S", "B.Sc", "B.B.A", "B.Music", "B.Sports"]
+GRADES = ["a+", "a", "a-", "b+", "b", "b-", "c+", "c", "d", "f", "absent"]
+GRADE_WEIGHTS = [6, 10, 12, 14, 14, 12, 10, 8, 6, 5, 3]
+COURSES = ["211501", "211503", "211505", "211507", "211509", "211511", "211513"]
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+
+def synthetic_rows(rows, groups=GROUPS, year="2023", unregistered=0.05, seed=1, start_reg=20230000000):
+    """Yield CSV rows for `rows` registrations spread over `groups`"""
+    rng = random.Random(seed)
+    for i in range(rows):
+        reg_no = str(start_reg + i)
+        group = groups[i % len(groups)]
+        if rng.random() < unregistered:
+            yield {'Registration No': reg_no, 'Name': NOT_REGISTERED, 'Exam Roll': '', 'Result': '',
+                   'Published Date': '', 'Courses': '', 'Grades': '', 'Group': group, 'Year': year}
+            continue
+        count = rng.randint(4, len(COURSES))
+        grades = rng.choices(GRADES, weights=GRADE_WEIGHTS, k=count)
+        yield {
+            'Registration No': reg_no,
+            'Name': f"STUDENT {reg_no}",
+            'Exam Roll': reg_no[-7:],
+            'Result': "Failed" if "f" in grades or "absent" in grades else "Passed",
+            'Published Date': "2024-11-12",
+            'Courses': ", ".join(COURSES[:count]),
+            'Grades': ", ".join(grades),
+            'Group': group,
+            'Year': year
+        }
+
+
+def write_results_csv(path, rows, **kwargs):
+    """Write a synthetic nu_results.csv with `rows` rows"""
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(synthetic_rows(rows, **kwargs))
+    return path
+
+
+def parse_rows(value):
+    return SIZES.get(value.lower()) or int(value)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=parse_rows, default=SIZES["100k"], help="Row count or 1k/100k/1m")
+    parser.add_argument("--output", default="nu_results_synthetic.csv")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    write_results_csv(args.output, args.rows, seed=args.seed)
+    print(f"Wrote {args.rows} rows to {args.output}")
@@ -0,0 +1,201 @@
+# version: 2.1
+
+import os
+import time
+import zlib
+import sqlite3
+import hashlib
+import argparse
+import threading
+from rich.console import Console
+from fetchers import FetchError, Page
+
+console = Console()
+
+DEFAULT_CACHE = os.path.join(".", "results", "page_cache.db")
+DEFAULT_TTL = 7 * 24 * 3600          # Seconds a cached page is served before it is fetched again
+DEFAULT_MAX_BYTES = 512 * 1024 ** 2  # Compressed page bytes kept before LRU eviction
+EVICT_EVERY = 200                    # Inserts between eviction passes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    exam        TEXT NOT NULL,
+    grp         TEXT NOT NULL,
+    reg_no      TEXT NOT NULL,
+    year        TEXT NOT NULL,
+    hash        TEXT NOT NULL,
+    fetched     REAL NOT NULL,
+    used        REAL NOT NULL,
+    PRIMARY KEY (exam, grp, reg_no, year)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    hash        TEXT PRIMARY KEY,
+    size        INTEGER NOT NULL,
+    data        BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_used ON pages (used);
+CREATE INDEX IF NOT EXISTS pages_hash ON pages (hash);
+"""
+
+
+class CacheMiss(FetchError):
+    """Raised in offline mode for a page that is not cached (never retried)"""
+
+
+class PageCache:
+    """Page bodies keyed by (exam, group, reg_no, year), stored once per content hash"""
+
+    def __init__(self, path=DEFAULT_CACHE, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+
+    def get(self, exam, group, reg_no, year):
+        """Cached page source, or None if missing or older than the TTL"""
+        key = (exam, group, str(reg_no), str(year))
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT blobs.data, pages.fetched FROM pages JOIN blobs ON blobs.hash = pages.hash "
+                "WHERE exam = ? AND grp = ? AND reg_no = ? AND year = ?", key
+            ).fetchone()
+            if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE pages SET used = ? WHERE exam = ? AND grp = ? AND reg_no = ? AND year = ?",
+                              (now,) + key)
+            self.conn.commit()
+            self.hits += 1
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def put(self, exam, group, reg_no, year, source):
+        """Store a fetched page; identical bodies (e.g. every "not registered" page) share one blob"""
+        body = source.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        data = zlib.compress(body, 6)
+        now = time.time()
+        with self.lock:
+            self.conn.execute("INSERT OR IGNORE INTO blobs VALUES (?, ?, ?)", (digest, len(data), data))
+            old = self.conn.execute(
+                "SELECT hash FROM pages WHERE exam = ? AND grp = ? AND reg_no = ? AND year = ?",
+                (exam, group, str(reg_no), str(year))
+            ).fetchone()
+            self.conn.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                              (exam, group, str(reg_no), str(year), digest, now, now))
+            if old is not None and old[0] != digest:
+                self._drop_orphan(old[0])
+            self.conn.commit()
+            self.inserts += 1
+            if self.inserts % EVICT_EVERY == 0:
+                self._evict()
+
+    def _drop_orphan(self, digest):
+        self.conn.execute("DELETE FROM blobs WHERE hash = ? AND NOT EXISTS "
+                          "(SELECT 1 FROM pages WHERE pages.hash = blobs.hash)", (digest,))
+
+    def size(self):
+        """Compressed bytes held by the cache"""
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def _evict(self):
+        """Drop least recently used pages until the blobs fit in max_bytes"""
+        if self.max_bytes is None:
+            return 0
+        total = self.size()
+        evicted = 0
+        while total > self.max_bytes:
+            batch = self.conn.execute(
+                "SELECT exam, grp, reg_no, year, hash FROM pages ORDER BY used LIMIT 500"
+            ).fetchall()
+            if not batch:
+                break
+            for exam, group, reg_no, year, digest in batch:
+                self.conn.execute("DELETE FROM pages WHERE exam = ? AND grp = ? AND reg_no = ? AND year = ?",
+                                  (exam, group, reg_no, year))
+                evicted += 1
+                freed = self.conn.execute(
+                    "SELECT size FROM blobs WHERE hash = ? AND NOT EXISTS "
+                    "(SELECT 1 FROM pages WHERE pages.hash = blobs.hash)", (digest,)
+                ).fetchone()
+                if freed is not None:
+                    self._drop_orphan(digest)
+                    total -= freed[0]
+                    if total <= self.max_bytes:
+                        break
+        self.conn.commit()
+        return evicted
+
+    def evict(self):
+        with self.lock:
+            return self._evict()
+
+    def stats(self):
+        with self.lock:
+            pages, = self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+            blobs, = self.conn.execute("SELECT COUNT(*) FROM blobs").fetchone()
+            return {"pages": pages, "blobs": blobs, "bytes": self.size()}
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM pages")
+            self.conn.execute("DELETE FROM blobs")
+            self.conn.commit()
+            self.conn.execute("VACUUM")
+
+    def close(self):
+        with self.lock:
+            self._evict()
+            self.conn.close()
+
+
+class CachingFetcher:
+    """Serve pages from a PageCache, fetching (and so rate limiting) only on misses"""
+
+    name = "cache"
+
+    def __init__(self, fetcher, cache, offline=False):
+        self.fetcher = fetcher
+        self.cache = cache
+        self.offline = offline
+
+    def fetch(self, reg_no, group, year, exam):
+        source = self.cache.get(exam, group, reg_no, year)
+        if source is not None:
+            return Page(source)
+        if self.offline or self.fetcher is None:
+            raise CacheMiss(f"{reg_no} is not cached")
+        page = self.fetcher.fetch(reg_no, group, year, exam)
+        self.cache.put(exam, group, reg_no, year, page.source)
+        return page
+
+    def close(self):
+        if self.fetcher is not None:
+            self.fetcher.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or clear the result page cache")
+    parser.add_argument("--path", default=DEFAULT_CACHE, help="Cache path (default: ./results/page_cache.db)")
+    parser.add_argument("--clear", action="store_true", help="Remove every cached page")
+    args = parser.parse_args()
+
+    cache = PageCache(args.path, max_bytes=None)
+    if args.clear:
+        cache.clear()
+        console.print(f"Cleared {args.path}", style="bold green")
+    stats = cache.stats()
+    cache.close()
+    console.print(f"{stats['pages']} cached pages in {stats['blobs']} distinct bodies, "
+                  f"{stats['bytes'] / 1024 ** 2:.1f} MB compressed", style="bold green")
@@ -0,0 +1,260 @@
+# version: 2.1
+
+import os
+import csv
+import json
+import shutil
+import hashlib
+import argparse
+from array import array
+from rich.console import Console
+from manifest import group_key
+from store import CSV_FIELDS, result_status
+
+try:
+    import numpy as np
+except ImportError:  # The columnar format is optional, the CSV always works
+    np = None
+
+console = Console()
+
+COLUMNAR_SUFFIX = ".cols"
+META_NAME = "meta.json"
+FORMAT_VERSION = 1
+STATUSES = ("ok", "not_registered", "unrecognized", "failed")
+
+# CSV field -> column kind. Strings are a UTF-8 blob plus offsets, categories a vocabulary plus
+# one code per row, lists a vocabulary plus one code per item and per-row offsets. Codes and
+# offsets are saved with the smallest unsigned integer type that holds them.
+STRING_FIELDS = {'Registration No': 'reg', 'Name': 'name', 'Exam Roll': 'roll'}
+CATEGORY_FIELDS = {'Result': 'result', 'Published Date': 'published', 'Group': 'group', 'Year': 'year',
+                   'Exam': 'exam'}
+LIST_FIELDS = {'Courses': 'courses', 'Grades': 'grades'}
+
+
+def columnar_path(csv_path):
+    """Default columnar directory next to a CSV, e.g. results/nu_results.cols"""
+    return os.path.splitext(csv_path)[0] + COLUMNAR_SUFFIX
+
+
+def is_columnar(path):
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, META_NAME))
+
+
+def _smallest(values):
+    """Copy of an int array in the smallest unsigned type holding its largest value"""
+    top = int(values.max()) if len(values) else 0
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if top <= np.iinfo(dtype).max:
+            return values.astype(dtype)
+    return values
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The columnar results format needs NumPy (pip install numpy)")
+
+
+class StringColumn:
+    """Variable-length strings decoded on access, optionally through a row selection"""
+
+    def __init__(self, data, offsets, rows=None):
+        self.data = data
+        self.offsets = offsets
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows) if self.rows is not None else len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if self.rows is not None:
+            i = self.rows[i]
+        return bytes(self.data[self.offsets[i]:self.offsets[i + 1]]).decode('utf-8')
+
+
+class CategoryColumn:
+    """Dictionary-encoded strings: a small vocabulary and one code per row"""
+
+    def __init__(self, vocabulary, codes):
+        self.vocabulary = vocabulary
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        return self.vocabulary[self.codes[i]]
+
+
+class ColumnarWriter:
+    """Collect result rows (CSV field dicts) and write them as typed, memory-mappable columns"""
+
+    def __init__(self):
+        _require_numpy()
+        self.count = 0
+        # Compact buffers (array, bytearray) keep a million-row conversion small
+        self.strings = {column: (bytearray(), array('q', [0])) for column in STRING_FIELDS.values()}
+        self.vocabularies = {column: {} for column in list(CATEGORY_FIELDS.values()) + list(LIST_FIELDS.values())}
+        self.categories = {column: array('i') for column in CATEGORY_FIELDS.values()}
+        self.lists = {column: (array('i'), array('q', [0])) for column in LIST_FIELDS.values()}
+        self.status = array('B')
+        self.digests = {}
+
+    def _code(self, column, value):
+        vocabulary = self.vocabularies[column]
+        code = vocabulary.get(value)
+        if code is None:
+            code = vocabulary[value] = len(vocabulary)
+        return code
+
+    def write(self, row):
+        """Add one row; lists are split and stripped once here so readers never parse them"""
+        values = {field: row.get(field) or '' for field in CSV_FIELDS}
+        if 'Group' not in row:
+            values['Group'] = 'Unknown'  # Same default RankingCreator uses for CSVs without the column
+
+        for field, column in STRING_FIELDS.items():
+            data, offsets = self.strings[column]
+            data += values[field].encode('utf-8')
+            offsets.append(len(data))
+        for field, column in CATEGORY_FIELDS.items():
+            self.categories[column].append(self._code(column, values[field]))
+        for field, column in LIST_FIELDS.items():
+            codes, offsets = self.lists[column]
+            codes.extend(self._code(column, item.strip()) for item in values[field].split(','))
+            offsets.append(len(codes))
+        self.status.append(STATUSES.index(result_status(values['Name'])))
+
+        # Per-group content hash of the canonical row, for incremental report runs
+        key = group_key(values['Group'], values['Year'], values['Exam'])
+        digest = self.digests.get(key)
+        if digest is None:
+            digest = self.digests[key] = hashlib.sha256()
+        digest.update("\x1f".join(values[field] for field in CSV_FIELDS).encode('utf-8'))
+        digest.update(b"\x1e")
+        self.count += 1
+
+    def save(self, path):
+        """Write every column to `path`, replacing an existing directory atomically"""
+        temp_path = path.rstrip(os.sep) + ".tmp"
+        if os.path.exists(temp_path):
+            shutil.rmtree(temp_path)
+        os.makedirs(temp_path)
+
+        def save_array(name, values, dtype):
+            np.save(os.path.join(temp_path, f"{name}.npy"), _smallest(np.frombuffer(values, dtype=dtype)))
+
+        for column, (data, offsets) in self.strings.items():
+            save_array(f"{column}_data", data, np.uint8)
+            save_array(f"{column}_offsets", offsets, np.int64)
+        for column, codes in self.categories.items():
+            save_array(column, codes, np.int32)
+        for column, (codes, offsets) in self.lists.items():
+            save_array(f"{column}_codes", codes, np.int32)
+            save_array(f"{column}_offsets", offsets, np.int64)
+        save_array("status", self.status, np.uint8)
+
+        meta = {
+            "version": FORMAT_VERSION,
+            "rows": self.count,
+            "statuses": list(STATUSES),
+            "vocabularies": {column: list(vocabulary) for column, vocabulary in self.vocabularies.items()},
+            "digests": {key: digest.hexdigest() for key, digest in self.digests.items()},
+        }
+        with open(os.path.join(temp_path, META_NAME), 'w', encoding='utf-8') as file:
+            json.dump(meta, file)
+
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        os.replace(temp_path, path)
+        return path
+
+
+class ColumnarFile:
+    """Read-only view of a columnar results directory; arrays are memory-mapped, not loaded"""
+
+    def __init__(self, path):
+        _require_numpy()
+        self.path = path
+        with open(os.path.join(path, META_NAME), encoding='utf-8') as file:
+            self.meta = json.load(file)
+        if self.meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported columnar format version {self.meta.get('version')}")
+        self.vocabularies = self.meta["vocabularies"]
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def array(self, name):
+        return np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode='r')
+
+    def strings(self, column, rows=None):
+        return StringColumn(self.array(f"{column}_data"), self.array(f"{column}_offsets"), rows)
+
+    def category(self, column, rows=None):
+        codes = self.array(column)
+        return CategoryColumn(self.vocabularies[column], codes if rows is None else codes[rows])
+
+    def rows(self):
+        """Yield CSV field dicts, lists joined the way the scraper writes them"""
+        strings = {field: self.strings(column) for field, column in STRING_FIELDS.items()}
+        categories = {field: self.category(column) for field, column in CATEGORY_FIELDS.items()}
+        lists = {field: (self.array(f"{column}_codes"), self.array(f"{column}_offsets").tolist(),
+                         self.vocabularies[column]) for field, column in LIST_FIELDS.items()}
+        for i in range(len(self)):
+            row = {field: column[i] for field, column in strings.items()}
+            row.update((field, column[i]) for field, column in categories.items())
+            for field, (codes, offsets, vocabulary) in lists.items():
+                row[field] = ", ".join(vocabulary[code] for code in codes[offsets[i]:offsets[i + 1]].tolist())
+            yield {field: row[field] for field in CSV_FIELDS}
+
+    def group_digests(self, settings=""):
+        """Per (group, year, exam) input hash, like manifest.group_digests for a CSV"""
+        digests = {}
+        for key, digest in self.meta["digests"].items():
+            group, year, exam = key.split("|", 2)
+            digests[(group, year, exam)] = hashlib.sha256((settings + digest).encode('utf-8')).hexdigest()
+        return digests
+
+
+def csv_to_columnar(csv_path, path=None):
+    """Convert a results CSV, return (columnar path, row count)"""
+    path = path or columnar_path(csv_path)
+    writer = ColumnarWriter()
+    with open(csv_path, mode='r', encoding='utf-8', newline='') as file:
+        for row in csv.DictReader(file):
+            writer.write(row)
+    return writer.save(path), writer.count
+
+
+def columnar_to_csv(path, csv_path):
+    """Convert a columnar directory back to a results CSV, return the row count"""
+    count = 0
+    directory = os.path.dirname(csv_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(csv_path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for row in ColumnarFile(path).rows():
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert results between nu_results.csv and the columnar format")
+    parser.add_argument("source", help="A results CSV, or a .cols directory to convert back to CSV")
+    parser.add_argument("--output", help="Output path (default: next to the source, e.g. nu_results.cols)")
+    args = parser.parse_args()
+
+    try:
+        if is_columnar(args.source):
+            output = args.output or os.path.splitext(args.source.rstrip(os.sep))[0] + ".csv"
+            count = columnar_to_csv(args.source, output)
+        else:
+            output, count = csv_to_columnar(args.source, args.output)
+    except (OSError, ValueError, ImportError) as e:
+        console.print(f"Error: {e}", style="bold red")
+        raise SystemExit(1)
+    console.print(f"Converted {count} rows to {output}", style="bold green")
@@ -0,0 +1,335 @@
+# version: 2.1
+
+import os
+import gc
+import csv
+from contextlib import contextmanager
+from rich.console import Console
+from rank import GRADE_POINTS
+from records import GradeTable, StudentRecord
+from columnar import ColumnarFile, is_columnar
+from store import NOT_REGISTERED, NOT_RECOGNIZED, FAILED
+
+try:
+    import numpy as np
+except ImportError:  # The columnar engine is optional
+    np = None
+
+console = Console()
+
+PAD_POINT = -2.0  # Sorts below every real grade point, so shorter grade lists come first
+PAD_CODE = -1
+
+
+@contextmanager
+def paused_gc():
+    """Skip cyclic GC passes while millions of short-lived containers are built"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class ColumnarResults:
+    """Results CSV held as columns: grade codes as small ints, a 2-D points matrix and a group index"""
+
+    def __init__(self):
+        self.names = []
+        self.rolls = []
+        self.regs = []
+        self.results = []
+        self.years = []
+        self.group_index = None
+        self.groups = []          # Group names, one per (group, year, exam) in order of first appearance
+        self.group_years = []     # Year of each (group, year, exam)
+        self.group_exams = []     # Exam of each (group, year, exam)
+        self.courses = []         # Flat course tokens (unstripped), sliced by offsets
+        self.grade_tokens = []    # Flat grade tokens (unstripped), sliced by offsets
+        self.offsets = None
+        self.codes = None         # Flat grade codes, aligned with grade_tokens
+        self.grade_names = []     # Normalized grade for each grade code
+        self.raw_names = {}       # Grade token -> raw grade as shown in reports
+        self.course_names = {}    # Course token -> stripped course code
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_csv(cls, csv_path, only=None):
+        """Read the CSV once; grades and courses are split in bulk instead of per row"""
+        with open(csv_path, mode='r', encoding='utf-8') as file, paused_gc():
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header is None:
+                return cls.from_rows([])
+            fields = {name: index for index, name in enumerate(header)}
+            return cls.from_rows(cls._records(reader, header, fields, only))
+
+    @classmethod
+    def from_columnar(cls, path, only=None):
+        """Select and gather rankable rows from a memory-mapped columnar directory, with no per-row parsing"""
+        data = ColumnarFile(path)
+        vocabularies = data.vocabularies
+        group_codes, year_codes, exam_codes = data.array('group'), data.array('year'), data.array('exam')
+        course_offsets, grade_offsets = data.array('courses_offsets'), data.array('grades_offsets')
+
+        # Same rows the CSV path keeps: registered, recognized, and as many grades as courses
+        skipped = [data.meta["statuses"].index(status) for status in ("not_registered", "unrecognized", "failed")]
+        keep = ~np.isin(data.array('status'), skipped) & (np.diff(course_offsets) == np.diff(grade_offsets))
+        years, exams = len(vocabularies['year']), len(vocabularies['exam'])
+        keys = (group_codes.astype(np.int64) * years + year_codes) * exams + exam_codes
+        if only is not None:
+            wanted = [(vocabularies['group'].index(group) * years + vocabularies['year'].index(year)) * exams
+                      + vocabularies['exam'].index(exam)
+                      for group, year, exam in only
+                      if group in vocabularies['group'] and year in vocabularies['year']
+                      and exam in vocabularies['exam']]
+            keep &= np.isin(keys, wanted)
+        rows = np.flatnonzero(keep)
+
+        columns = cls()
+        columns.names = data.strings('name', rows)
+        columns.rolls = data.strings('roll', rows)
+        columns.regs = data.strings('reg', rows)
+        columns.results = data.category('result', rows)
+        columns.years = data.category('year', rows)
+
+        # Group ids in order of first appearance, like the CSV path
+        distinct, first, inverse = np.unique(keys[rows], return_index=True, return_inverse=True)
+        appearance = np.argsort(first, kind='stable')
+        group_ids = np.empty(len(distinct), dtype=np.int32)
+        group_ids[appearance] = np.arange(len(distinct), dtype=np.int32)
+        columns.group_index = group_ids[inverse.reshape(-1)]
+        for key in distinct[appearance].tolist():
+            key, exam = divmod(key, exams)
+            group, year = divmod(key, years)
+            columns.groups.append(vocabularies['group'][group])
+            columns.group_years.append(vocabularies['year'][year])
+            columns.group_exams.append(vocabularies['exam'][exam])
+
+        # Gather the selected rows' list items into contiguous arrays
+        starts = grade_offsets[rows]
+        lengths = grade_offsets[rows + 1] - starts
+        columns.offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        items = np.repeat(starts - columns.offsets[:-1], lengths) + np.arange(columns.offsets[-1])
+        course_items = np.repeat(course_offsets[rows] - columns.offsets[:-1], lengths) + np.arange(columns.offsets[-1])
+        columns.courses = np.asarray(data.array('courses_codes')[course_items])
+        columns.grade_tokens = np.asarray(data.array('grades_codes')[items])
+        columns.course_names = vocabularies['courses']
+
+        grade_codes = {}
+        normalized = []
+        for token, grade in enumerate(vocabularies['grades']):
+            raw = grade.lower()
+            grade = 'f' if raw == 'fail' else raw
+            if grade not in grade_codes:
+                grade_codes[grade] = len(columns.grade_names)
+                columns.grade_names.append(grade)
+            normalized.append(grade_codes[grade])
+            columns.raw_names[token] = raw
+        columns.codes = np.asarray(normalized, dtype=np.int32)[columns.grade_tokens]
+        return columns
+
+    @staticmethod
+    def _records(reader, header, fields, only=None):
+        """Yield (name, roll, reg, result, courses, grades, group, year, exam) for rankable rows"""
+        name_i, roll_i, reg_i, result_i = (fields['Name'], fields['Exam Roll'],
+                                           fields['Registration No'], fields['Result'])
+        courses_i, grades_i = fields['Courses'], fields['Grades']
+        group_i, year_i, exam_i = fields.get('Group'), fields.get('Year'), fields.get('Exam')
+        width = len(header)
+
+        for row_num, row in enumerate(reader, 1):
+            if len(row) < width:
+                # Short rows take the same path as csv.DictReader (missing fields are None)
+                row = row + [None] * (width - len(row))
+            group = row[group_i] if group_i is not None else 'Unknown'
+            year = row[year_i] if year_i is not None else ''
+            exam = row[exam_i] if exam_i is not None else ''
+            if only is not None and (group, year, exam) not in only:
+                continue
+            try:
+                name = row[name_i]
+                if NOT_REGISTERED in name or NOT_RECOGNIZED in name or FAILED in name:
+                    continue
+                grades, courses = row[grades_i], row[courses_i]
+                if grades.count(',') != courses.count(','):
+                    continue
+            except Exception as e:
+                console.print(f"Row {row_num}: Error processing record - {str(e)}", style="bold red")
+                continue
+            yield name, row[roll_i], row[reg_i], row[result_i], courses, grades, group, year, exam
+
+    @classmethod
+    def from_rows(cls, records):
+        columns = cls()
+        group_ids = {}
+        group_index = []
+        course_fields = []
+        grade_fields = []
+
+        for name, roll, reg, result, courses, grades, group, year, exam in records:
+            key = (group, year, exam)
+            if key not in group_ids:
+                group_ids[key] = len(columns.groups)
+                columns.groups.append(group)
+                columns.group_years.append(year)
+                columns.group_exams.append(exam)
+            columns.names.append(name)
+            columns.rolls.append(roll)
+            columns.regs.append(reg)
+            columns.results.append(result)
+            columns.years.append(year)
+            group_index.append(group_ids[key])
+            course_fields.append(courses)
+            grade_fields.append(grades)
+
+        lengths = np.fromiter((field.count(',') + 1 for field in grade_fields), dtype=np.int64,
+                              count=len(grade_fields))
+        columns.offsets = np.concatenate(([0], np.cumsum(lengths)))
+        columns.group_index = np.asarray(group_index, dtype=np.int32)
+        columns.courses = ",".join(course_fields).split(',') if course_fields else []
+        columns.grade_tokens = ",".join(grade_fields).split(',') if grade_fields else []
+
+        # Normalize each distinct token once, then map every token to its code
+        token_codes = {}
+        grade_codes = {}
+        for token in set(columns.grade_tokens):
+            raw = token.strip().lower()
+            grade = 'f' if raw == 'fail' else raw
+            if grade not in grade_codes:
+                grade_codes[grade] = len(columns.grade_names)
+                columns.grade_names.append(grade)
+            token_codes[token] = grade_codes[grade]
+            columns.raw_names[token] = raw
+        columns.course_names = {token: token.strip() for token in set(columns.courses)}
+        columns.codes = np.fromiter(map(token_codes.__getitem__, columns.grade_tokens), dtype=np.int32,
+                                    count=len(columns.grade_tokens))
+        return columns
+
+
+class ColumnarRanker:
+    """Rank every group at once with a single lexsort, matching RankingCreator.rank_students"""
+
+    def __init__(self, input_csv, only=None):
+        self.INPUT_CSV = input_csv
+        self.only = only
+        self.columns = None
+        self.gpa = None
+        self.points = None
+        self.offsets = None
+        self.group_ids = None
+        self.rank = None
+        self.order = None
+        self.group_bounds = None
+        self.table = None
+        self.token_codes = None
+
+    def load(self):
+        if not os.path.exists(self.INPUT_CSV):
+            console.print(f"Error: CSV file not found at {self.INPUT_CSV}", style="bold red")
+            return False
+        if is_columnar(self.INPUT_CSV):
+            self.columns = ColumnarResults.from_columnar(self.INPUT_CSV, self.only)
+        else:
+            self.columns = ColumnarResults.from_csv(self.INPUT_CSV, self.only)
+        return len(self.columns) > 0
+
+    def compute(self, columns):
+        """Bulk GPA, tie-break keys, ordering and ranks for loaded columns"""
+        n = len(columns)
+        lengths = np.diff(columns.offsets)
+        width = int(lengths.max())
+
+        # n x width matrices, padded to the right
+        present = np.arange(width) < lengths[:, None]
+        codes = np.full((n, width), PAD_CODE, dtype=np.int32)
+        codes[present] = columns.codes
+        lookup = np.array([GRADE_POINTS.get(g, -1.00) for g in columns.grade_names], dtype=np.float64)
+        points = lookup[np.where(present, codes, 0)]
+
+        # Sum column by column so every row adds left to right, exactly like sum() does
+        totals = np.zeros(n, dtype=np.float64)
+        for j in range(width):
+            totals += np.where(present[:, j], points[:, j], 0.0)
+        averages = totals / lengths
+
+        # round() on the distinct values keeps Python's rounding of the existing engine
+        distinct, inverse = np.unique(averages, return_inverse=True)
+        gpa = np.array([round(float(value), 2) for value in distinct], dtype=np.float64)[inverse.reshape(-1)]
+
+        # Primary key last: group, then -GPA, then grade points left to right (stable)
+        tie_break = np.where(present, points, PAD_POINT)
+        group_index = np.asarray(columns.group_index, dtype=np.int32)
+        keys = [tie_break[:, j] for j in range(width - 1, -1, -1)] + [-gpa, group_index]
+        order = np.lexsort(keys)
+
+        sorted_groups = group_index[order]
+        sorted_gpa = gpa[order]
+        sorted_codes = codes[order]
+        new_rank = np.ones(n, dtype=bool)
+        new_rank[1:] = ((sorted_groups[1:] != sorted_groups[:-1]) |
+                        (sorted_gpa[1:] != sorted_gpa[:-1]) |
+                        (sorted_codes[1:] != sorted_codes[:-1]).any(axis=1))
+        new_group = np.ones(n, dtype=bool)
+        new_group[1:] = sorted_groups[1:] != sorted_groups[:-1]
+
+        positions = np.arange(n)
+        rank_start = np.maximum.accumulate(np.where(new_rank, positions, 0))
+        group_start = np.maximum.accumulate(np.where(new_group, positions, 0))
+
+        self.gpa = gpa
+        self.order = order
+        self.rank = rank_start - group_start + 1
+        self.group_bounds = np.flatnonzero(new_group).tolist() + [n]
+
+    def student(self, i, rank):
+        """Materialize one ranked student as a StudentRecord, like RankingCreator.load_student_data"""
+        columns = self.columns
+        start, end = self.offsets[i], self.offsets[i + 1]
+        group_id = self.group_ids[i]
+        return StudentRecord(
+            columns.names[i], columns.rolls[i], columns.regs[i], columns.results[i],
+            self.table.courses(map(columns.course_names.__getitem__, columns.courses[start:end])),
+            bytes(map(self.token_codes.__getitem__, columns.grade_tokens[start:end])),
+            self.points[i], columns.groups[group_id], columns.years[i], columns.group_exams[group_id],
+            self.table, int(rank)
+        )
+
+    def rank_table(self):
+        """Yield ((group, year, exam), registration numbers, ranks) in ranked order without building student dicts"""
+        if self.columns is None and not self.load():
+            return
+        if self.order is None:
+            self.compute(self.columns)
+        for start, end in zip(self.group_bounds, self.group_bounds[1:]):
+            indices = self.order[start:end]
+            group_id = int(self.columns.group_index[indices[0]])
+            key = (self.columns.groups[group_id], self.columns.group_years[group_id], self.columns.group_exams[group_id])
+            yield key, [self.columns.regs[i] for i in indices.tolist()], self.rank[start:end]
+
+    def ranked_groups(self):
+        """Yield (group, year, exam, ranked students) in the same order as RankingCreator"""
+        if self.columns is None and not self.load():
+            return
+        if self.order is None:
+            self.compute(self.columns)
+
+        # Plain lists index faster than arrays when building one record per student
+        self.offsets = self.columns.offsets.tolist()
+        self.group_ids = self.columns.group_index.tolist()
+        self.points = self.gpa.tolist()
+        self.table = GradeTable(GRADE_POINTS)
+        self.token_codes = {token: self.table.code(raw) for token, raw in self.columns.raw_names.items()}
+
+        for start, end in zip(self.group_bounds, self.group_bounds[1:]):
+            indices = self.order[start:end].tolist()
+            group_id = int(self.columns.group_index[indices[0]])
+
+            with paused_gc():
+                students = [self.student(i, rank) for i, rank in zip(indices, self.rank[start:end].tolist())]
+            yield (self.columns.groups[group_id], self.columns.group_years[group_id],
+                   self.columns.group_exams[group_id], students)
@@ -0,0 +1,336 @@
+# version: 2.0
+
+import os
+import atexit
+import threading
+from collections import namedtuple
+from contextlib import nullcontext
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+BASE_URL = "http://result.nu.ac.bd"
+DEFAULT_EXAM = "Bachelor Degree (Honours) 1st Year"
+NOT_REGISTERED_MARKER = "ERROR ! YOU'VE PROVIDED WRONG INFORMATION"
+
+# source: raw page HTML, parsed by result_parser
+Page = namedtuple("Page", ["source"])
+
+
+class FetchError(Exception):
+    """Raised by a fetcher when a registration could not be retrieved (retryable)"""
+
+
+class _FormParser(HTMLParser):
+    """Collect the result form's action, method, fields and select options"""
+
+    def __init__(self):
+        super().__init__()
+        self.action = None
+        self.method = "post"
+        self.fields = {}
+        self.options = {}
+        self._select = None
+        self._option = None
+
+    def _close_option(self):
+        if self._option is not None:
+            value, text = self._option
+            label = " ".join("".join(text).split())
+            if label:
+                self.options[self._select][label] = value if value is not None else label
+            self._option = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form" and self.action is None:
+            self.action = attrs.get("action") or ""
+            self.method = (attrs.get("method") or "post").lower()
+        elif tag == "input" and attrs.get("name"):
+            self.fields.setdefault(attrs["name"], attrs.get("value") or "")
+        elif tag == "select":
+            self._select = attrs.get("name") or attrs.get("id")
+            if self._select:
+                self.options.setdefault(self._select, {})
+        elif tag == "option" and self._select:
+            self._close_option()
+            self._option = (attrs.get("value"), [])
+
+    def handle_data(self, data):
+        if self._option is not None:
+            self._option[1].append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "option" and self._select:
+            self._close_option()
+        elif tag == "select":
+            self._close_option()
+            self._select = None
+
+
+class HttpFetcher:
+    """Post the result form directly over a pooled keep-alive HTTP session"""
+
+    name = "http"
+
+    def __init__(self, base_url=BASE_URL, timeout=30, pool_size=10):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.base_url = base_url
+        self.timeout = timeout
+        self._requests = requests
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._form = None
+
+    def _load_form(self):
+        """Fetch the landing page once and remember the form layout"""
+        try:
+            response = self.session.get(self.base_url, timeout=self.timeout)
+            response.raise_for_status()
+        except self._requests.RequestException as e:
+            raise FetchError(f"Could not load result form: {e}") from e
+
+        parser = _FormParser()
+        parser.feed(response.text)
+        parser.close()
+        action = urljoin(response.url, parser.action or "result_show.php")
+        self._form = (action, parser.method, parser.fields, parser.options)
+        return self._form
+
+    def _option(self, options, field, label):
+        """Map a visible option label to its submitted value"""
+        choices = options.get(field) or {}
+        if label in choices:
+            return choices[label]
+        for text, value in choices.items():
+            if text.startswith(label) or label in text:
+                return value
+        return label
+
+    def fetch(self, reg_no, group, year, exam=DEFAULT_EXAM):
+        """Submit the form for one registration and return the result page"""
+        action, method, fields, options = self._form or self._load_form()
+        payload = dict(fields)
+        payload.update({
+            "exm_code": self._option(options, "exm_code", exam),
+            "course": self._option(options, "course", group),
+            "reg_no": str(reg_no),
+            "exm_year": str(year),
+        })
+        payload.setdefault("submit", "Submit")
+
+        try:
+            if method == "get":
+                response = self.session.get(action, params=payload, timeout=self.timeout)
+            else:
+                response = self.session.post(action, data=payload, timeout=self.timeout)
+            response.raise_for_status()
+        except self._requests.RequestException as e:
+            raise FetchError(str(e)) from e
+
+        return Page(response.text)
+
+    def close(self):
+        self.session.close()
+
+
+DRIVER_PATH_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "nu-clear", "chromedriver_path")
+FORM_BACK_TIMEOUT = 5  # Seconds to wait for the form after going back from a result page
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def chromedriver_path():
+    """Resolve chromedriver once, caching the installed path on disk between runs"""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path and os.path.exists(_driver_path):
+            return _driver_path
+
+        path = os.environ.get("CHROMEDRIVER_PATH")
+        if not path and os.path.exists(DRIVER_PATH_CACHE):
+            with open(DRIVER_PATH_CACHE, encoding="utf-8") as file:
+                path = file.read().strip()
+        if not path or not os.path.exists(path):
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+            try:
+                os.makedirs(os.path.dirname(DRIVER_PATH_CACHE), exist_ok=True)
+                with open(DRIVER_PATH_CACHE, "w", encoding="utf-8") as file:
+                    file.write(path)
+            except OSError:
+                pass  # Caching is best effort
+
+        _driver_path = path
+        return path
+
+
+class DriverPool:
+    """Headless Chrome drivers started on demand and recycled after `max_uses` requests or a crash"""
+
+    def __init__(self, max_uses=200):
+        self.max_uses = max(1, int(max_uses))
+        self.idle = []
+        self.uses = {}
+        self.lock = threading.Lock()
+        self.service = None
+        self.chrome_options = None
+        atexit.register(self.close)
+
+    def _start(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+
+        if self.service is None:
+            self.service = Service(chromedriver_path())
+
+            # Chrome Configuration
+            self.chrome_options = Options()
+            self.chrome_options.add_argument("--headless")
+            self.chrome_options.add_argument("--disable-gpu")
+            self.chrome_options.add_argument("--window-size=1200,800")
+            self.chrome_options.add_argument("--no-sandbox")
+            self.chrome_options.add_argument("--disable-dev-shm-usage")
+
+        return webdriver.Chrome(service=self.service, options=self.chrome_options)
+
+    def acquire(self):
+        """Hand out an idle driver, starting a new one only when none is free"""
+        with self.lock:
+            if self.idle:
+                return self.idle.pop()
+        driver = self._start()
+        with self.lock:
+            self.uses[id(driver)] = 0
+        return driver
+
+    def release(self, driver, broken=False):
+        """Return a driver after one request, retiring it when worn out or crashed"""
+        with self.lock:
+            self.uses[id(driver)] = self.uses.get(id(driver), 0) + 1
+            retire = broken or self.uses[id(driver)] >= self.max_uses
+            if retire:
+                self.uses.pop(id(driver), None)
+            else:
+                self.idle.append(driver)
+        if retire:
+            self._quit(driver)
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        with self.lock:
+            drivers, self.idle = self.idle, []
+            self.uses.clear()
+        for driver in drivers:
+            self._quit(driver)
+
+
+class SeleniumFetcher:
+    """Fill in and submit the result form in a pooled headless Chrome page"""
+
+    name = "selenium"
+
+    def __init__(self, base_url=BASE_URL, timeout=30, driver_pool=None, metrics=None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.own_pool = driver_pool is None
+        self.driver_pool = driver_pool or DriverPool()
+        self.metrics = metrics
+
+    def _stage(self, name):
+        """Time a browser stage (page load, form fill, submit wait) if metrics are collected"""
+        return self.metrics.timer(name) if self.metrics is not None else nullcontext()
+
+    def _show_form(self, driver, wait):
+        """Bring the result form up, going back from the last result page instead of reloading the site"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+
+        form_ready = EC.element_to_be_clickable((By.ID, "exm_code"))
+        if "result_show.php" in driver.current_url:
+            # The form page was a GET, so the browser restores it from its cache without a round trip
+            driver.back()
+            try:
+                return WebDriverWait(driver, FORM_BACK_TIMEOUT).until(form_ready)
+            except TimeoutException:
+                pass
+        driver.get(self.base_url)
+        return wait.until(form_ready)
+
+    def fetch(self, reg_no, group, year, exam=DEFAULT_EXAM):
+        """Submit the form for one registration and return the result page"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+
+        driver = self.driver_pool.acquire()
+        wait = WebDriverWait(driver, self.timeout)
+        try:
+            with self._stage("page_load"):
+                # Fill the form as soon as it is interactive (no fixed sleeps)
+                exam_select = self._show_form(driver, wait)
+
+            with self._stage("form_fill"):
+                exam_select.send_keys(exam)
+
+                group_select = driver.find_element(By.ID, "course")
+                group_select.send_keys(group)
+
+                # A restored form keeps the previous registration and year, hence clear()
+                reg_input = driver.find_element(By.ID, "reg_no")
+                reg_input.clear()
+                reg_input.send_keys(str(reg_no))
+
+                year_input = driver.find_element(By.ID, "exm_year")
+                year_input.clear()
+                year_input.send_keys(year)
+
+                submit_button = driver.find_element(By.NAME, "submit")
+                submit_button.click()
+
+            # Wait for the result page to replace the form
+            with self._stage("submit_wait"):
+                wait.until(EC.staleness_of(submit_button))
+                wait.until(EC.url_contains("result_show.php"))
+                # The raw HTML is parsed locally, no element text round trips through WebDriver
+                page_source = driver.page_source
+        except TimeoutException as e:
+            self.driver_pool.release(driver)
+            raise FetchError(str(e)) from e
+        except WebDriverException as e:
+            # The browser itself misbehaved; recycle it
+            self.driver_pool.release(driver, broken=True)
+            raise FetchError(str(e)) from e
+
+        self.driver_pool.release(driver)
+        return Page(page_source)
+
+    def close(self):
+        if self.own_pool:
+            self.driver_pool.close()
+
+
+BACKENDS = {
+    HttpFetcher.name: HttpFetcher,
+    SeleniumFetcher.name: SeleniumFetcher,
+}
+
+
+def create_fetcher(backend="http", **kwargs):
+    """Build a fetcher for the named backend"""
+    try:
+        return BACKENDS[backend](**kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown fetch backend: {backend} (choose from {', '.join(BACKENDS)})")
@@ -0,0 +1,83 @@
+# version: 2.1
+
+import json
+from itertools import product
+from collections import namedtuple
+from fetchers import DEFAULT_EXAM
+
+try:
+    import yaml
+except ImportError:  # YAML job files are optional, JSON always works
+    yaml = None
+
+GROUPS = ('B.A', 'B.S.S', 'B.Sc', 'B.B.A', 'B.Music', 'B.Sports')
+
+# Scraper settings a job file may set for the whole batch (ResultScraper keyword arguments)
+OPTIONS = ('backend', 'base_url', 'workers', 'rate', 'burst', 'driver_max_uses', 'probe_stride', 'probe_gap',
+           'parser', 'cache_path', 'verbose', 'report_path', 'prometheus_path',
+           'adaptive', 'columnar', 'recheck_unregistered')
+
+# One scraping job: a registration range for one (group, year, exam)
+Job = namedtuple("Job", ["group", "year", "exam", "start", "end"])
+
+
+def make_job(group, year, start, end, exam=DEFAULT_EXAM):
+    """Validate one job's fields, raising ValueError with a readable message"""
+    if group not in GROUPS:
+        raise ValueError(f"Unknown group {group!r}, expected one of {', '.join(GROUPS)}")
+    year = str(year).strip()
+    if not (year.isdigit() and len(year) == 4 and int(year) > 2000):
+        raise ValueError(f"Invalid year {year!r}, expected a 4-digit year (e.g. 2023)")
+    start, end = str(start).strip(), str(end).strip()
+    if not start.isdigit() or not end.isdigit():
+        raise ValueError("Registration numbers must be numeric")
+    if int(start) > int(end):
+        raise ValueError("Starting registration number must not exceed the ending one")
+    return Job(group, year, exam or DEFAULT_EXAM, int(start), int(end))
+
+
+def _as_list(value):
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def expand_jobs(groups, years, start, end, exams=(DEFAULT_EXAM,)):
+    """One job per (exam, group, year) combination over the same registration range"""
+    return [make_job(group, year, start, end, exam)
+            for exam, group, year in product(_as_list(exams), _as_list(groups), _as_list(years))]
+
+
+def load_jobs(path):
+    """Read a YAML/JSON job file, return (jobs, scraper options)
+
+    The file holds a `jobs` list of {group, year, start, end, exam} entries; group, year and
+    exam may be lists, expanded to every combination. Top-level `exam` is the default exam
+    and any of OPTIONS apply to the whole batch.
+    """
+    with open(path, encoding='utf-8') as file:
+        if path.endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise ValueError("PyYAML is required for YAML job files (pip install pyyaml), or use JSON")
+            spec = yaml.safe_load(file)
+        else:
+            spec = json.load(file)
+
+    if isinstance(spec, list):
+        spec = {'jobs': spec}
+    if not isinstance(spec, dict) or not spec.get('jobs'):
+        raise ValueError(f"{path}: no jobs found")
+
+    unknown = set(spec) - set(OPTIONS) - {'jobs', 'exam'}
+    if unknown:
+        raise ValueError(f"{path}: unknown setting(s) {', '.join(sorted(unknown))}")
+
+    jobs = []
+    for number, entry in enumerate(spec['jobs'], 1):
+        try:
+            jobs.extend(expand_jobs(entry['group'], entry['year'], entry['start'], entry['end'],
+                                    entry.get('exam', spec.get('exam'))))
+        except KeyError as e:
+            raise ValueError(f"{path}: job {number} is missing {e.args[0]!r}")
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{path}: job {number}: {e}")
+    options = {key: spec[key] for key in OPTIONS if key in spec}
+    return jobs, options
@@ -0,0 +1,285 @@
+# version: 2.1
+
+import os
+import time
+import struct
+import sqlite3
+import argparse
+from collections import Counter
+from rich.console import Console
+from rich.table import Table
+from rank import INPUT_CSV, ENGINES, RankingCreator, exam_tag
+from manifest import group_digests
+
+console = Console()
+
+DEFAULT_DB = os.path.join(".", "results", "leaderboard.db")
+BATCH_SIZE = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    reg_no      TEXT NOT NULL,
+    grp         TEXT NOT NULL,
+    year        TEXT NOT NULL,
+    exam        TEXT NOT NULL,
+    name        TEXT,
+    exam_roll   TEXT,
+    result      TEXT,
+    point       REAL NOT NULL,
+    courses     TEXT,
+    grades      TEXT,
+    sort_key    BLOB NOT NULL,
+    group_pos   INTEGER NOT NULL,
+    group_rank  INTEGER NOT NULL,
+    global_pos  INTEGER,
+    global_rank INTEGER,
+    PRIMARY KEY (reg_no, grp, year, exam)
+);
+CREATE INDEX IF NOT EXISTS students_group_order ON students (grp, year, exam, group_pos);
+CREATE INDEX IF NOT EXISTS students_global_order ON students (global_pos);
+CREATE TABLE IF NOT EXISTS groups (
+    grp         TEXT NOT NULL,
+    year        TEXT NOT NULL,
+    exam        TEXT NOT NULL,
+    digest      TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    PRIMARY KEY (grp, year, exam)
+);
+CREATE TABLE IF NOT EXISTS course_grades (
+    grp         TEXT NOT NULL,
+    year        TEXT NOT NULL,
+    exam        TEXT NOT NULL,
+    course      TEXT NOT NULL,
+    grade       TEXT NOT NULL,
+    count       INTEGER NOT NULL,
+    PRIMARY KEY (course, grade, grp, year, exam)
+);
+"""
+
+COLUMNS = "reg_no, grp, year, exam, name, exam_roll, result, point, grades, group_rank, global_rank"
+
+
+def _sortable(value):
+    """Map a float to an unsigned int with the same order (IEEE 754 bit trick)"""
+    bits, = struct.unpack('>Q', struct.pack('>d', value + 0.0))
+    return bits ^ 0xFFFFFFFFFFFFFFFF if bits >> 63 else bits | 1 << 63
+
+
+def sort_key(student):
+    """Bytes that order like rank_students' (-GPA, grade points) key, shorter grade lists first"""
+    values = [-student.point] + student.tie_break()
+    return struct.pack(f'>{len(values)}Q', *map(_sortable, values))
+
+
+def group_label(group, year, exam):
+    return " ".join(part for part in (group, year, exam_tag(exam)) if part)
+
+
+class Leaderboard:
+    """Ranked students indexed by registration number, per-group order and university-wide order"""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def build(self, input_csv=INPUT_CSV, engine="python", force=False):
+        """Index the ranked groups of a results CSV (or .cols directory), only re-ranking changed groups
+
+        Returns the number of groups (re)indexed.
+        """
+        from columnar import ColumnarFile, is_columnar  # Loads NumPy; the pipeline only needs sort_key
+        digests = (ColumnarFile(input_csv).group_digests() if is_columnar(input_csv)
+                   else group_digests(input_csv))
+        stored = {(group, year, exam): digest for group, year, exam, digest
+                  in self.conn.execute("SELECT grp, year, exam, digest FROM groups")}
+        changed = {key for key, digest in digests.items() if force or stored.get(key) != digest}
+        removed = set(stored) - set(digests)
+        if not changed and not removed:
+            return 0
+
+        for key in changed | removed:
+            self._delete_group(*key)
+        creator = RankingCreator(input_csv, engine=engine)
+        for group, year, exam, students in creator.ranked_groups(changed):
+            self._insert_group(group, year, exam, students, digests[(group, year, exam)])
+        for key in changed:  # Groups without rankable students are remembered as empty
+            self.conn.execute("INSERT OR IGNORE INTO groups VALUES (?, ?, ?, ?, 0)", key + (digests[key],))
+        self._rank_globally()
+        self.conn.commit()
+        return len(changed | removed)
+
+    def _delete_group(self, group, year, exam):
+        for table in ("students", "groups", "course_grades"):
+            self.conn.execute(f"DELETE FROM {table} WHERE grp = ? AND year = ? AND exam = ?", (group, year, exam))
+
+    def _insert_group(self, group, year, exam, students, digest):
+        """Store one ranked group in rank_students order, with its per-course grade counts"""
+        histogram = Counter()
+        batch = []
+        for position, student in enumerate(students):
+            grades = student.grades
+            histogram.update(zip(student.courses, grades))
+            batch.append((student.reg, group, year, exam, student.name, student.roll, student.result,
+                          student.point, ", ".join(student.courses), ", ".join(grades), sort_key(student),
+                          position, student.rank, None, None))
+            if len(batch) >= BATCH_SIZE:
+                self.conn.executemany("INSERT OR REPLACE INTO students VALUES "
+                                      "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", batch)
+                batch = []
+        self.conn.executemany("INSERT OR REPLACE INTO students VALUES "
+                              "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", batch)
+        self.conn.executemany("INSERT INTO course_grades VALUES (?, ?, ?, ?, ?, ?)",
+                              [(group, year, exam, course, grade, count)
+                               for (course, grade), count in histogram.items()])
+        self.conn.execute("INSERT OR REPLACE INTO groups VALUES (?, ?, ?, ?, ?)",
+                          (group, year, exam, digest, len(students)))
+
+    def _rank_globally(self):
+        """University-wide positions and ranks, with rank_students' tie rule across every group"""
+        rows = self.conn.execute(
+            "SELECT rowid, sort_key, point, grades FROM students ORDER BY sort_key, grp, year, exam, group_pos"
+        )
+        updates = []
+        previous = None
+        rank = 0
+        for position, (rowid, _, point, grades) in enumerate(rows, 1):
+            if (point, grades) != previous:
+                rank = position
+                previous = (point, grades)
+            updates.append((position, rank, rowid))
+        self.conn.executemany("UPDATE students SET global_pos = ?, global_rank = ? WHERE rowid = ?", updates)
+
+    def top(self, k=100, group=None, year=None, exam=None):
+        """Best `k` students overall, or within a group / year / exam; ranks are per group when all three are given"""
+        filters, params = self._filters(group, year, exam)
+        if group is not None and year is not None and exam is not None:
+            order = "group_pos"
+        else:
+            order = "global_pos"
+        return self.conn.execute(f"SELECT {COLUMNS} FROM students {filters} ORDER BY {order} LIMIT ?",
+                                 params + [k]).fetchall()
+
+    def lookup(self, reg_no):
+        """Every ranked entry of a registration number with its group size"""
+        return self.conn.execute(
+            f"SELECT {', '.join('s.' + column.strip() for column in COLUMNS.split(','))}, g.size "
+            "FROM students s JOIN groups g USING (grp, year, exam) WHERE s.reg_no = ?", (str(reg_no),)
+        ).fetchall()
+
+    def histogram(self, course=None, group=None, year=None, exam=None):
+        """{course: {grade: count}} summed over the selected groups"""
+        filters, params = self._filters(group, year, exam)
+        if course is not None:
+            filters += (" AND" if filters else "WHERE") + " course = ?"
+            params.append(course)
+        counts = {}
+        for course_code, grade, count in self.conn.execute(
+                f"SELECT course, grade, SUM(count) FROM course_grades {filters} "
+                "GROUP BY course, grade ORDER BY course", params):
+            counts.setdefault(course_code, {})[grade] = count
+        return counts
+
+    def groups(self):
+        return self.conn.execute("SELECT grp, year, exam, size FROM groups ORDER BY grp, year, exam").fetchall()
+
+    @staticmethod
+    def _filters(group, year, exam):
+        conditions, params = [], []
+        for column, value in (("grp", group), ("year", year), ("exam", exam)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        return ("WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+    def close(self):
+        self.conn.close()
+
+
+def student_table(title, rows, size=False):
+    table = Table(title=title)
+    for column in ("Global", "Rank", "Group", "Reg", "Name", "Result", "GPA", "Grades") + (("Of",) if size else ()):
+        table.add_column(column)
+    for row in rows:
+        reg_no, group, year, exam, name, _, result, point, grades, group_rank, global_rank = row[:11]
+        values = [str(global_rank), str(group_rank), group_label(group, year, exam), reg_no, name, result,
+                  f"{point:.2f}", grades.upper()]
+        table.add_row(*values + ([str(row[11])] if size else []))
+    return table
+
+
+def histogram_table(counts):
+    grades = sorted({grade for course in counts.values() for grade in course})
+    table = Table(title="Grade distribution")
+    table.add_column("Course")
+    for grade in grades:
+        table.add_column(grade.upper(), justify="right")
+    table.add_column("Total", justify="right")
+    for course, course_counts in counts.items():
+        table.add_row(course, *[str(course_counts.get(grade, 0)) for grade in grades],
+                      str(sum(course_counts.values())))
+    return table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query university-wide and per-group rankings")
+    parser.add_argument("--db", default=DEFAULT_DB, help="Leaderboard index (default: ./results/leaderboard.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Rank the results and (re)build the index for changed groups")
+    build.add_argument("--input", default=INPUT_CSV, help="Results CSV or .cols directory")
+    build.add_argument("--engine", choices=ENGINES, default="python", help="Ranking engine")
+    build.add_argument("--force", action="store_true", help="Re-index every group")
+
+    top = commands.add_parser("top", help="Best students overall or within a group")
+    top.add_argument("-k", type=int, default=100, help="Number of students (default: 100)")
+    lookup = commands.add_parser("lookup", help="Ranks of registration numbers")
+    lookup.add_argument("reg_no", nargs="+")
+    histogram = commands.add_parser("histogram", help="Grade counts per course")
+    histogram.add_argument("--course", help="Only this course code")
+    commands.add_parser("groups", help="Indexed groups and their sizes")
+    for command in (top, histogram):
+        command.add_argument("--group", help="e.g. B.Sc")
+        command.add_argument("--year", help="e.g. 2023")
+        command.add_argument("--exam", help="Exam name as stored, e.g. \"Bachelor Degree (Honours) 2nd Year\"")
+    args = parser.parse_args()
+
+    if args.command != "build" and not os.path.exists(args.db):
+        console.print(f"Error: no leaderboard at {args.db}, run `leaderboard.py build` first", style="bold red")
+        raise SystemExit(1)
+    board = Leaderboard(args.db)
+    started = time.perf_counter()
+    try:
+        if args.command == "build":
+            if not os.path.exists(args.input):
+                console.print(f"Error: results not found at {args.input}", style="bold red")
+                raise SystemExit(1)
+            count = board.build(args.input, args.engine, args.force)
+            message = f"Indexed {count} changed group(s)" if count else "Leaderboard is up to date"
+            console.print(message, style="bold green")
+        elif args.command == "top":
+            console.print(student_table(f"Top {args.k}", board.top(args.k, args.group, args.year, args.exam)))
+        elif args.command == "lookup":
+            rows = [row for reg_no in args.reg_no for row in board.lookup(reg_no)]
+            if not rows:
+                console.print("No ranked result for " + ", ".join(args.reg_no), style="bold red")
+            else:
+                console.print(student_table("Lookup", rows, size=True))
+        elif args.command == "histogram":
+            console.print(histogram_table(board.histogram(args.course, args.group, args.year, args.exam)))
+        else:
+            table = Table(title="Groups")
+            for column in ("Group", "Year", "Exam", "Students"):
+                table.add_column(column)
+            for group, year, exam, size in board.groups():
+                table.add_row(group, year, exam or "-", str(size))
+            console.print(table)
+    finally:
+        board.close()
+    console.print(f"{(time.perf_counter() - started) * 1000:.1f} ms", style="dim")
@@ -0,0 +1,79 @@
+# version: 2.1
+
+import os
+import csv
+import json
+import hashlib
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 2
+
+
+def group_key(group, year, exam):
+    """Manifest key for one ranking group"""
+    return f"{group}|{year}|{exam}"
+
+
+def group_digests(csv_path, settings=""):
+    """Content hash of every (group, year, exam)'s input rows, without parsing grades"""
+    hashes = {}
+    with open(csv_path, mode='r', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return {}
+        group_i = header.index('Group') if 'Group' in header else None
+        year_i = header.index('Year') if 'Year' in header else None
+        exam_i = header.index('Exam') if 'Exam' in header else None
+
+        for row in reader:
+            # Same grouping values csv.DictReader gives RankingCreator (None for short rows)
+            group = 'Unknown' if group_i is None else (row[group_i] if group_i < len(row) else None)
+            year = '' if year_i is None else (row[year_i] if year_i < len(row) else None)
+            exam = '' if exam_i is None else (row[exam_i] if exam_i < len(row) else None)
+            digest = hashes.get((group, year, exam))
+            if digest is None:
+                digest = hashes[(group, year, exam)] = hashlib.sha256(settings.encode('utf-8'))
+            digest.update("\x1f".join(row).encode('utf-8'))
+            digest.update(b"\x1e")
+    return {key: digest.hexdigest() for key, digest in hashes.items()}
+
+
+class ReportManifest:
+    """Input hash and produced artifacts of every group, stored next to the reports"""
+
+    def __init__(self, output_dir):
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.output_dir = output_dir
+        self.groups = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding='utf-8') as file:
+                    data = json.load(file)
+                if data.get("version") == MANIFEST_VERSION:
+                    self.groups = data.get("groups", {})
+            except (OSError, ValueError):
+                self.groups = {}  # A broken manifest only costs a full rebuild
+
+    def is_current(self, group, year, exam, digest):
+        """True when the group's rows are unchanged and all of its artifacts still exist"""
+        entry = self.groups.get(group_key(group, year, exam))
+        if not entry or entry.get("hash") != digest:
+            return False
+        return all(os.path.exists(os.path.join(self.output_dir, name)) for name in entry.get("artifacts", []))
+
+    def record(self, group, year, exam, digest, artifacts):
+        self.groups[group_key(group, year, exam)] = {
+            "group": group,
+            "year": year,
+            "exam": exam,
+            "hash": digest,
+            "artifacts": [os.path.basename(path) for path in artifacts],
+        }
+
+    def save(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({"version": MANIFEST_VERSION, "groups": self.groups}, file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
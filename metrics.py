@@ -0,0 +1,175 @@
+# version: 2.1
+
+import os
+import json
+import math
+import time
+import threading
+from contextlib import contextmanager
+
+# Log-spaced latency buckets: four per doubling from 0.1 ms up to ~30 minutes
+BUCKET_START = 0.0001
+BUCKETS_PER_DOUBLING = 4
+BUCKET_COUNT = 96
+BUCKET_BOUNDS = [BUCKET_START * 2 ** (i / BUCKETS_PER_DOUBLING) for i in range(BUCKET_COUNT)]
+
+OUTCOMES = ("ok", "not_registered", "unrecognized", "failed")
+METRIC_PREFIX = "nu_clear"
+MAX_EVENTS = 1000
+
+
+class Histogram:
+    """Fixed log-bucket latency histogram; quantiles are accurate to one bucket (~19%)"""
+
+    def __init__(self):
+        self.counts = [0] * (BUCKET_COUNT + 1)  # Last bucket catches everything slower
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, seconds):
+        if seconds <= BUCKET_START:
+            index = 0
+        else:
+            index = min(BUCKET_COUNT, math.ceil(math.log2(seconds / BUCKET_START) * BUCKETS_PER_DOUBLING))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation, clamped to the observed range"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                bound = BUCKET_BOUNDS[index] if index < BUCKET_COUNT else self.max
+                return min(max(bound, self.min), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_s": round(self.sum, 6),
+            "mean_s": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50_s": round(self.quantile(0.50), 6),
+            "p95_s": round(self.quantile(0.95), 6),
+            "p99_s": round(self.quantile(0.99), 6),
+            "max_s": round(self.max, 6),
+        }
+
+
+class RunMetrics:
+    """Thread-safe stage timings, retry and outcome counters for one scraping run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+        self.events = []
+        self.started = time.time()
+        self.finished = None
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        """Time the enclosed block as one observation of `stage`"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def outcome(self, status):
+        with self.lock:
+            self.outcomes[status] = self.outcomes.get(status, 0) + 1
+
+    def event(self, message):
+        """Log a timestamped decision (e.g. of the concurrency controller) in the report"""
+        with self.lock:
+            if len(self.events) < MAX_EVENTS:
+                self.events.append({"at_s": round(time.time() - self.started, 3), "message": message})
+
+    def finish(self):
+        self.finished = time.time()
+
+    def report(self):
+        """JSON-ready run report"""
+        with self.lock:
+            elapsed = (self.finished or time.time()) - self.started
+            results = sum(self.outcomes.values())
+            return {
+                "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+                "elapsed_s": round(elapsed, 3),
+                "results": results,
+                "throughput_per_s": round(results / elapsed, 3) if elapsed > 0 else 0.0,
+                "outcomes": dict(self.outcomes),
+                "outcome_ratio": {status: round(count / results, 4) if results else 0.0
+                                  for status, count in self.outcomes.items()},
+                "counters": dict(self.counters),
+                "stages": {stage: histogram.summary() for stage, histogram in sorted(self.stages.items())},
+                "events": list(self.events),
+            }
+
+    def write_json(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.report(), file, indent=2)
+        return path
+
+    def write_prometheus(self, path):
+        """Write the metrics in Prometheus text format (for the node_exporter textfile collector)"""
+        report = self.report()
+        lines = [
+            f"# HELP {METRIC_PREFIX}_stage_seconds Time spent per scraping stage",
+            f"# TYPE {METRIC_PREFIX}_stage_seconds histogram",
+        ]
+        with self.lock:
+            for stage, histogram in sorted(self.stages.items()):
+                cumulative = 0
+                for index, count in enumerate(histogram.counts[:BUCKET_COUNT]):
+                    cumulative += count
+                    if index % BUCKETS_PER_DOUBLING == 0:  # One exported bucket per doubling
+                        lines.append(f'{METRIC_PREFIX}_stage_seconds_bucket{{stage="{stage}",'
+                                     f'le="{BUCKET_BOUNDS[index]:.6g}"}} {cumulative}')
+                lines.append(f'{METRIC_PREFIX}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{METRIC_PREFIX}_stage_seconds_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+                lines.append(f'{METRIC_PREFIX}_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+        lines += [f"# HELP {METRIC_PREFIX}_results_total Results by outcome",
+                  f"# TYPE {METRIC_PREFIX}_results_total counter"]
+        lines += [f'{METRIC_PREFIX}_results_total{{outcome="{status}"}} {count}'
+                  for status, count in report["outcomes"].items()]
+        for name, value in sorted(report["counters"].items()):
+            lines += [f"# TYPE {METRIC_PREFIX}_{name}_total counter", f"{METRIC_PREFIX}_{name}_total {value}"]
+        lines += [f"# TYPE {METRIC_PREFIX}_throughput_per_second gauge",
+                  f"{METRIC_PREFIX}_throughput_per_second {report['throughput_per_s']}",
+                  f"# TYPE {METRIC_PREFIX}_elapsed_seconds gauge",
+                  f"{METRIC_PREFIX}_elapsed_seconds {report['elapsed_s']}"]
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = path + ".tmp"  # Written atomically so a collector never reads half a file
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            file.write("\n".join(lines) + "\n")
+        os.replace(temp_path, path)
+        return path
@@ -0,0 +1,170 @@
+# version: 2.1
+
+import time
+import queue
+import argparse
+import threading
+from bisect import insort
+from rich.console import Console
+from rich.table import Table
+from manifest import ReportManifest, group_digests
+from rank import GRADE_POINTS, assign_ranks, student_record
+from records import GradeTable
+from store import csv_row
+from leaderboard import group_label, sort_key
+
+try:
+    from sortedcontainers import SortedList
+except ImportError:  # Without sortedcontainers rankings are plain lists with bisect insertion
+    SortedList = None
+
+console = Console()
+
+QUEUE_SIZE = 1000
+TOP_N = 10
+TOP_INTERVAL = 30.0
+_DONE = object()
+
+
+class GroupRanking:
+    """One group's students, kept in rank_students order as they arrive"""
+
+    def __init__(self):
+        self.entries = SortedList() if SortedList is not None else []
+        self.arrivals = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, student):
+        # Arrival order breaks exact ties, like the stable sort over the CSV rows written in the same order
+        entry = (sort_key(student), self.arrivals, student)
+        self.arrivals += 1
+        if SortedList is not None:
+            self.entries.add(entry)
+        else:
+            insort(self.entries, entry)
+
+    def top(self, n):
+        """The best `n` students, ranked; ranks only depend on the students above"""
+        return assign_ranks([entry[2] for entry in self.entries[:n]])
+
+    def ranked(self):
+        return assign_ranks([entry[2] for entry in self.entries])
+
+
+class StreamingRanker:
+    """Rank scraped results while the scrape runs: a bounded queue feeding one sorted ranking per group"""
+
+    def __init__(self, top=TOP_N, interval=TOP_INTERVAL, queue_size=QUEUE_SIZE):
+        self.top = top
+        self.interval = interval
+        self.queue = queue.Queue(maxsize=queue_size)  # A full queue holds the scraper back, memory stays bounded
+        self.table = GradeTable(GRADE_POINTS)
+        self.groups = {}
+        self.changed = set()  # Groups with new students since the last top-N display
+        self.thread = threading.Thread(target=self.consume, name="ranker", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def put(self, result_data):
+        """Queue one scraped result (ResultScraper.on_result)"""
+        self.queue.put(result_data)
+
+    def close(self):
+        """Rank everything still queued and stop the ranking thread"""
+        self.queue.put(_DONE)
+        self.thread.join()
+
+    def consume(self):
+        shown = time.monotonic()
+        while True:
+            result_data = self.queue.get()
+            if result_data is _DONE:
+                return
+            try:
+                self.add(result_data)
+            except Exception as e:
+                console.print(f"{result_data.get('Registration No')}: Error ranking record - {str(e)}",
+                              style="bold red")
+            if self.top and time.monotonic() - shown >= self.interval:
+                self.show_top()
+                shown = time.monotonic()
+
+    def add(self, result_data):
+        """Add one result to its group's ranking, exactly as rank.py would read it back from the CSV"""
+        row = csv_row(result_data)
+        student = student_record(row, self.table)
+        if student is None:
+            return
+        key = (row['Group'], row['Year'], row['Exam'])
+        ranking = self.groups.get(key)
+        if ranking is None:
+            ranking = self.groups[key] = GroupRanking()
+        ranking.add(student)
+        self.changed.add(key)
+
+    def show_top(self, keys=None):
+        """Print the current top-N of the groups that changed since the last display"""
+        for key in sorted(self.changed if keys is None else keys):
+            ranking = self.groups[key]
+            table = Table(title=f"Top {self.top}: {group_label(*key)} ({len(ranking)} ranked so far)")
+            for column in ("Rank", "Reg", "Name", "Result", "GPA", "Grades"):
+                table.add_column(column)
+            for student in ranking.top(self.top):
+                table.add_row(str(student.rank), student.reg, student.name, student.result,
+                              f"{student.point:.2f}", ", ".join(student.raw_grades).upper())
+            console.print(table)
+        self.changed.clear()
+
+    def ranked_groups(self, only=None):
+        """Yield (group, year, exam, ranked students) like RankingCreator.ranked_groups"""
+        for (group, year, exam), ranking in self.groups.items():
+            if only is None or (group, year, exam) in only:
+                yield group, year, exam, ranking.ranked()
+
+    def render(self, creator, csv_path):
+        """Render the reports of every changed group with `creator`, recording the CSV's digests in its manifest"""
+        started = time.perf_counter()
+        students = sum(len(ranking) for ranking in self.groups.values())
+        console.print(f"\nRanked {students} students in {len(self.groups)} group(s) while scraping, "
+                      "rendering reports...", style="bold green")
+        creator.manifest = ReportManifest(creator.OUTPUT_DIR)
+        creator.digests = group_digests(csv_path, creator.settings)
+        changed = creator.changed_groups()
+        if changed:
+            creator.render_groups(self.ranked_groups(changed), changed, started)
+
+
+def scrape_and_rank(scraper, creator, run, top=TOP_N, interval=TOP_INTERVAL):
+    """Call `run` (a scrape with `scraper`) while ranking its results, then render the reports
+
+    Returns True when results were collected and ranked.
+    """
+    ranker = StreamingRanker(top, interval).start()
+    scraper.on_result = ranker.put
+    try:
+        collected = run()
+    finally:
+        scraper.on_result = None
+        ranker.close()
+    if not collected:
+        return False
+    if top:
+        ranker.show_top(ranker.groups)
+    ranker.render(creator, scraper.INPUT_CSV)
+    return True
+
+
+def add_pipeline_arguments(parser):
+    """Streaming options of the students.py pipeline command"""
+    parser.add_argument("--stream", action=argparse.BooleanOptionalAction, default=True,
+                        help="Rank results while they are scraped instead of re-reading the CSV afterwards "
+                             "(default: on; --resume always ranks from the CSV)")
+    parser.add_argument("--top", type=int, default=TOP_N,
+                        help=f"Students shown in the live top list of each group (default: {TOP_N}, 0 = off)")
+    parser.add_argument("--top-every", type=float, default=TOP_INTERVAL, metavar="SECONDS",
+                        help=f"Seconds between live top list updates (default: {TOP_INTERVAL:.0f})")
+    return parser
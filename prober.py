@@ -0,0 +1,99 @@
+# version: 2.0
+
+from store import NOT_REGISTERED
+
+
+def is_registered(result):
+    """True for any result that is not the "not registered" placeholder"""
+    return NOT_REGISTERED not in result["Name"]
+
+
+class SparseProber:
+    """Sample a registration range coarsely and only sweep the bands that contain students.
+
+    `fetch_many(registrations)` must yield one result dict per registration, in order.
+    Every band of registered students wider than `stride` is found by the coarse
+    pass; the sweep around a hit stops after `gap` consecutive unregistered numbers,
+    so keep `gap >= stride` to be sure neighbouring bands are not cut short.
+    """
+
+    def __init__(self, fetch_many, stride=100, gap=100, batch_size=8):
+        if stride < 1 or gap < 1:
+            raise ValueError("Stride and gap must be positive")
+        self.fetch_many = fetch_many
+        self.stride = int(stride)
+        self.gap = int(gap)
+        self.batch_size = max(1, int(batch_size))
+        self.requests = 0
+        self.linear_requests = 0
+        self.found = 0
+
+    @property
+    def saved_requests(self):
+        return self.linear_requests - self.requests
+
+    def _fetch(self, registrations, samples):
+        """Fetch a batch, reusing coarse samples instead of requesting them again"""
+        wanted = [reg_no for reg_no in registrations if reg_no not in samples]
+        self.requests += len(wanted)
+        fetched = dict(zip(wanted, self.fetch_many(wanted))) if wanted else {}
+        return [samples.pop(reg_no) if reg_no in samples else fetched[reg_no] for reg_no in registrations]
+
+    def _walk(self, first, last, step, samples):
+        """Sweep from `first` towards `last` until `gap` consecutive misses, yielding results"""
+        misses = 0
+        reg_no = first
+        while misses < self.gap and (reg_no <= last if step > 0 else reg_no >= last):
+            count = min(self.batch_size, abs(last - reg_no) + 1)
+            batch = [reg_no + step * i for i in range(count)]
+            for result in self._fetch(batch, samples):
+                misses = 0 if is_registered(result) else misses + 1
+                yield result
+            reg_no = batch[-1] + step
+
+    def scan(self, start_reg, end_reg):
+        """Yield results for every probed registration in ascending order"""
+        self.requests = 0
+        self.linear_requests = end_reg - start_reg + 1
+        self.found = 0
+        if end_reg < start_reg:
+            return
+
+        # 1. Coarse pass over the whole range
+        positions = list(range(start_reg, end_reg + 1, self.stride))
+        if positions[-1] != end_reg:
+            positions.append(end_reg)
+        self.requests += len(positions)
+        samples = dict(zip(positions, self.fetch_many(positions)))
+        hits = [reg_no for reg_no in positions if is_registered(samples[reg_no])]
+
+        # 2. Exhaustive sweep outwards from every hit, in registration order
+        covered = start_reg - 1
+        for hit in hits:
+            if hit <= covered or hit not in samples:
+                continue
+
+            left = list(self._walk(hit - 1, covered + 1, -1, samples))
+            band_start = hit - len(left)
+            yield from self._flush_samples(samples, band_start - 1)
+            for result in reversed(left):
+                yield self._count(result)
+            yield self._count(samples.pop(hit))
+
+            right = 0
+            for result in self._walk(hit + 1, end_reg, 1, samples):
+                right += 1
+                yield self._count(result)
+            covered = hit + right
+
+        yield from self._flush_samples(samples, end_reg)
+
+    def _flush_samples(self, samples, upto):
+        """Emit coarse samples below `upto` that no sweep has consumed"""
+        for reg_no in sorted(reg_no for reg_no in samples if reg_no <= upto):
+            yield self._count(samples.pop(reg_no))
+
+    def _count(self, result):
+        if is_registered(result):
+            self.found += 1
+        return result
@@ -1,11 +1,20 @@
 # version: 2.1
 
 import os
+import re
+import sys
 import csv
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from fpdf import FPDF
 from colorama import init, Fore, Style
 from rich.console import Console
 from rich.progress import track
+from manifest import ReportManifest, group_digests
+from fetchers import DEFAULT_EXAM
+from records import GradeTable, StudentRecord, normalize_grade
+from report_formats import WRITERS, course_columns
 
 init(autoreset=True)
 console = Console()
@@ -21,154 +30,418 @@ GRADE_POINTS = {
     'absent': -1.00  # Added Absent with lowest value
 }
 
+ENGINES = ("python", "numpy")
+LAYOUTS = ("detailed", "compact")
+FORMATS = ("pdf", "csv", "html")  # CSV and HTML are written in one pass, far faster than PDF for big groups
+# Students per PDF part. FPDF builds the document by repeated string concatenation, so render
+# time grows quadratically with document size; bounded parts keep every render short.
+CHUNK_SIZE = 1000
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+try:
+    from pypdf import PdfWriter
+except ImportError:  # Without pypdf large groups are rendered as a single part
+    PdfWriter = None
+
+
+def exam_tag(exam):
+    """Short file name tag for an exam, empty for the default (1st year) exam"""
+    if not exam or exam == DEFAULT_EXAM:
+        return ""
+    match = re.search(r"(\d)(?:st|nd|rd|th)\s+Year", exam)
+    return f"Y{match.group(1)}" if match else re.sub(r"\W+", "", exam)[:24]
+
+
+def report_filename(group_name, year, extension="pdf", exam=""):
+    """File name for a group's report, e.g. BSc_24.pdf, or BSc_24_Y2.pdf for the 2nd year exam"""
+    year_suffix = year[-2:] if year else "00"
+    tag = exam_tag(exam)
+    tag = f"_{tag}" if tag else ""
+    return f"{group_name.replace('.', '').replace(' ', '_')}_{year_suffix}{tag}.{extension}"
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process and of finished worker processes, in MB"""
+    if resource is None:
+        return None, None
+    unit = 1024 * 1024 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KiB elsewhere
+    self_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return self_peak / unit, children_peak / unit
+
+
+def render_pdf(students, group_name, year, path, layout="detailed", total=None, title=True, exam="", courses=None):
+    """Render one PDF (or one part of a split group) to `path`
+
+    `courses` are the compact layout's grade columns; parts of one group must share the whole group's.
+    """
+    pdf = FPDF(orientation='L' if layout == "compact" else 'P')
+    pdf.set_auto_page_break(auto=layout != "compact", margin=15)
+    pdf.add_page()
+
+    # PDF Header (only on the first part of a group)
+    if title:
+        pdf.set_font("Arial", 'B', 16)
+        pdf.cell(0, 10, "National University - Examination Results", 0, 1, 'C')
+        pdf.cell(0, 10, f"Official Ranking List - {group_name} Group {year}", 0, 1, 'C')
+        if exam:
+            pdf.cell(0, 10, exam, 0, 1, 'C')
+        pdf.cell(0, 10, f"Total Students: {total if total is not None else len(students)}", 0, 1, 'C')
+        pdf.ln(10)
+
+    if layout == "compact":
+        _write_compact(pdf, students, courses)
+    else:
+        _write_detailed(pdf, students)
+    pdf.output(path)
+    return path
+
+
+def _write_detailed(pdf, students):
+    """One block per student with a bordered course table"""
+    for student in students:
+        pdf.set_font("Arial", '', 12)
+
+        # Student Info (without course count)
+        info = [
+            f"Rank: {student['Rank']}",
+            f"Name: {student['Name']}",
+            f"Roll: {student['Exam Roll']}",
+            f"Reg: {student['Registration No']}",
+            f"Result: {student['Result']}",
+            f"GPA: {student['Point']:.2f}"
+        ]
+
+        for line in info:
+            pdf.cell(0, 10, line, 0, 1)
+        pdf.ln(5)
+
+        # Course Grades Table
+        pdf.set_font("Arial", 'B', 12)
+        pdf.cell(40, 10, "Course Code", 1)
+        pdf.cell(30, 10, "Grade", 1)
+        pdf.ln()
+        pdf.set_font("Arial", '', 12)
+
+        for course, grade in zip(student['Courses'], student['Raw Grades']):
+            pdf.cell(40, 10, course, 1)
+            pdf.cell(30, 10, grade.upper(), 1)
+            pdf.ln()
+
+        pdf.ln(10)
+
+
+def _write_compact(pdf, students, courses=None):
+    """One table row per student, with a column per course"""
+    if courses is None:
+        courses = course_columns(students)
+
+    columns = [("Rank", 14), ("Reg", 30), ("Name", 62), ("Roll", 22), ("Result", 20), ("GPA", 14)]
+    available = pdf.w - pdf.l_margin - pdf.r_margin - sum(width for _, width in columns)
+    grade_width = min(16, available / max(1, len(courses)))
+    row_height = 6
+    bottom = pdf.h - 15
+
+    def table_header():
+        pdf.set_font("Arial", 'B', 8)
+        for label, width in columns:
+            pdf.cell(width, row_height, label, 1, 0, 'C')
+        for course in courses:
+            pdf.cell(grade_width, row_height, course, 1, 0, 'C')
+        pdf.ln()
+        pdf.set_font("Arial", '', 8)
+
+    table_header()
+    for student in students:
+        if pdf.get_y() + row_height > bottom:
+            pdf.add_page()
+            table_header()
+        grades = dict(zip(student['Courses'], student['Raw Grades']))
+        values = [str(student['Rank']), student['Registration No'], student['Name'][:38],
+                  student['Exam Roll'], student['Result'], f"{student['Point']:.2f}"]
+        for (label, width), value in zip(columns, values):
+            pdf.cell(width, row_height, value, 1, 0, 'L' if label == "Name" else 'C')
+        for course in courses:
+            pdf.cell(grade_width, row_height, grades.get(course, "-").upper(), 1, 0, 'C')
+        pdf.ln()
+
+
+def merge_pdfs(parts, path):
+    """Concatenate rendered parts into the final report and remove them"""
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(part)
+    with open(path, "wb") as file:
+        writer.write(file)
+    writer.close()
+    for part in parts:
+        os.remove(part)
+    return path
+
+
+def student_record(row, table):
+    """StudentRecord for one nu_results.csv row, None for rows that are not ranked"""
+    # Skip unregistered, format-not-recognized and failed-to-retrieve students
+    if ("This Student Is Not Registered" in row['Name'] or
+        "Result Format Not Recognized" in row['Name'] or
+        "Failed to retrieve" in row['Name']):
+        return None
+
+    raw_grades = [g.strip().lower() for g in row['Grades'].split(',')]
+    courses = [c.strip() for c in row['Courses'].split(',')]
+    if len(courses) != len(raw_grades):
+        return None
+
+    codes = table.encode(raw_grades)
+    grade_count = len(codes)
+    point = sum(table.values[c] for c in codes) / grade_count if grade_count > 0 else 0.00
+    return StudentRecord(
+        row['Name'], row['Exam Roll'], row['Registration No'], row['Result'],
+        table.courses(courses), codes, round(point, 2),
+        row.get('Group', 'Unknown'), row.get('Year', ''), row.get('Exam', ''), table
+    )
+
+
+def assign_ranks(students):
+    """Rank students already in ranking order; equal GPA and grades share a rank"""
+    current_rank = 1
+    for i, student in enumerate(students):
+        if i > 0:
+            prev = students[i-1]
+            if not (student.point == prev.point and
+                    student.grade_key() == prev.grade_key()):
+                current_rank = i + 1
+        student.rank = current_rank
+    return students
+
+
 class RankingCreator:
-    def __init__(self, input_csv=INPUT_CSV, output_dir=OUTPUT_DIR):
+    def __init__(self, input_csv=INPUT_CSV, output_dir=OUTPUT_DIR, engine="python",
+                 layout="detailed", processes=None, chunk_size=CHUNK_SIZE, incremental=True, formats=("pdf",)):
         self.INPUT_CSV = input_csv
         self.OUTPUT_DIR = output_dir
+        self.engine = engine
+        self.layout = layout
+        self.formats = tuple(name for name in FORMATS if name in formats)
+        self.processes = processes if processes is not None else (os.cpu_count() or 1)
+        self.chunk_size = max(1, int(chunk_size))
+        self.incremental = incremental
+        self.manifest = None
+        self.digests = {}
+        self.reported = set()
 
     def generate_rankings(self):
         """Generate ranking reports for all groups"""
         console.print("\nGenerating ranking reports for all groups...", style="bold green")
+        started = time.perf_counter()
 
-        # Load and filter student data
-        all_students = self.load_student_data()
-
-        if not all_students:
+        if not os.path.exists(self.INPUT_CSV):
+            console.print(f"Error: CSV file not found at {self.INPUT_CSV}", style="bold red")
+            return
+        from columnar import ColumnarFile, is_columnar  # Loads NumPy, only imported once the input is known
+        columnar = is_columnar(self.INPUT_CSV)
+        if columnar and self.engine != "numpy":
+            console.print("Columnar input is ranked with the numpy engine", style="bold yellow")
+
+        # Only re-rank and re-render groups whose input rows changed since the last run
+        self.manifest = ReportManifest(self.OUTPUT_DIR)
+        try:
+            self.digests = (ColumnarFile(self.INPUT_CSV).group_digests(self.settings) if columnar
+                            else group_digests(self.INPUT_CSV, self.settings))
+        except (ImportError, ValueError) as e:
+            console.print(f"Error: {e}", style="bold red")
+            return
+        changed = self.changed_groups()
+        if changed:
+            self.render_groups(self.ranked_groups(changed), changed, started)
+
+    @property
+    def settings(self):
+        """Output settings hashed into the group digests, so changing them rebuilds the reports"""
+        if self.formats == ("pdf",):
+            return self.layout  # Same digests as before other formats existed
+        return "|".join((self.layout,) + self.formats)
+
+    def changed_groups(self):
+        """Groups in self.digests whose reports are missing or out of date (all of them without incremental)"""
+        changed = set(self.digests)
+        if self.incremental:
+            changed = {key for key, digest in self.digests.items() if not self.manifest.is_current(*key, digest)}
+            skipped = [key for key in self.digests if key not in changed]
+            if skipped:
+                names = ", ".join(" ".join(part for part in (group, year, exam_tag(exam)) if part)
+                                  for group, year, exam in skipped)
+                console.print(f"Skipped {len(skipped)} unchanged group(s): {names}", style="bold yellow")
+            if not changed:
+                console.print("All ranking reports are up to date", style="bold green")
+        return changed
+
+    def render_groups(self, ranked_groups, changed, started):
+        """Render ranked groups, record them (and the `changed` groups without students) in the manifest"""
+        # Generate separate reports for each group
+        if self.processes > 1 and "pdf" in self.formats:
+            generated = self.render_parallel(ranked_groups)
+        else:
+            generated = 0
+            for group, year, exam, ranked_students in ranked_groups:
+                artifacts = self.write_reports(ranked_students, group, year, exam)
+                if "pdf" in self.formats:
+                    artifacts.append(self.generate_pdf_report(ranked_students, group, year, exam))
+                self.report_done(group, year, exam, artifacts)
+                generated += 1
+
+        # Groups without rankable students produce no report, remember them as done too
+        empty = changed - self.reported
+        for key in empty:
+            self.manifest.record(*key, self.digests[key], [])
+        if empty:
+            self.manifest.save()
+
+        if not generated:
             console.print("No valid student records found", style="bold red")
             return
 
-        # Group students by their group
+        console.print(f"\nAll ranking reports generated in: {self.OUTPUT_DIR}", style="bold green")
+        self.print_render_stats(generated, time.perf_counter() - started)
+
+    def report_done(self, group, year, exam, artifacts):
+        """Announce a finished group and record it in the manifest"""
+        console.print(f"Generated ranking report for {group} group", style="bold green")
+        self.reported.add((group, year, exam))
+        digest = self.digests.get((group, year, exam))
+        if self.manifest is not None and digest is not None:
+            self.manifest.record(group, year, exam, digest, artifacts)
+            self.manifest.save()
+
+    def print_render_stats(self, reports, seconds):
+        """Report wall-clock time and peak memory of the report run"""
+        main_mb, workers_mb = peak_rss_mb()
+        memory = ""
+        if main_mb is not None:
+            memory = f", peak RSS {main_mb:.0f} MB (main)"
+            if self.processes > 1:
+                memory += f" / {workers_mb:.0f} MB (largest worker)"
+        console.print(f"Rendered {reports} report(s) in {seconds:.1f}s{memory}", style="bold green")
+
+    def plan_parts(self, students, group_name, year, exam=""):
+        """Split a ranked group into page-range parts that can be rendered independently"""
+        path = os.path.join(self.OUTPUT_DIR, report_filename(group_name, year, exam=exam))
+        # Every part gets the group's course columns, so the merged table keeps one column layout
+        courses = course_columns(students) if self.layout == "compact" else None
+        if PdfWriter is None or len(students) <= self.chunk_size:
+            return path, [(students, group_name, year, path, self.layout, len(students), True, exam, courses)]
+
+        parts = []
+        for index, start in enumerate(range(0, len(students), self.chunk_size)):
+            part_path = f"{path}.part{index:04d}"
+            chunk = students[start:start + self.chunk_size]
+            parts.append((chunk, group_name, year, part_path, self.layout, len(students), index == 0, exam,
+                          courses))
+        return path, parts
+
+    def render_parallel(self, ranked_groups):
+        """Render every group's report (and the parts of large groups) in a process pool"""
+        self.ensure_directory_exists(self.OUTPUT_DIR)
+        generated = 0
+        pending = {}
+        with ProcessPoolExecutor(max_workers=self.processes) as pool:
+            futures = {}
+            for group, year, exam, ranked_students in ranked_groups:
+                path, parts = self.plan_parts(ranked_students, group, year, exam)
+                for part in parts:
+                    futures[pool.submit(render_pdf, *part)] = path
+                # Other formats are written here while the pool renders the PDF
+                artifacts = self.write_reports(ranked_students, group, year, exam)
+                pending[path] = ((group, year, exam), [part[3] for part in parts], len(parts), artifacts)
+
+            for future in as_completed(futures):
+                future.result()
+                path = futures[future]
+                key, part_paths, remaining, artifacts = pending[path]
+                pending[path] = (key, part_paths, remaining - 1, artifacts)
+                if remaining - 1 == 0:
+                    if part_paths != [path]:
+                        merge_pdfs(part_paths, path)
+                    self.report_done(*key, artifacts + [path])
+                    generated += 1
+        return generated
+
+    def ranked_groups(self, only=None):
+        """Yield (group, year, exam, ranked students) for every (group, year, exam) in the CSV, or just `only`"""
+        from columnar import is_columnar
+        if self.engine == "numpy" or is_columnar(self.INPUT_CSV):
+            from fastrank import ColumnarRanker, np
+            if np is not None:
+                yield from ColumnarRanker(self.INPUT_CSV, only).ranked_groups()
+                return
+            console.print("NumPy is not installed, using the python ranking engine", style="bold yellow")
+
+        # Load and filter student data
+        all_students = self.load_student_data(only)
+
+        # Group students by their group, year and exam
         grouped_students = {}
         for student in all_students:
-            group = student.get('Group', 'Unknown')
-            if group not in grouped_students:
-                grouped_students[group] = []
-            grouped_students[group].append(student)
+            key = (student.get('Group', 'Unknown'), student.get('Year', ''), student.get('Exam', ''))
+            if key not in grouped_students:
+                grouped_students[key] = []
+            grouped_students[key].append(student)
 
-        # Generate separate PDFs for each group
-        for group, students in grouped_students.items():
+        for (group, year, exam), students in grouped_students.items():
             if students:
-                ranked_students = self.rank_students(students)
-                year = students[0].get('Year', '')
-                self.generate_pdf_report(ranked_students, group, year)
-                console.print(f"Generated ranking report for {group} group", style="bold green")
-
-        console.print(f"\nAll ranking reports generated in: {self.OUTPUT_DIR}", style="bold green")
+                yield group, year, exam, self.rank_students(students)
 
-    def load_student_data(self):
-        """Load and filter student data from CSV"""
+    def load_student_data(self, only=None):
+        """Load and filter student data from CSV, optionally only for some (group, year, exam) keys"""
         students = []
         if not os.path.exists(self.INPUT_CSV):
             console.print(f"Error: CSV file not found at {self.INPUT_CSV}", style="bold red")
             return students
 
+        table = GradeTable(GRADE_POINTS)  # Shared grade codes and course tuples keep each record small
         with open(self.INPUT_CSV, mode='r', encoding='utf-8') as file:
             reader = csv.DictReader(file)
             for row_num, row in enumerate(reader, 1):
                 try:
-                    # Skip unregistered and format-not-recognized students
-                    if ("This Student Is Not Registered" in row['Name'] or
-                        "Result Format Not Recognized" in row['Name']):
-                        continue
-
-                    raw_grades = [g.strip().lower() for g in row['Grades'].split(',')]
-                    grades = [self.normalize_grade(g) for g in raw_grades]
-                    courses = [c.strip() for c in row['Courses'].split(',')]
-                    group = row.get('Group', 'Unknown')
-
-                    if len(courses) != len(grades):
+                    if only is not None and (row.get('Group', 'Unknown'), row.get('Year', ''),
+                                             row.get('Exam', '')) not in only:
                         continue
 
-                    grade_count = len(grades)
-                    point = sum(GRADE_POINTS.get(g, -1.00) for g in grades) / grade_count if grade_count > 0 else 0.00
-
-                    students.append({
-                        'Name': row['Name'],
-                        'Exam Roll': row['Exam Roll'],
-                        'Registration No': row['Registration No'],
-                        'Result': row['Result'],
-                        'Courses': courses,
-                        'Grades': grades,
-                        'Raw Grades': raw_grades,
-                        'Point': round(point, 2),
-                        'Group': group,
-                        'Year': row.get('Year', '')  # Corrected the unterminated string literal
-                    })
+                    student = student_record(row, table)
+                    if student is not None:
+                        students.append(student)
                 except Exception as e:
                     console.print(f"Row {row_num}: Error processing record - {str(e)}", style="bold red")
         return students
 
     def rank_students(self, students):
-        """Rank students with proper tie-breaking"""
+        """Rank StudentRecords in place with proper tie-breaking"""
         if not students:
             return []
 
-        students.sort(key=lambda x: (
-            -x['Point'],
-            [GRADE_POINTS.get(g, -1.00) for g in x['Grades']]
-        ))
+        students.sort(key=lambda x: (-x.point, x.tie_break()))
+        return assign_ranks(students)
 
-        current_rank = 1
-        for i, student in enumerate(students):
-            if i > 0:
-                prev = students[i-1]
-                if not (student['Point'] == prev['Point'] and
-                        student['Grades'] == prev['Grades']):
-                    current_rank = i + 1
-            student['Rank'] = current_rank
-
-        return students
+    def write_reports(self, students, group_name, year, exam=""):
+        """Write the selected single-pass formats (CSV, HTML) of one group, return their paths"""
+        self.ensure_directory_exists(self.OUTPUT_DIR)
+        return [WRITERS[name](students, group_name, year,
+                              os.path.join(self.OUTPUT_DIR, report_filename(group_name, year, name, exam)), exam)
+                for name in self.formats if name in WRITERS]
 
-    def generate_pdf_report(self, students, group_name, year):
+    def generate_pdf_report(self, students, group_name, year, exam=""):
         """Generate PDF report for a specific group"""
         self.ensure_directory_exists(self.OUTPUT_DIR)
-        pdf = FPDF()
-        pdf.set_auto_page_break(auto=True, margin=15)
-        pdf.add_page()
-
-        # PDF Header
-        pdf.set_font("Arial", 'B', 16)
-        pdf.cell(0, 10, "National University - Examination Results", 0, 1, 'C')
-        pdf.cell(0, 10, f"Official Ranking List - {group_name} Group {year}", 0, 1, 'C')
-        pdf.cell(0, 10, f"Total Students: {len(students)}", 0, 1, 'C')
-        pdf.ln(10)
-
-        # Student Results
-        for student in students:
-            pdf.set_font("Arial", '', 12)
-
-            # Student Info (without course count)
-            info = [
-                f"Rank: {student['Rank']}",
-                f"Name: {student['Name']}",
-                f"Roll: {student['Exam Roll']}",
-                f"Reg: {student['Registration No']}",
-                f"Result: {student['Result']}",
-                f"GPA: {student['Point']:.2f}"
-            ]
-
-            for line in info:
-                pdf.cell(0, 10, line, 0, 1)
-            pdf.ln(5)
-
-            # Course Grades Table
-            pdf.set_font("Arial", 'B', 12)
-            pdf.cell(40, 10, "Course Code", 1)
-            pdf.cell(30, 10, "Grade", 1)
-            pdf.ln()
-            pdf.set_font("Arial", '', 12)
-
-            for course, grade in zip(student['Courses'], student['Raw Grades']):
-                pdf.cell(40, 10, course, 1)
-                pdf.cell(30, 10, grade.upper(), 1)
-                pdf.ln()
-
-            pdf.ln(10)
-
-        # Save PDF
-        year_suffix = year[-2:] if year else "00"
-        filename = f"{group_name.replace('.', '').replace(' ', '_')}_{year_suffix}.pdf"
-        pdf.output(os.path.join(self.OUTPUT_DIR, filename))
+        path, parts = self.plan_parts(students, group_name, year, exam)
+        for part in parts:
+            render_pdf(*part)
+        if len(parts) > 1:
+            merge_pdfs([part[3] for part in parts], path)
+        return path
 
     def ensure_directory_exists(self, directory):
         """Ensure directory exists"""
@@ -177,13 +450,40 @@ class RankingCreator:
 
     def normalize_grade(self, grade):
         """Convert grade to standard format"""
-        grade = str(grade).strip().lower()
-        if grade == 'fail':
-            return 'f'
-        elif grade == 'absent':
-            return 'absent'
-        return grade
+        return normalize_grade(grade)
+
+def add_rank_arguments(parser, input_csv=True):
+    """Ranking options shared by rank.py and the students.py subcommands"""
+    if input_csv:
+        parser.add_argument("--input", default=INPUT_CSV,
+                            help="Results CSV or columnar .cols directory (default: ./results/nu_results.csv)")
+    parser.add_argument("--output", default=OUTPUT_DIR, help="Report directory (default: ./reports)")
+    parser.add_argument("--engine", choices=ENGINES, default="python",
+                        help="Ranking engine (numpy is faster for large files)")
+    parser.add_argument("--layout", choices=LAYOUTS, default="detailed",
+                        help="PDF layout: detailed blocks or one compact row per student")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Processes used to render reports (default: CPU count, 1 = sequential)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help=f"Students per PDF part for large groups (default: {CHUNK_SIZE}, needs pypdf)")
+    parser.add_argument("--format", nargs="+", choices=FORMATS, default=["pdf"], dest="formats",
+                        help="Report formats: pdf, a ranked csv (opens in Excel) and/or a searchable html page "
+                             "(default: pdf)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-render every group, even if its rows did not change")
+    return parser
+
+
+def creator_from_args(args, input_csv=None):
+    """Build a RankingCreator from parsed add_rank_arguments options"""
+    return RankingCreator(input_csv or args.input, args.output, engine=args.engine, layout=args.layout,
+                          processes=args.processes, chunk_size=args.chunk_size,
+                          incremental=not args.force, formats=args.formats)
+
 
 if __name__ == "__main__":
-    creator = RankingCreator()
+    parser = add_rank_arguments(argparse.ArgumentParser(description="Generate ranking reports from collected results"))
+    args = parser.parse_args()
+
+    creator = creator_from_args(args)
     creator.generate_rankings()
@@ -0,0 +1,131 @@
+# version: 2.1
+
+import sys
+
+# Report field name -> StudentRecord attribute, so records read like the old student dicts
+FIELDS = {
+    'Name': 'name',
+    'Exam Roll': 'roll',
+    'Registration No': 'reg',
+    'Result': 'result',
+    'Courses': 'courses',
+    'Grades': 'grades',
+    'Raw Grades': 'raw_grades',
+    'Point': 'point',
+    'Group': 'group',
+    'Year': 'year',
+    'Exam': 'exam',
+    'Rank': 'rank',
+}
+
+
+def normalize_grade(grade):
+    """Convert grade to standard format"""
+    grade = str(grade).strip().lower()
+    if grade == 'fail':
+        return 'f'
+    return grade
+
+
+class GradeTable:
+    """Grade vocabulary shared by a cohort: every distinct raw grade is a one-byte code"""
+
+    def __init__(self, points):
+        self.points = points
+        self.codes = {}               # Raw grade -> code
+        self.raw = []                 # Code -> raw grade as shown in reports
+        self.names = []               # Code -> normalized grade
+        self.values = []              # Code -> grade point
+        self.norm = bytes(range(256))  # bytes.translate table: code -> first code with the same normalized grade
+        self.course_lists = {}        # Interned course tuples, shared by every student with the same courses
+
+    def code(self, raw):
+        code = self.codes.get(raw)
+        if code is None:
+            if len(self.raw) == 256:
+                raise ValueError("More than 256 distinct grades")
+            code = self.codes[raw] = len(self.raw)
+            name = normalize_grade(raw)
+            self.raw.append(raw)
+            self.names.append(name)
+            self.values.append(self.points.get(name, -1.00))
+            norm = bytearray(self.norm)
+            norm[code] = self.names.index(name)
+            self.norm = bytes(norm)
+        return code
+
+    def encode(self, raw_grades):
+        """Grade codes for a student's raw (stripped, lower-case) grades"""
+        codes = self.codes
+        try:
+            return bytes([codes[raw] for raw in raw_grades])
+        except KeyError:
+            return bytes([self.code(raw) for raw in raw_grades])
+
+    def courses(self, courses):
+        """The shared tuple for a list of course codes"""
+        courses = tuple(courses)
+        shared = self.course_lists.get(courses)
+        if shared is None:
+            shared = self.course_lists[courses] = tuple(map(sys.intern, courses))
+        return shared
+
+
+class StudentRecord:
+    """One student for ranking and reports, about a fifth of the size of the old dict layout"""
+
+    __slots__ = ('name', 'roll', 'reg', 'result', 'courses', 'codes', 'point', 'group', 'year', 'exam',
+                 'rank', 'table')
+
+    def __init__(self, name, roll, reg, result, courses, codes, point, group, year, exam, table, rank=None):
+        self.name = name
+        self.roll = roll
+        self.reg = reg
+        self.result = sys.intern(result)
+        self.courses = courses
+        self.codes = codes
+        self.point = point
+        self.group = sys.intern(group)
+        self.year = sys.intern(year)
+        self.exam = sys.intern(exam)
+        self.table = table
+        self.rank = rank
+
+    @property
+    def grades(self):
+        """Normalized grades, e.g. 'f' for a raw 'fail'"""
+        names = self.table.names
+        return [names[code] for code in self.codes]
+
+    @property
+    def raw_grades(self):
+        raw = self.table.raw
+        return [raw[code] for code in self.codes]
+
+    def tie_break(self):
+        """Grade points in course order, compared after GPA when ranking"""
+        values = self.table.values
+        return [values[code] for code in self.codes]
+
+    def grade_key(self):
+        """Bytes equal for two students exactly when their normalized grades are equal"""
+        return self.codes.translate(self.table.norm)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, FIELDS[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        setattr(self, FIELDS[key], value)
+
+    def get(self, key, default=None):
+        attribute = FIELDS.get(key)
+        return getattr(self, attribute) if attribute is not None else default
+
+    def keys(self):
+        return FIELDS.keys()
+
+    def __repr__(self):
+        return f"StudentRecord({self.reg!r}, {self.name!r}, point={self.point!r}, rank={self.rank!r})"
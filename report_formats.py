@@ -0,0 +1,141 @@
+# version: 2.1
+
+import os
+import csv
+import html
+import json
+
+# Ranked list columns before the per-course grade columns, shared by every writer
+COLUMNS = ("Rank", "Registration No", "Exam Roll", "Name", "Result", "GPA")
+PAGE_SIZE = 100
+
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 2em; }}
+h1, h2, h3, p.total {{ text-align: center; margin: 0.3em; }}
+.controls {{ margin: 1.5em 0 0.8em; display: flex; gap: 1em; align-items: center; }}
+#search {{ flex: 1; max-width: 28em; padding: 0.4em; font-size: 1em; }}
+table {{ border-collapse: collapse; width: 100%; font-size: 0.9em; }}
+th, td {{ border: 1px solid #999; padding: 0.25em 0.5em; text-align: center; }}
+th {{ background: #eee; position: sticky; top: 0; }}
+td:nth-child(4) {{ text-align: left; }}
+.pager {{ margin: 0.8em 0; text-align: center; }}
+</style>
+</head>
+<body>
+<h1>National University - Examination Results</h1>
+<h2>Official Ranking List - {group} Group {year}</h2>
+{exam}<p class="total">Total Students: {total}</p>
+<div class="controls">
+<input id="search" type="search" placeholder="Search by name, registration or roll" autofocus>
+<span id="status"></span>
+</div>
+<table>
+<thead><tr>{header}</tr></thead>
+<tbody id="rows"></tbody>
+</table>
+<div class="pager"><button id="prev">Previous</button> <span id="page"></span> <button id="next">Next</button></div>
+<script>
+const ROWS = [
+"""
+
+HTML_TAIL = """];
+const PAGE_SIZE = %d;
+const body = document.getElementById("rows");
+const search = document.getElementById("search");
+const statusLabel = document.getElementById("status");
+const pageLabel = document.getElementById("page");
+const prev = document.getElementById("prev");
+const next = document.getElementById("next");
+let matches = ROWS;
+let page = 0;
+
+function render() {
+  const pages = Math.max(1, Math.ceil(matches.length / PAGE_SIZE));
+  page = Math.min(page, pages - 1);
+  const fragment = document.createDocumentFragment();
+  for (const row of matches.slice(page * PAGE_SIZE, (page + 1) * PAGE_SIZE)) {
+    const tr = document.createElement("tr");
+    for (const value of row) {
+      const td = document.createElement("td");
+      td.textContent = value;
+      tr.appendChild(td);
+    }
+    fragment.appendChild(tr);
+  }
+  body.replaceChildren(fragment);
+  pageLabel.textContent = `Page ${page + 1} of ${pages}`;
+  statusLabel.textContent = matches === ROWS ? `${ROWS.length} students` : `${matches.length} of ${ROWS.length} students`;
+  prev.disabled = page === 0;
+  next.disabled = page >= pages - 1;
+}
+
+search.addEventListener("input", () => {
+  const query = search.value.trim().toLowerCase();
+  matches = query ? ROWS.filter(row => `${row[1]} ${row[2]} ${row[3]}`.toLowerCase().includes(query)) : ROWS;
+  page = 0;
+  render();
+});
+prev.addEventListener("click", () => { page -= 1; render(); });
+next.addEventListener("click", () => { page += 1; render(); });
+render();
+</script>
+</body>
+</html>
+""" % PAGE_SIZE
+
+
+def course_columns(students):
+    """Every course code of a group in order of first appearance"""
+    courses = {}
+    for student_courses in dict.fromkeys(student.courses for student in students):  # Course tuples are shared
+        courses.update(dict.fromkeys(student_courses))
+    return list(courses)
+
+
+def ranked_rows(students, courses):
+    """One list per student in COLUMNS order, then the raw grade of every course ('' when not taken)"""
+    positions = {course: i for i, course in enumerate(courses)}
+    for student in students:
+        grades = [""] * len(courses)
+        for course, grade in zip(student.courses, student.raw_grades):
+            grades[positions[course]] = grade.upper()
+        yield [student.rank, student.reg, student.roll, student.name, student.result, f"{student.point:.2f}"] + grades
+
+
+def write_csv_report(students, group_name, year, path, exam=""):
+    """Ranked list as CSV with a column per course; the UTF-8 BOM makes Excel read it as UTF-8"""
+    courses = course_columns(students)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', newline='', encoding='utf-8-sig') as file:
+        writer = csv.writer(file)
+        writer.writerow(list(COLUMNS) + courses)
+        writer.writerows(ranked_rows(students, courses))
+    os.replace(temp_path, path)
+    return path
+
+
+def write_html_report(students, group_name, year, path, exam=""):
+    """Static page with the ranked list as data, paged and searched in the browser"""
+    courses = course_columns(students)
+    header = "".join(f"<th>{html.escape(column)}</th>" for column in list(COLUMNS) + courses)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        file.write(HTML_HEAD.format(
+            title=html.escape(f"{group_name} {year} {exam}".strip()), group=html.escape(group_name),
+            year=html.escape(year), exam=f"<h3>{html.escape(exam)}</h3>\n" if exam else "",
+            total=len(students), header=header
+        ))
+        for row in ranked_rows(students, courses):
+            # "</" would end the script element early
+            file.write(json.dumps(row).replace("</", "<\\/") + ",\n")
+        file.write(HTML_TAIL)
+    os.replace(temp_path, path)
+    return path
+
+
+WRITERS = {"csv": write_csv_report, "html": write_html_report}
@@ -0,0 +1,120 @@
+# version: 2.1
+
+import re
+from html import unescape
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional, the regex tokenizer handles the NU page layout
+    etree = None
+
+PARSERS = ("regex", "lxml")
+DEFAULT_PARSER = "regex"  # Fastest on NU pages; lxml copes better with badly broken markup
+
+# Regex tokenizer, tolerant of the unclosed <tr>/<td> tags the result server emits
+TABLE_RE = re.compile(r"<table\b.*?(?:</table\s*>|$)", re.S | re.I)
+ROW_RE = re.compile(r"<tr\b[^>]*>(.*?)(?=<tr\b|</table\s*>|$)", re.S | re.I)
+CELL_RE = re.compile(r"<t[dh]\b[^>]*>(.*?)(?=<t[dh]\b|</tr\s*>|$)", re.S | re.I)
+TAG_RE = re.compile(r"<[^>]*>")
+
+ROW_XPATH = etree.XPath("./tr | ./*/tr") if etree is not None else None
+
+PUBLISHED_LABEL = "Published on:"
+FIELD_LABELS = {
+    "Name of Student": "Name",
+    "Exam. Roll": "Exam Roll",
+    "Result": "Result",
+}
+
+
+class UnrecognizedPage(ValueError):
+    """Raised when a page holds no result table the parser understands"""
+
+
+# Everything parse_result raises for a page it cannot read, UnrecognizedPage included
+PARSE_ERRORS = (ValueError, IndexError) + ((etree.LxmlError,) if etree is not None else ())
+
+
+def check_parser(parser):
+    """Raise ValueError for an unknown parser or one whose library is not installed"""
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown parser: {parser} (choose from {', '.join(PARSERS)})")
+    if parser == "lxml" and etree is None:
+        raise ValueError("The lxml parser needs lxml (pip install lxml)")
+
+
+def _clean(text):
+    return " ".join(text.split())
+
+
+def regex_tables(source):
+    """Yield each table as a list of rows, each row a list of cell texts"""
+    for table in TABLE_RE.finditer(source):
+        rows = []
+        for row in ROW_RE.finditer(table.group(0)):
+            cells = [_clean(unescape(TAG_RE.sub(" ", cell))) for cell in CELL_RE.findall(row.group(1))]
+            if cells:
+                rows.append(cells)
+        yield rows
+
+
+def lxml_tables(source):
+    """Same as regex_tables, using lxml's HTML parser"""
+    document = etree.HTML(source)
+    if document is None:
+        return
+    for table in document.iter("table"):
+        rows = []
+        for row in ROW_XPATH(table):
+            cells = [_clean("".join(cell.itertext())) for cell in row if cell.tag in ("td", "th")]
+            if cells:
+                rows.append(cells)
+        yield rows
+
+
+def parse_result(source, reg_no, parser=DEFAULT_PARSER):
+    """Parse a result page's HTML into the dict extract_result_data returns
+
+    Raises UnrecognizedPage when the page has no student result block.
+    """
+    if parser == "lxml" and etree is None:
+        raise ImportError("The lxml parser needs lxml (pip install lxml)")
+    tables = lxml_tables(source) if parser == "lxml" else regex_tables(source)
+
+    data = {
+        "Name": "",
+        "Exam Roll": "",
+        "Registration No": reg_no,
+        "Result": "",
+        "Grades": [],
+        "Published Date": ""
+    }
+    found = False
+
+    for rows in tables:
+        in_grades = False
+        for cells in rows:
+            if in_grades:
+                # Grade rows run until the first row without a course and a grade
+                values = [cell for cell in cells if cell]
+                if len(values) < 2:
+                    break
+                data["Grades"].append({
+                    "Course Code": values[0].split()[0],
+                    "Grade": values[1].split()[0].lower()
+                })
+                continue
+
+            label = cells[0]
+            field = FIELD_LABELS.get(label)
+            if field is not None:
+                data[field] = " ".join(cells[1:]).strip()
+                found = found or field == "Name"
+            elif label.startswith(PUBLISHED_LABEL):
+                data["Published Date"] = label[len(PUBLISHED_LABEL):].strip()
+            elif label == "Course Code" and len(cells) > 1 and cells[1] == "Obtained Grade":
+                in_grades = True
+
+    if not found:
+        raise UnrecognizedPage(f"No result block found for {reg_no}")
+    return data
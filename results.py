@@ -1,29 +1,143 @@
 # version: 2.0
 
 import os
-import csv
 import time
 import sys
+import argparse
+import threading
+from collections import deque
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor
 from threading import Thread
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
 from colorama import init, Fore, Style
 from rich.console import Console
 from rich.progress import track, Progress, SpinnerColumn, BarColumn, TextColumn
+from fetchers import BASE_URL, DEFAULT_EXAM, NOT_REGISTERED_MARKER, DriverPool, FetchError, create_fetcher
+from throttle import RateLimiter, AimdController, CircuitBreaker, ThrottledFetcher, backoff_delay
+from prober import SparseProber
+from store import ResultStore, CsvStreamWriter, result_status, NOT_REGISTERED, NOT_RECOGNIZED, FAILED
+from result_parser import PARSERS, PARSE_ERRORS, DEFAULT_PARSER, check_parser, parse_result
+from cache import DEFAULT_CACHE, DEFAULT_TTL, DEFAULT_MAX_BYTES, CacheMiss, CachingFetcher, PageCache
+from metrics import RunMetrics
+from jobs import GROUPS, OPTIONS, Job, make_job, expand_jobs, load_jobs
+from shards import (SHARD_MODES, parse_shard, shard_block, shard_path, shard_registrations, start_jobs,
+                    finish_jobs)
 
 init(autoreset=True)
 console = Console()
 
+def round_robin(iterables):
+    """Interleave several iterables: a1, b1, c1, a2, b2, ..."""
+    iterators = deque(iter(iterable) for iterable in iterables)
+    while iterators:
+        iterator = iterators.popleft()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            continue
+        yield item
+        iterators.append(iterator)
+
+
+class WorkerPool:
+    """Worker threads with one fetcher (browser or HTTP session) each, reused for a whole run"""
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.executor = ThreadPoolExecutor(max_workers=scraper.workers, thread_name_prefix="scraper")
+        self.local = threading.local()
+        self.fetchers = []
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def fetcher(self):
+        """Fetcher owned by the calling worker thread, created on first use"""
+        if not hasattr(self.local, "fetcher"):
+            self.local.fetcher = self.scraper.create_fetcher()
+            with self.lock:
+                self.fetchers.append(self.local.fetcher)
+        return self.local.fetcher
+
+    def map(self, registrations, group, year, on_done=None, exam=DEFAULT_EXAM):
+        """Yield results in registration order, keeping a bounded window in flight"""
+        return self.map_tasks(zip(registrations, repeat(Job(group, year, exam, None, None))), on_done)
+
+    def map_tasks(self, tasks, on_done=None):
+        """Like map, for (reg_no, job) pairs that may mix exams, groups and years"""
+        work = lambda reg_no, job: self.scraper.process_registration(self.fetcher(), reg_no, job.group,
+                                                                     job.year, job.exam)
+        window = self.scraper.workers * 2
+        pending = deque()
+        try:
+            for reg_no, job in tasks:
+                future = self.executor.submit(work, reg_no, job)
+                if on_done is not None:
+                    future.add_done_callback(on_done)
+                pending.append(future)
+
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        for fetcher in self.fetchers:
+            fetcher.close()
+        self.fetchers = []
+
+
 class ResultScraper:
-    def __init__(self, input_csv="./results/nu_results.csv"):
+    def __init__(self, input_csv="./results/nu_results.csv", backend="http", base_url=BASE_URL,
+                 workers=4, rate=2.0, burst=4, probe_stride=100, probe_gap=100, driver_max_uses=200,
+                 parser=DEFAULT_PARSER, cache_path=None, cache_ttl=DEFAULT_TTL,
+                 cache_max_bytes=DEFAULT_MAX_BYTES, offline=False, verbose=True, report_path=None,
+                 prometheus_path=None, adaptive=True, columnar=False, shard=None,
+                 recheck_unregistered=False):
+        self.shard = shard  # This machine's part of every range; results go to per-shard files
+        if shard is not None:
+            input_csv = shard_path(input_csv, shard)
         self.INPUT_CSV = input_csv
-        self.service = Service(ChromeDriverManager().install())
+        self.STORE_DB = os.path.splitext(input_csv)[0] + ".db"
+        self.COLUMNAR_DIR = None
+        if columnar:
+            from columnar import columnar_path  # Loads NumPy, only needed when a .cols copy is written
+            self.COLUMNAR_DIR = columnar_path(input_csv)
+        self.REPORT_JSON = report_path or os.path.splitext(input_csv)[0] + "_report.json"
+        self.prometheus_path = prometheus_path
+        self.verbose = verbose  # One console line per registration; rich output is costly on long runs
+        self.metrics = RunMetrics()
+        self.backend = backend
+        self.base_url = base_url
+        self.workers = max(1, int(workers))
+        self.rate_limiter = RateLimiter(rate, burst)  # Be polite to the server, in aggregate
+        # Adaptive mode backs off below --workers/--rate when the server slows down or fails
+        self.controller = AimdController(self.rate_limiter, self.workers, log=self.log_control) if adaptive else None
+        self.breaker = CircuitBreaker(log=self.log_control) if adaptive else None
+        self.probe_stride = probe_stride
+        self.probe_gap = probe_gap
+        self.driver_max_uses = driver_max_uses
+        check_parser(parser)  # Fail before scraping, not with every page stored as unrecognized
+        self.parser = parser
+        self.offline = offline  # Serve every page from the cache, never touching the network
+        # NU shows the "not registered" page before results are published, so that status can be outdated
+        self.recheck_unregistered = recheck_unregistered
+        self.cache = None
+        if cache_path or offline:
+            # Offline runs replay whatever is stored, however old
+            self.cache = PageCache(cache_path or DEFAULT_CACHE, None if offline else cache_ttl, cache_max_bytes)
+        self.driver_pool = None  # Chrome is only started once the selenium backend fetches
+        self.on_result = None  # Called with every recorded result, e.g. by the streaming pipeline
+        self.pool_lock = threading.Lock()
         self.group_options = {
             '1': 'B.A',
             '2': 'B.S.S',
@@ -33,14 +147,6 @@ class ResultScraper:
             '6': 'B.Sports'
         }
 
-        # Chrome Configuration
-        self.chrome_options = Options()
-        self.chrome_options.add_argument("--headless")
-        self.chrome_options.add_argument("--disable-gpu")
-        self.chrome_options.add_argument("--window-size=1200,800")
-        self.chrome_options.add_argument("--no-sandbox")
-        self.chrome_options.add_argument("--disable-dev-shm-usage")
-
     def get_user_inputs(self):
         """Get all required inputs from user in correct order"""
         console.print("\n" + "="*50, style="bold blue")
@@ -86,144 +192,285 @@ class ResultScraper:
 
         return group, start_reg, end_reg, year
 
-    def run_data_collection(self):
+    def run_data_collection(self, resume=False, discover=False):
         """Main execution flow"""
         group, start_reg, end_reg, year = self.get_user_inputs()
+        return self.run_jobs([make_job(group, year, start_reg, end_reg)], resume, discover)
 
+    def run_jobs(self, jobs, resume=False, discover=False):
+        """Scrape a batch of jobs without prompting, sharing one worker pool and rate limit"""
         # Show summary
-        console.print(f"\nStarting scraping from {start_reg} to {end_reg}", style="bold green")
-        console.print(f"Group: {group}", style="bold green")
-        console.print(f"Exam Year: {year}", style="bold green")
-
-        # Perform scraping with progress bar
-        results = self.scrape_results(start_reg, end_reg, group, year)
+        for job in jobs:
+            console.print(f"\nStarting scraping from {job.start} to {job.end}", style="bold green")
+            console.print(f"Group: {job.group}", style="bold green")
+            console.print(f"Exam Year: {job.year}", style="bold green")
+            if job.exam != DEFAULT_EXAM:
+                console.print(f"Exam: {job.exam}", style="bold green")
+
+        # Perform scraping with progress bar (rows are streamed to the CSV as they arrive)
+        try:
+            collected = self.scrape_jobs(jobs, resume, discover)
+        finally:
+            self.close()
 
-        if results:
-            if self.save_to_csv(results):
+        if collected or resume:
+            # A resumed run also needs the rows stored by earlier runs
+            if not resume or self.export_csv(jobs):
                 console.print("\n" + "="*50, style="bold blue")
                 console.print(f"Successfully collected results to {self.INPUT_CSV}", style="bold green")
                 console.print("="*50 + "\n", style="bold blue")
+                if self.COLUMNAR_DIR:
+                    return self.write_columnar()
                 return True
 
         console.print("❌ No results were collected", style="bold red")
         return False
 
-    def scrape_results(self, start_reg, end_reg, group, year):
-        """Scrape results with proper error handling"""
-        driver = webdriver.Chrome(service=self.service, options=self.chrome_options)
-        wait = WebDriverWait(driver, 30)  # Increased timeout
-        all_results = []
+    def write_columnar(self):
+        """Convert the collected CSV to the columnar format read by the numpy ranking engine"""
+        from columnar import csv_to_columnar
+        try:
+            path, count = csv_to_columnar(self.INPUT_CSV, self.COLUMNAR_DIR)
+        except (OSError, ValueError, ImportError) as e:
+            console.print(f"❌ Error writing columnar results: {e}", style="bold red")
+            return False
+        console.print(f"Wrote {count} rows in columnar format to {path}", style="bold green")
+        return True
+
+    def create_fetcher(self):
+        """Create the page fetcher for the configured backend, behind the page cache if enabled"""
+        if self.cache is None:
+            return self.create_backend_fetcher()
+        fetcher = None if self.offline else self.create_backend_fetcher()
+        return CachingFetcher(fetcher, self.cache, self.offline)
+
+    def create_backend_fetcher(self):
+        """Backend fetcher behind the circuit breaker, rate limiter and concurrency controller"""
+        if self.backend == "selenium":
+            with self.pool_lock:
+                if self.driver_pool is None:
+                    self.driver_pool = DriverPool(self.driver_max_uses)
+            fetcher = create_fetcher(self.backend, base_url=self.base_url, driver_pool=self.driver_pool,
+                                     metrics=self.metrics)
+        else:
+            fetcher = create_fetcher(self.backend, base_url=self.base_url)
+        return ThrottledFetcher(fetcher, self.rate_limiter, self.controller, self.breaker, self.metrics)
+
+    def log_control(self, message):
+        """Log a concurrency controller or circuit breaker decision"""
+        self.metrics.event(message)
+        console.print(f"⚙️ {message}", style="bold yellow")
+
+    def close(self):
+        """Shut down pooled browsers and the page cache"""
+        if self.driver_pool is not None:
+            self.driver_pool.close()
+            self.driver_pool = None
+        if self.cache is not None:
+            console.print(f"Page cache: {self.cache.hits} hits, {self.cache.misses} misses", style="bold green")
+            self.cache.close()
+            self.cache = None
+
+    def scrape_results(self, start_reg, end_reg, group, year, resume=False, discover=False, exam=DEFAULT_EXAM):
+        """Scrape one registration range, streaming each result to the store and CSV"""
+        return self.scrape_jobs([Job(group, year, exam, start_reg, end_reg)], resume, discover)
+
+    def scrape_jobs(self, jobs, resume=False, discover=False):
+        """Scrape jobs on a single worker pool, streaming results to the store and CSV
+
+        Registrations of all jobs are interleaved so one warm pool serves every (exam, group, year).
+        """
+        collected = 0
+        self.metrics = RunMetrics()
+        store = ResultStore(self.STORE_DB)
+        if discover and resume:
+            console.print("Note: --resume is ignored in discovery mode", style="bold yellow")
+        if self.shard is not None:
+            start_jobs(store.conn, self.shard, jobs, discover)
+            if discover and self.shard.mode != "blocked":
+                console.print("Note: discovery scrapes one contiguous block per shard", style="bold yellow")
 
         try:
-            with Progress(
+            with WorkerPool(self) as pool, CsvStreamWriter(self.INPUT_CSV) as writer, Progress(
                 SpinnerColumn(),
                 "[progress.description]{task.description}",
                 BarColumn(),
                 TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
                 console=console,
             ) as progress:
-                task = progress.add_task("Scraping...", total=end_reg - start_reg + 1)
-                current_reg = start_reg
-                while current_reg <= end_reg:
-                    result_data = self.process_registration(driver, wait, current_reg, group, year)
-                    all_results.append(result_data)
-
-                    # Single output per registration
-                    status = "Not registered" if "This Student Is Not Registered" in result_data["Name"] else "Success"
-                    console.print(f"✅ {current_reg}: {status}", style="bold green")
-
-                    current_reg += 1
-                    progress.advance(task)
-                    time.sleep(2)  # Be polite to the server
+                if discover:
+                    # Each range is probed on its own, the band search needs ordered results
+                    for job in jobs:
+                        collected += self.discover_job(job, pool, store, writer, progress)
+                else:
+                    streams, total = [], 0
+                    for job in jobs:
+                        registrations, count = self.plan_job(job, store, resume)
+                        streams.append(zip(registrations, repeat(job)))
+                        total += count
+                    label = f"{jobs[0].group} {jobs[0].year}" if len(jobs) == 1 else f"{len(jobs)} jobs"
+                    task = progress.add_task(f"Scraping {label}...", total=total)
+                    on_done = lambda future: progress.advance(task)
+                    for result_data in pool.map_tasks(round_robin(streams), on_done):
+                        collected += self.record(result_data, store, writer)
+            if self.shard is not None:
+                finish_jobs(store.conn, jobs)  # Lets `shards.py merge` tell finished shards from interrupted ones
         except Exception as e:
             console.print(f"❌ Critical error: {str(e)}", style="bold red")
         finally:
-            driver.quit()
-            return all_results
-
-    def process_registration(self, driver, wait, reg_no, group, year):
+            store.close()
+            self.write_run_report()
+            return collected
+
+    def write_run_report(self):
+        """Finish the run's metrics, write the JSON (and Prometheus) report and print a summary"""
+        self.metrics.finish()
+        if self.cache is not None:
+            self.metrics.counters.update(cache_hits=self.cache.hits, cache_misses=self.cache.misses)
+        report = self.metrics.report()
+        try:
+            self.metrics.write_json(self.REPORT_JSON)
+            if self.prometheus_path:
+                self.metrics.write_prometheus(self.prometheus_path)
+        except OSError as e:
+            console.print(f"❌ Error writing run report: {str(e)}", style="bold red")
+
+        outcomes = ", ".join(f"{count} {status}" for status, count in report["outcomes"].items())
+        console.print(f"Run: {report['results']} results in {report['elapsed_s']:.1f}s "
+                      f"({report['throughput_per_s']:.2f}/s): {outcomes}, "
+                      f"{report['counters'].get('retries', 0)} retries", style="bold green")
+        for stage in ("wait", "fetch", "parse", "save"):
+            summary = report["stages"].get(stage)
+            if summary:
+                latencies = "   ".join(f"{q} {summary[q + '_s'] * 1000:8.1f} ms" for q in ("p50", "p95", "p99"))
+                console.print(f"  {stage:<6} {latencies}   total {summary['total_s']:8.1f}s", style="bold green")
+        console.print(f"Run report written to {self.REPORT_JSON}", style="bold green")
+
+    def plan_job(self, job, store, resume=False):
+        """Registrations of a job that still need fetching, and their count"""
+        registrations = range(job.start, job.end + 1)
+        if self.shard is not None:
+            registrations = shard_registrations(self.shard, job.start, job.end)
+        if resume:
+            # Skip keys already stored; only "Failed to retrieve" ones are fetched again
+            done = store.completed(job.group, job.year, job.exam, job.start, job.end)
+            if self.recheck_unregistered:
+                done -= store.completed(job.group, job.year, job.exam, job.start, job.end, status="not_registered")
+            done = {reg_no for reg_no in done if reg_no in registrations}
+            console.print(f"Resuming {job.group} {job.year}: {len(done)} already collected, "
+                          f"{len(registrations) - len(done)} remaining", style="bold green")
+        elif self.recheck_unregistered:
+            done = set()
+        else:
+            # A registration the server rejected for this exam, group and year is not asked again
+            done = store.completed(job.group, job.year, job.exam, job.start, job.end, status="not_registered")
+            done = {reg_no for reg_no in done if reg_no in registrations}
+            if done:
+                console.print(f"Skipping {len(done)} registrations known to be unregistered for "
+                              f"{job.group} {job.year} (--recheck-unregistered fetches them)", style="bold yellow")
+        return (reg_no for reg_no in registrations if reg_no not in done), len(registrations) - len(done)
+
+    def discover_job(self, job, pool, store, writer, progress):
+        """Probe one job's range for bands of registered students, return the rows collected"""
+        collected = 0
+        task = progress.add_task(f"Scraping {job.group} {job.year}...", total=None)
+        on_done = lambda future: progress.advance(task)
+        fetch_many = lambda regs: self.iter_results(regs, job.group, job.year, on_done, pool, job.exam)
+        prober = SparseProber(fetch_many, self.probe_stride, self.probe_gap, self.workers * 2)
+        start, end = job.start, job.end
+        if self.shard is not None:
+            start, end = shard_block(self.shard, job.start, job.end)
+        try:
+            for result_data in prober.scan(start, end):
+                collected += self.record(result_data, store, writer)
+        finally:
+            console.print(
+                f"Discovery: {prober.found} registered students found with {prober.requests} requests, "
+                f"{prober.saved_requests} fewer than a linear sweep of {prober.linear_requests}",
+                style="bold green"
+            )
+        return collected
+
+    def record(self, result_data, store, writer):
+        """Save one result to the store and the CSV, return 1"""
+        self.metrics.outcome(result_status(result_data["Name"]))
+        if self.offline and FAILED in result_data["Name"]:
+            # Offline misses say nothing about the student; stored results and the CSV are left alone
+            return 1
+        with self.metrics.timer("save"):
+            store.save(result_data, result_data["Exam"])
+            writer.write(result_data)
+        if self.on_result is not None:
+            self.on_result(result_data)
+
+        # Single output per registration
+        if self.verbose:
+            with self.metrics.timer("console"):
+                status = "Not registered" if NOT_REGISTERED in result_data["Name"] else "Success"
+                console.print(f"✅ {result_data['Registration No']}: {status}", style="bold green")
+        return 1
+
+    def iter_results(self, registrations, group, year, on_done=None, pool=None, exam=DEFAULT_EXAM):
+        """Fetch registrations on the worker pool, yielding results in registration order"""
+        if pool is not None:
+            yield from pool.map(registrations, group, year, on_done, exam)
+            return
+        with WorkerPool(self) as pool:
+            yield from pool.map(registrations, group, year, on_done, exam)
+
+    def process_registration(self, fetcher, reg_no, group, year, exam=DEFAULT_EXAM):
         """Process single registration with retries"""
         attempts = 0
         max_attempts = 3
 
         while attempts < max_attempts:
             try:
-                driver.get("http://result.nu.ac.bd")
-                time.sleep(1)
-
-                # Fill the form
-                exam_select = wait.until(EC.element_to_be_clickable((By.ID, "exm_code")))
-                exam_select.send_keys("Bachelor Degree (Honours) 1st Year")
-
-                group_select = driver.find_element(By.ID, "course")
-                group_select.send_keys(group)
-
-                reg_input = driver.find_element(By.ID, "reg_no")
-                reg_input.clear()
-                reg_input.send_keys(str(reg_no))
-
-                year_input = driver.find_element(By.ID, "exm_year")
-                year_input.clear()
-                year_input.send_keys(year)
-
-                submit_button = driver.find_element(By.NAME, "submit")
-                submit_button.click()
-
-                # Wait for result
-                wait.until(EC.url_contains("result_show.php"))
-                page_source = driver.page_source
-
-                if "ERROR ! YOU'VE PROVIDED WRONG INFORMATION" in page_source:
-                    return {
-                        "Registration No": str(reg_no),
-                        "Name": "This Student Is Not Registered",
-                        "Exam Roll": "",
-                        "Result": "",
-                        "Grades": [],
-                        "Published Date": "",
-                        "Group": group,
-                        "Year": year
-                    }
-
-                # Extract result data
-                try:
-                    result_element = driver.find_element(By.XPATH, "//div[contains(@class,'result') or contains(@id,'result') or //table]")
-                    result_data = self.extract_result_data(result_element.text, str(reg_no))
-                    result_data.update({
-                        "Group": group,
-                        "Year": year
-                    })
-                    return result_data
-                except:
-                    return {
-                        "Registration No": str(reg_no),
-                        "Name": "Result Format Not Recognized",
-                        "Exam Roll": "",
-                        "Result": "",
-                        "Grades": [],
-                        "Published Date": "",
-                        "Group": group,
-                        "Year": year
-                    }
-
-            except (TimeoutException, WebDriverException) as e:
+                page = fetcher.fetch(reg_no, group, year, exam)  # ThrottledFetcher times "wait" and "fetch"
+            except CacheMiss:
+                return self.status_result(reg_no, FAILED, group, year, exam)
+            except FetchError:
                 attempts += 1
                 if attempts == max_attempts:
                     console.print(f"⚠️ Failed after {max_attempts} attempts for {reg_no}", style="bold red")
-                    return {
-                        "Registration No": str(reg_no),
-                        "Name": "Failed to retrieve",
-                        "Exam Roll": "",
-                        "Result": "",
-                        "Grades": [],
-                        "Published Date": "",
-                        "Group": group,
-                        "Year": year
-                    }
-                time.sleep(3)  # Wait before retrying
+                    return self.status_result(reg_no, FAILED, group, year, exam)
+                delay = backoff_delay(attempts)
+                self.metrics.count("retries")
+                self.metrics.observe("backoff", delay)
+                time.sleep(delay)  # Back off before retrying
+                continue
+
+            if NOT_REGISTERED_MARKER in page.source:
+                return self.status_result(reg_no, NOT_REGISTERED, group, year, exam)
+
+            # Extract result data straight from the page HTML
+            try:
+                with self.metrics.timer("parse"):
+                    result_data = parse_result(page.source, str(reg_no), self.parser)
+                result_data.update({
+                    "Group": group,
+                    "Year": year,
+                    "Exam": exam
+                })
+                return result_data
+            except PARSE_ERRORS:
+                return self.status_result(reg_no, NOT_RECOGNIZED, group, year, exam)
+
+    def status_result(self, reg_no, status, group, year, exam=DEFAULT_EXAM):
+        """Build the placeholder record for a registration without a result"""
+        return {
+            "Registration No": str(reg_no),
+            "Name": status,
+            "Exam Roll": "",
+            "Result": "",
+            "Grades": [],
+            "Published Date": "",
+            "Group": group,
+            "Year": year,
+            "Exam": exam
+        }
 
     def extract_result_data(self, text, reg_no):
-        """Extract data from result page"""
+        """Extract data from rendered result text (legacy path, see result_parser.parse_result)"""
         data = {
             "Name": "",
             "Exam Roll": "",
@@ -257,42 +504,132 @@ class ResultScraper:
         return data
 
     def save_to_csv(self, data):
-        """Save data to CSV with all fields"""
-        self.ensure_directory_exists(os.path.dirname(self.INPUT_CSV))
+        """Save data to CSV with all fields, streaming any iterable of results"""
         try:
-            with open(self.INPUT_CSV, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    'Registration No', 'Name', 'Exam Roll', 'Result',
-                    'Published Date', 'Courses', 'Grades', 'Group', 'Year'
-                ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-
+            with CsvStreamWriter(self.INPUT_CSV) as writer:
                 for student in data:
-                    courses = ", ".join([grade['Course Code'] for grade in student['Grades']])
-                    grades = ", ".join([grade['Grade'] for grade in student['Grades']])
-
-                    writer.writerow({
-                        'Registration No': student['Registration No'],
-                        'Name': student['Name'],
-                        'Exam Roll': student['Exam Roll'],
-                        'Result': student['Result'],
-                        'Published Date': student['Published Date'],
-                        'Courses': courses,
-                        'Grades': grades,
-                        'Group': student.get('Group', ''),
-                        'Year': student.get('Year', '')
-                    })
+                    writer.write(student)
             return True
         except Exception as e:
             console.print(f"❌ Error saving CSV: {str(e)}", style="bold red")
             return False
 
+    def export_csv(self, jobs):
+        """Export the stored results of a run's jobs to the CSV consumed by RankingCreator"""
+        store = ResultStore(self.STORE_DB)
+        selections = [dict(group=job.group, year=job.year, exam=job.exam, start_reg=job.start, end_reg=job.end)
+                      for job in jobs]
+        try:
+            return store.export_csv(self.INPUT_CSV, selections) > 0
+        except Exception as e:
+            console.print(f"❌ Error saving CSV: {str(e)}", style="bold red")
+            return False
+        finally:
+            store.close()
+
     def ensure_directory_exists(self, directory):
         """Ensure directory exists"""
         os.makedirs(directory, exist_ok=True)
         return directory
 
+def add_scrape_arguments(parser):
+    """Scraper options shared by results.py and the students.py subcommands
+
+    Scraper settings default to None so values from a job file are only overridden when given.
+    """
+    parser.add_argument("--jobs", metavar="FILE", help="YAML/JSON job file with many (group, year, exam, range) jobs")
+    parser.add_argument("--group", nargs="+", choices=GROUPS,
+                        help="Group(s) to scrape (prompted for if no job is given)")
+    parser.add_argument("--year", nargs="+", help="Examination year(s), e.g. 2022 2023")
+    parser.add_argument("--start", help="First registration number")
+    parser.add_argument("--end", help="Last registration number")
+    parser.add_argument("--exam", nargs="+", default=[DEFAULT_EXAM],
+                        help=f"Exam name(s); every exam x group x year is scraped (default: {DEFAULT_EXAM})")
+    parser.add_argument("--csv", default=os.path.join(".", "results", "nu_results.csv"),
+                        help="Results CSV (default: ./results/nu_results.csv)")
+    parser.add_argument("--columnar", action="store_true", default=None,
+                        help="Also write the results as a columnar .cols directory next to the CSV (needs NumPy)")
+    parser.add_argument("--backend", choices=["http", "selenium"],
+                        help="Page fetch backend (default: http; selenium drives headless Chrome, chosen manually)")
+    parser.add_argument("--base-url", help="Result server address")
+    parser.add_argument("--workers", type=int, help="Parallel workers (default: 4)")
+    parser.add_argument("--rate", type=float, help="Requests per second across all workers (default: 2)")
+    parser.add_argument("--burst", type=int, help="Rate limiter burst size (default: 4)")
+    parser.add_argument("--driver-max-uses", type=int,
+                        help="Recycle each Chrome driver after this many requests (default: 200)")
+    parser.add_argument("--parser", choices=PARSERS,
+                        help=f"Result page parser (default: {DEFAULT_PARSER}, lxml needs lxml)")
+    parser.add_argument("--cache", nargs="?", const=DEFAULT_CACHE, dest="cache_path", metavar="PATH",
+                        help="Reuse fetched pages from an on-disk cache (default path: ./results/page_cache.db)")
+    parser.add_argument("--cache-ttl", type=float, metavar="HOURS",
+                        help=f"Refetch cached pages older than this (default: {DEFAULT_TTL // 3600}, ignored by --from-cache)")
+    parser.add_argument("--cache-size", type=float, metavar="MB",
+                        help=f"Evict least recently used pages above this size (default: {DEFAULT_MAX_BYTES // 1024 ** 2})")
+    parser.add_argument("--from-cache", action="store_true", dest="offline",
+                        help="Offline: serve pages only from the cache, uncached ones are marked failed")
+    parser.add_argument("--adaptive", action=argparse.BooleanOptionalAction,
+                        help="Back off concurrency and rate when the server slows down or fails, with a "
+                             "circuit breaker that pauses the run (default: on; --workers/--rate are the maximum)")
+    parser.add_argument("--quiet", dest="verbose", action="store_false", default=None,
+                        help="Do not print a line per registration (faster on long runs)")
+    parser.add_argument("--report", dest="report_path", metavar="PATH",
+                        help="JSON run report with stage latencies (default: ./results/nu_results_report.json)")
+    parser.add_argument("--prometheus", dest="prometheus_path", metavar="PATH",
+                        help="Also write the run metrics in Prometheus text format")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip registrations already stored and retry only failed ones")
+    parser.add_argument("--recheck-unregistered", action="store_true", default=None,
+                        help="Fetch registrations stored as not registered again, e.g. when they were scraped "
+                             "before the results were published")
+    parser.add_argument("--discover", action="store_true",
+                        help="Sample the range coarsely and only sweep bands of registered students")
+    parser.add_argument("--shard", metavar="I/N",
+                        help="Scrape only shard I of N of every range, into per-shard CSV and store files "
+                             "(combine them with `shards.py merge`)")
+    parser.add_argument("--shard-mode", choices=SHARD_MODES, default="interleaved",
+                        help="Split ranges into every N-th registration or N contiguous blocks (default: interleaved)")
+    parser.add_argument("--stride", type=int, dest="probe_stride", help="Discovery sampling stride (default: 100)")
+    parser.add_argument("--gap", type=int, dest="probe_gap",
+                        help="Consecutive unregistered numbers that end a band (default: 100)")
+    return parser
+
+
+def jobs_from_args(args):
+    """Return (jobs, scraper) for parsed add_scrape_arguments options; jobs is None for interactive input"""
+    jobs, options = None, {}
+    if args.jobs:
+        jobs, options = load_jobs(args.jobs)
+    elif any(value is not None for value in (args.group, args.year, args.start, args.end)):
+        if None in (args.group, args.year, args.start, args.end):
+            raise ValueError("--group, --year, --start and --end must be given together")
+        jobs = expand_jobs(args.group, args.year, args.start, args.end, args.exam)
+
+    options.update({key: getattr(args, key) for key in OPTIONS if getattr(args, key) is not None})
+    if args.cache_ttl is not None:
+        options['cache_ttl'] = args.cache_ttl * 3600
+    if args.cache_size is not None:
+        options['cache_max_bytes'] = int(args.cache_size * 1024 ** 2)
+    if args.offline:
+        options['offline'] = True
+    if args.shard:
+        options['shard'] = parse_shard(args.shard, args.shard_mode)
+    return jobs, ResultScraper(args.csv, **options)
+
+
+def run_from_args(args):
+    """Scrape the jobs given on the command line, or prompt for one"""
+    try:
+        jobs, scraper = jobs_from_args(args)
+    except (OSError, ValueError) as e:
+        console.print(f"❌ Error: {e}", style="bold red")
+        return False
+    if jobs is None:
+        return scraper.run_data_collection(resume=args.resume, discover=args.discover)
+    return scraper.run_jobs(jobs, resume=args.resume, discover=args.discover)
+
+
 if __name__ == "__main__":
-    scraper = ResultScraper()
-    scraper.run_data_collection()
+    parser = add_scrape_arguments(argparse.ArgumentParser(description="Collect National University results"))
+    args = parser.parse_args()
+
+    sys.exit(0 if run_from_args(args) else 1)
@@ -0,0 +1,273 @@
+# version: 2.1
+
+import os
+import time
+import sqlite3
+import argparse
+from collections import namedtuple
+from rich.console import Console
+from rich.table import Table
+from store import DEFAULT_DB, ResultStore
+
+console = Console()
+
+SHARD_MODES = ("interleaved", "blocked")
+
+# Shard `index` of `count` (1-based). Interleaved shards take every count-th registration, so a
+# shard that stops early leaves gaps spread over the whole range; blocked shards take one
+# contiguous block, which discovery mode needs to find bands of registered students.
+Shard = namedtuple("Shard", ["index", "count", "mode"])
+
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shard_jobs (
+    grp         TEXT NOT NULL,
+    year        TEXT NOT NULL,
+    exam        TEXT NOT NULL,
+    start_reg   INTEGER NOT NULL,
+    end_reg     INTEGER NOT NULL,
+    shard       INTEGER NOT NULL,
+    shards      INTEGER NOT NULL,
+    mode        TEXT NOT NULL,
+    discover    INTEGER NOT NULL,
+    started     REAL NOT NULL,
+    completed   REAL,
+    PRIMARY KEY (grp, year, exam, start_reg, end_reg)
+)
+"""
+
+# A stored row replaces another for the same key unless it is a failure replacing a result
+MERGE_ROWS = """
+INSERT INTO main.results SELECT * FROM shard.results WHERE true
+ON CONFLICT (reg_no, grp, year, exam) DO UPDATE SET
+    status = excluded.status, name = excluded.name, exam_roll = excluded.exam_roll,
+    result = excluded.result, published = excluded.published, courses = excluded.courses,
+    grades = excluded.grades, updated = excluded.updated
+WHERE excluded.status != 'failed' AND (results.status = 'failed' OR excluded.updated > results.updated)
+"""
+
+
+def parse_shard(spec, mode="interleaved"):
+    """Shard from an "i/n" spec, raising ValueError with a readable message"""
+    index, _, count = str(spec).partition("/")
+    if not (index.strip().isdigit() and count.strip().isdigit()):
+        raise ValueError(f"Invalid shard {spec!r}, expected i/n, e.g. 2/4")
+    index, count = int(index), int(count)
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid shard {spec!r}, i must be between 1 and n")
+    if mode not in SHARD_MODES:
+        raise ValueError(f"Unknown shard mode {mode!r}, expected one of {', '.join(SHARD_MODES)}")
+    return Shard(index, count, mode)
+
+
+def shard_block(shard, start_reg, end_reg):
+    """(first, last) of the shard's contiguous block; first > last when the block is empty"""
+    span = end_reg - start_reg + 1
+    return (start_reg + span * (shard.index - 1) // shard.count,
+            start_reg + span * shard.index // shard.count - 1)
+
+
+def shard_registrations(shard, start_reg, end_reg):
+    """The shard's registrations of a range, as a range object"""
+    if shard.mode == "blocked":
+        first, last = shard_block(shard, start_reg, end_reg)
+        return range(first, last + 1)
+    return range(start_reg + shard.index - 1, end_reg + 1, shard.count)
+
+
+def shard_path(path, shard):
+    """Per-shard file next to `path`, e.g. results/nu_results.shard-2-of-4.csv"""
+    base, extension = os.path.splitext(path)
+    return f"{base}.shard-{shard.index}-of-{shard.count}{extension}"
+
+
+def start_jobs(conn, shard, jobs, discover=False):
+    """Record in a shard's store which jobs it is running; completed stays empty until finish_jobs"""
+    conn.execute(LEDGER_SCHEMA)
+    mode = "blocked" if discover else shard.mode
+    conn.executemany("INSERT OR REPLACE INTO shard_jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)",
+                     [(job.group, job.year, job.exam, job.start, job.end, shard.index, shard.count, mode,
+                       int(discover), time.time()) for job in jobs])
+    conn.commit()
+
+
+def finish_jobs(conn, jobs):
+    conn.executemany("UPDATE shard_jobs SET completed = ? WHERE grp = ? AND year = ? AND exam = ? "
+                     "AND start_reg = ? AND end_reg = ?",
+                     [(time.time(), job.group, job.year, job.exam, job.start, job.end) for job in jobs])
+    conn.commit()
+
+
+def _ranges(numbers, limit=5):
+    """Compact "a-b, c, ..." text for sorted registration numbers"""
+    runs = []
+    for number in numbers:
+        if runs and number == runs[-1][1] + 1:
+            runs[-1][1] = number
+        else:
+            runs.append([number, number])
+    text = ", ".join(f"{first}-{last}" if first != last else str(first) for first, last in runs[:limit])
+    return text + (f" and {len(runs) - limit} more" if len(runs) > limit else "")
+
+
+class ShardMerge:
+    """Combine shard stores into one result store and check that the shards covered every job"""
+
+    def __init__(self, output=DEFAULT_DB):
+        self.store = ResultStore(output)
+        self.jobs = {}      # (group, year, exam, start, end) -> {shard index: ledger row}
+        self.read = 0       # Rows read from the shard stores
+        self.added = 0      # Rows new to the merged store, the rest replaced or kept an existing row
+        self.problems = []
+
+    def add(self, path):
+        """Merge one shard store, return the number of rows it holds"""
+        if not os.path.exists(path):
+            raise ValueError(f"{path}: no such shard store")
+        conn = self.store.conn
+        conn.execute("ATTACH DATABASE ? AS shard", (path,))
+        try:
+            tables = {name for (name,) in conn.execute("SELECT name FROM shard.sqlite_master WHERE type = 'table'")}
+            if "shard_jobs" not in tables:
+                raise ValueError(f"{path}: not a shard store (scrape with --shard i/n)")
+            for row in conn.execute("SELECT grp, year, exam, start_reg, end_reg, shard, shards, mode, discover, "
+                                    "completed FROM shard.shard_jobs"):
+                shards = self.jobs.setdefault(row[:5], {})
+                if row[5] in shards:
+                    self.problems.append(f"{self.label(row[:5])}: shard {row[5]}/{row[6]} given twice")
+                shards[row[5]] = row[5:] + (path,)
+            count, = conn.execute("SELECT COUNT(*) FROM shard.results").fetchone()
+            before, = conn.execute("SELECT COUNT(*) FROM main.results").fetchone()
+            conn.execute(MERGE_ROWS)
+            conn.commit()
+            after, = conn.execute("SELECT COUNT(*) FROM main.results").fetchone()
+        finally:
+            conn.execute("DETACH DATABASE shard")
+        self.read += count
+        self.added += after - before
+        return count
+
+    @staticmethod
+    def label(key):
+        group, year, exam, start, end = key
+        return f"{group} {year} {exam} {start}-{end}"
+
+    def validate(self):
+        """Check every job's shards and registrations; return a list of (job, shards, covered, missing, failed)"""
+        coverage = []
+        for key, shards in sorted(self.jobs.items()):
+            group, year, exam, start, end = key
+            counts = {row[1] for row in shards.values()}
+            modes = {row[2] for row in shards.values()}
+            if len(counts) > 1 or len(modes) > 1:
+                self.problems.append(f"{self.label(key)}: shards disagree on the split "
+                                     f"({', '.join(f'{row[0]}/{row[1]} {row[2]}' for row in shards.values())})")
+            count = max(counts)
+            absent = [index for index in range(1, count + 1) if index not in shards]
+            if absent:
+                self.problems.append(f"{self.label(key)}: shard(s) {', '.join(f'{i}/{count}' for i in absent)} missing")
+            unfinished = [f"{index}/{count} ({row[5]})" for index, row in sorted(shards.items()) if row[4] is None]
+            if unfinished:
+                self.problems.append(f"{self.label(key)}: shard(s) {', '.join(unfinished)} did not finish, "
+                                     "rerun them with --resume")
+
+            stored = {}
+            for reg_no, status in self.store.conn.execute(
+                    "SELECT CAST(reg_no AS INTEGER), status FROM results WHERE grp = ? AND year = ? AND exam = ? "
+                    "AND CAST(reg_no AS INTEGER) BETWEEN ? AND ?", (group, year, exam, start, end)):
+                stored[reg_no] = status
+            failed = sorted(reg_no for reg_no, status in stored.items() if status == "failed")
+            if any(row[3] for row in shards.values()):
+                missing = []  # Discovery only samples unregistered stretches, there is nothing to count
+            else:
+                missing = [reg_no for reg_no in range(start, end + 1) if reg_no not in stored]
+                if missing:
+                    self.problems.append(f"{self.label(key)}: {len(missing)} registration(s) never fetched: "
+                                         f"{_ranges(missing)}")
+            if failed:
+                self.problems.append(f"{self.label(key)}: {len(failed)} registration(s) failed: {_ranges(failed)}, "
+                                     "rerun their shards with --resume")
+            coverage.append((key, f"{len(shards)}/{count}", len(stored) - len(failed), len(missing), len(failed)))
+        return coverage
+
+    def export_csv(self, csv_path):
+        """Write every merged job's results to the CSV used for ranking"""
+        selections = [dict(group=group, year=year, exam=exam, start_reg=start, end_reg=end)
+                      for group, year, exam, start, end in sorted(self.jobs)]
+        return self.store.export_csv(csv_path, selections)
+
+    def close(self):
+        self.store.close()
+
+
+def coverage_table(coverage):
+    table = Table(title="Shard coverage")
+    for column in ("Group", "Year", "Exam", "Range", "Shards", "Stored", "Missing", "Failed"):
+        table.add_column(column)
+    for (group, year, exam, start, end), shards, stored, missing, failed in coverage:
+        table.add_row(group, year, exam, f"{start}-{end}", shards, str(stored), str(missing), str(failed))
+    return table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plan sharded scrapes and merge their result stores")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    plan = commands.add_parser("plan", help="Show the registrations each shard of a range scrapes")
+    plan.add_argument("--start", type=int, required=True, help="First registration number")
+    plan.add_argument("--end", type=int, required=True, help="Last registration number")
+    plan.add_argument("--shards", type=int, required=True, help="Number of shards")
+    plan.add_argument("--shard-mode", choices=SHARD_MODES, default="interleaved")
+
+    merge = commands.add_parser("merge", help="Merge shard stores, validate coverage and export the CSV")
+    merge.add_argument("stores", nargs="+", help="Shard result stores, e.g. results/nu_results.shard-*-of-4.db")
+    merge.add_argument("--db", default=DEFAULT_DB, help="Merged result store (default: ./results/nu_results.db)")
+    merge.add_argument("--csv", default=os.path.join(".", "results", "nu_results.csv"),
+                       help="CSV written for ranking once coverage is complete (default: ./results/nu_results.csv)")
+    merge.add_argument("--allow-gaps", action="store_true", help="Export the CSV even if coverage is incomplete")
+    merge.add_argument("--rank", action="store_true", help="Generate the ranking reports after exporting")
+    args = parser.parse_args()
+
+    if args.command == "plan":
+        if args.start > args.end or args.shards < 1:
+            console.print("Error: need --start <= --end and at least one shard", style="bold red")
+            raise SystemExit(1)
+        table = Table(title=f"{args.shards} {args.shard_mode} shard(s) of {args.start}-{args.end}")
+        for column in ("Shard", "Registrations", "Count"):
+            table.add_column(column)
+        for index in range(1, args.shards + 1):
+            registrations = shard_registrations(Shard(index, args.shards, args.shard_mode), args.start, args.end)
+            if not registrations:
+                described = "-"
+            elif registrations.step == 1:
+                described = f"{registrations.start}-{registrations[-1]}"
+            else:
+                described = f"{registrations.start}, {registrations.start + registrations.step}, ... {registrations[-1]}"
+            table.add_row(f"--shard {index}/{args.shards}", described, str(len(registrations)))
+        console.print(table)
+        raise SystemExit(0)
+
+    merger = ShardMerge(args.db)
+    try:
+        for path in args.stores:
+            console.print(f"Merged {merger.add(path)} rows from {path}", style="bold green")
+        coverage = merger.validate()
+        console.print(coverage_table(coverage))
+        console.print(f"{merger.read} rows read, {merger.added} new to {args.db}, "
+                      f"{merger.read - merger.added} already stored or duplicated", style="bold green")
+        for problem in merger.problems:
+            console.print(f"❌ {problem}", style="bold red")
+        if merger.problems and not args.allow_gaps:
+            console.print("Coverage is incomplete, the CSV was not written (--allow-gaps to export anyway)",
+                          style="bold red")
+            raise SystemExit(1)
+        count = merger.export_csv(args.csv)
+        console.print(f"Exported {count} results to {args.csv}", style="bold green")
+    except (OSError, ValueError, sqlite3.Error) as e:
+        console.print(f"Error: {e}", style="bold red")
+        raise SystemExit(1)
+    finally:
+        merger.close()
+
+    if args.rank:
+        from rank import RankingCreator
+        RankingCreator(args.csv).generate_rankings()
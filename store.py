@@ -0,0 +1,198 @@
+# version: 2.0
+
+import os
+import csv
+import time
+import sqlite3
+import argparse
+from rich.console import Console
+
+console = Console()
+
+DEFAULT_DB = os.path.join(".", "results", "nu_results.db")
+CSV_FIELDS = [
+    'Registration No', 'Name', 'Exam Roll', 'Result',
+    'Published Date', 'Courses', 'Grades', 'Group', 'Year', 'Exam'
+]
+
+# Placeholder names written for registrations without a result
+NOT_REGISTERED = "This Student Is Not Registered"
+NOT_RECOGNIZED = "Result Format Not Recognized"
+FAILED = "Failed to retrieve"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    reg_no      TEXT NOT NULL,
+    grp         TEXT NOT NULL,
+    year        TEXT NOT NULL,
+    exam        TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    name        TEXT,
+    exam_roll   TEXT,
+    result      TEXT,
+    published   TEXT,
+    courses     TEXT,
+    grades      TEXT,
+    updated     REAL,
+    PRIMARY KEY (reg_no, grp, year, exam)
+)
+"""
+
+
+def result_status(name):
+    """Classify a result record by its Name placeholder"""
+    if NOT_REGISTERED in name:
+        return "not_registered"
+    if NOT_RECOGNIZED in name:
+        return "unrecognized"
+    if FAILED in name:
+        return "failed"
+    return "ok"
+
+
+def csv_row(student):
+    """Flatten a result dict into a nu_results.csv row"""
+    return {
+        'Registration No': student['Registration No'],
+        'Name': student['Name'],
+        'Exam Roll': student['Exam Roll'],
+        'Result': student['Result'],
+        'Published Date': student['Published Date'],
+        'Courses': ", ".join([grade['Course Code'] for grade in student['Grades']]),
+        'Grades': ", ".join([grade['Grade'] for grade in student['Grades']]),
+        'Group': student.get('Group', ''),
+        'Year': student.get('Year', ''),
+        'Exam': student.get('Exam', '')
+    }
+
+
+class CsvStreamWriter:
+    """Stream result rows to a CSV, flushing in small batches so partial output stays readable"""
+
+    def __init__(self, csv_path, batch_size=50):
+        directory = os.path.dirname(csv_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.batch_size = max(1, int(batch_size))
+        self.buffer = []
+        self.count = 0
+        self.file = open(csv_path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=CSV_FIELDS)
+        self.writer.writeheader()
+        self.file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, student):
+        """Queue one result dict, flushing once a batch is full"""
+        self.buffer.append(csv_row(student))
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.writer.writerows(self.buffer)
+            self.count += len(self.buffer)
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+class ResultStore:
+    """Durable per-registration result store backed by SQLite"""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(SCHEMA)
+        self.conn.commit()
+
+    def save(self, student, exam):
+        """Commit one fetched result, replacing any earlier attempt for the same key"""
+        row = csv_row(student)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (row['Registration No'], row['Group'], row['Year'], exam,
+             result_status(row['Name']), row['Name'], row['Exam Roll'], row['Result'],
+             row['Published Date'], row['Courses'], row['Grades'], time.time())
+        )
+        self.conn.commit()
+
+    def completed(self, group, year, exam, start_reg, end_reg, status=None):
+        """Registration numbers in the range that no longer need fetching (or that have `status`)"""
+        condition = "status = ?" if status else "status != ?"
+        rows = self.conn.execute(
+            f"SELECT reg_no FROM results WHERE grp = ? AND year = ? AND exam = ? "
+            f"AND {condition} AND CAST(reg_no AS INTEGER) BETWEEN ? AND ?",
+            (group, year, exam, status or "failed", start_reg, end_reg)
+        )
+        return {int(reg_no) for (reg_no,) in rows}
+
+    def rows(self, group=None, year=None, exam=None, start_reg=None, end_reg=None):
+        """Yield stored results as CSV rows, ordered by group, year and registration"""
+        query = ("SELECT reg_no, name, exam_roll, result, published, courses, grades, grp, year, exam "
+                 "FROM results WHERE 1 = 1")
+        params = []
+        for column, value in (("grp", group), ("year", year), ("exam", exam)):
+            if value is not None:
+                query += f" AND {column} = ?"
+                params.append(value)
+        if start_reg is not None:
+            query += " AND CAST(reg_no AS INTEGER) >= ?"
+            params.append(start_reg)
+        if end_reg is not None:
+            query += " AND CAST(reg_no AS INTEGER) <= ?"
+            params.append(end_reg)
+        query += " ORDER BY grp, year, exam, CAST(reg_no AS INTEGER)"
+
+        for row in self.conn.execute(query, params):
+            yield dict(zip(CSV_FIELDS, row))
+
+    def export_csv(self, csv_path, selections=None, **filters):
+        """Write stored results to the CSV consumed by RankingCreator
+
+        `selections` is a list of filter dicts (one per scraping job) exported one after another.
+        """
+        directory = os.path.dirname(csv_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        count = 0
+        with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            for selection in selections or [filters]:
+                for row in self.rows(**selection):
+                    writer.writerow(row)
+                    count += 1
+        return count
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export stored results to nu_results.csv")
+    parser.add_argument("--db", default=DEFAULT_DB, help="Result store path")
+    parser.add_argument("--csv", default=os.path.join(".", "results", "nu_results.csv"), help="CSV output path")
+    parser.add_argument("--group", help="Only export this group (e.g. B.Sc)")
+    parser.add_argument("--year", help="Only export this exam year")
+    parser.add_argument("--exam", help="Only export this exam, e.g. \"Bachelor Degree (Honours) 2nd Year\"")
+    args = parser.parse_args()
+
+    store = ResultStore(args.db)
+    count = store.export_csv(args.csv, group=args.group, year=args.year, exam=args.exam)
+    store.close()
+    console.print(f"Exported {count} results to {args.csv}", style="bold green")
@@ -1,8 +1,7 @@
-# version: 2.0
+# version: 2.1
 import os
-import time
-from results import ResultScraper
-from rank import RankingCreator
+import sys
+import argparse
 from colorama import init, Fore, Style
 from rich.console import Console
 from rich.table import Table
@@ -42,7 +41,9 @@ def main():
             # Add separator between operations
             console.print("\n" + "="*50, style="bold blue")
 
+    # Imported on use so the rank-only paths never load the scraper modules
     def scrape_results():
+        from results import ResultScraper
         scraper = ResultScraper()
         if scraper.run_data_collection():
             console.print("\nResult collection completed successfully!", style="bold green")
@@ -50,18 +51,86 @@ def main():
             console.print("\nResult collection encountered issues", style="bold red")
 
     def generate_rankings():
+        from rank import RankingCreator
         creator = RankingCreator()
         creator.generate_rankings()
 
     def scrape_and_generate_rankings():
+        from results import ResultScraper
+        from rank import RankingCreator
+        from pipeline import scrape_and_rank
         scraper = ResultScraper()
-        if scraper.run_data_collection():
-            time.sleep(1)  # Brief pause
-            console.print("\nProceeding to generate rankings...", style="bold green")
-            creator = RankingCreator()
-            creator.generate_rankings()
+        # Results are ranked as they arrive, only the reports are left once the scrape ends
+        scrape_and_rank(scraper, RankingCreator(), scraper.run_data_collection)
 
     show_menu()
 
+def parse_args(argv):
+    """Parse subcommand arguments, importing only the modules the chosen command needs"""
+    parser = argparse.ArgumentParser(description="National University Result Processing System "
+                                                 "(interactive menu when no command is given)")
+    commands = parser.add_subparsers(dest="command", metavar="{scrape,rank,pipeline}")
+    scrape = commands.add_parser("scrape", help="Collect results for one range or a job file")
+    rank = commands.add_parser("rank", help="Generate ranking reports from the results CSV")
+    pipeline = commands.add_parser("pipeline", help="Scrape and rank the collected results")
+
+    command = argv[0] if argv else None
+    if command in ("scrape", "pipeline"):
+        from results import add_scrape_arguments
+        add_scrape_arguments(scrape if command == "scrape" else pipeline)
+    if command in ("rank", "pipeline"):
+        from rank import add_rank_arguments
+        add_rank_arguments(rank if command == "rank" else pipeline, input_csv=command == "rank")
+    if command == "pipeline":
+        from pipeline import add_pipeline_arguments
+        add_pipeline_arguments(pipeline)
+    return parser.parse_args(argv)
+
+def run_pipeline(args):
+    """Scrape and rank in one pass, ranking every result as it arrives"""
+    from results import jobs_from_args
+    from rank import creator_from_args
+    from pipeline import scrape_and_rank
+    try:
+        jobs, scraper = jobs_from_args(args)
+    except (OSError, ValueError) as e:
+        console.print(f"❌ Error: {e}", style="bold red")
+        return False
+    if jobs is None:
+        run = lambda: scraper.run_data_collection(discover=args.discover)
+    else:
+        run = lambda: scraper.run_jobs(jobs, discover=args.discover)
+    return scrape_and_rank(scraper, creator_from_args(args, args.csv), run, args.top, args.top_every)
+
+def run_command(args):
+    """Run a non-interactive subcommand, return True on success"""
+    if args.command == "pipeline" and args.shard:
+        console.print("❌ A shard holds part of every group: scrape the shards, then rank with "
+                      "`shards.py merge --rank`", style="bold red")
+        return False
+    if args.command == "pipeline" and args.stream and not args.resume:
+        return run_pipeline(args)
+    if args.command in ("scrape", "pipeline"):
+        from results import run_from_args
+        if not run_from_args(args):
+            return False
+        if args.command == "scrape":
+            return True
+        console.print("\nProceeding to generate rankings...", style="bold green")
+
+    from rank import creator_from_args
+    input_csv = None
+    if args.command == "pipeline":
+        from columnar import columnar_path, is_columnar
+        # Rank from the columnar copy when the scrape wrote one
+        input_csv = columnar_path(args.csv) if args.columnar and is_columnar(columnar_path(args.csv)) else args.csv
+    creator = creator_from_args(args, input_csv)
+    creator.generate_rankings()
+    return True
+
 if __name__ == "__main__":
-    main()
+    args = parse_args(sys.argv[1:])
+    if args.command is None:
+        main()
+    else:
+        sys.exit(0 if run_command(args) else 1)
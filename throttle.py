@@ -0,0 +1,231 @@
+# version: 2.1
+
+import time
+import random
+import threading
+from collections import deque
+
+
+def backoff_delay(attempt, base=1.0, cap=30.0):
+    """Exponential backoff with full jitter for the given retry attempt (1-based)"""
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by all scraping workers"""
+
+    def __init__(self, rate=2.0, burst=4):
+        if rate <= 0:
+            raise ValueError("Rate must be a positive number of requests per second")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def set_rate(self, rate):
+        """Change the refill rate, keeping the tokens earned at the old rate"""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+
+    def acquire(self):
+        """Block until a request may be sent, return the time spent waiting"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class AimdController:
+    """Additive-increase / multiplicative-decrease control of in-flight requests and request rate
+
+    Concurrency and rate never exceed their configured values; they are cut when errors rise or
+    recent latency climbs well above its long-run average, and grown back step by step while the
+    server is healthy.
+    """
+
+    def __init__(self, rate_limiter, max_concurrency, min_concurrency=1, min_rate=None, window=10,
+                 error_threshold=0.1, latency_factor=2.0, log=None):
+        self.rate_limiter = rate_limiter
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.min_concurrency = max(1, min(int(min_concurrency), self.max_concurrency))
+        self.max_rate = rate_limiter.rate
+        self.min_rate = min_rate or self.max_rate / 16
+        self.window = max(1, int(window))
+        self.error_threshold = error_threshold
+        self.latency_factor = latency_factor
+        self.log = log or (lambda message: None)
+
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.samples = []
+        self.smoothed = None  # Recent latency (fast moving average)
+        self.baseline = None  # Long-run latency (slow moving average)
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        """Block until one more request may be in flight"""
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+
+    def release(self, latency, ok):
+        """Report a finished request; adjusts the limits once per window of results"""
+        with self.condition:
+            self.in_flight -= 1
+            self.samples.append((latency, ok))
+            if ok:
+                if self.smoothed is None:
+                    self.smoothed = self.baseline = latency
+                self.smoothed += 0.2 * (latency - self.smoothed)
+                self.baseline += 0.02 * (latency - self.baseline)
+            if len(self.samples) >= self.window:
+                self._adjust()
+            self.condition.notify_all()
+
+    def _adjust(self):
+        errors = sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+        slow = self.smoothed is not None and self.smoothed > self.baseline * self.latency_factor
+        self.samples = []
+
+        if errors > self.error_threshold:
+            self._scale(0.5, f"error rate {errors:.0%}")
+        elif slow:
+            self._scale(0.75, f"latency {self.smoothed * 1000:.0f} ms vs. average {self.baseline * 1000:.0f} ms")
+        elif self.limit < self.max_concurrency or self.rate_limiter.rate < self.max_rate:
+            limit = min(self.max_concurrency, self.limit + 1)
+            rate = min(self.max_rate, self.rate_limiter.rate + self.max_rate / 10)
+            self._set(limit, rate, "healthy, increasing")
+
+    def _scale(self, factor, reason):
+        limit = max(self.min_concurrency, self.limit * factor)
+        rate = max(self.min_rate, self.rate_limiter.rate * factor)
+        self._set(limit, rate, f"{reason}, decreasing")
+
+    def _set(self, limit, rate, reason):
+        if int(limit) == int(self.limit) and abs(rate - self.rate_limiter.rate) < 1e-9:
+            return
+        self.limit = limit
+        self.rate_limiter.set_rate(rate)
+        self.log(f"{reason}: concurrency {int(limit)}, rate {rate:.2f}/s")
+
+
+class CircuitBreaker:
+    """Pause every worker when the failure rate spikes, then let a single probe request test the server"""
+
+    def __init__(self, threshold=0.5, window=20, min_samples=10, cooldown=30.0, max_cooldown=300.0, log=None):
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.log = log or (lambda message: None)
+        self.results = deque(maxlen=window)
+        self.state = "closed"
+        self.reopen_at = 0.0
+        self.probing = False
+        self.trips = 0
+        self.condition = threading.Condition()
+
+    def wait(self):
+        """Block while the circuit is open; in half-open state only one probe passes at a time
+
+        Returns True when the caller is the probe, whose result alone decides the half-open state.
+        """
+        with self.condition:
+            while True:
+                if self.state == "closed":
+                    return False
+                now = time.monotonic()
+                if self.state == "open":
+                    if now < self.reopen_at:
+                        self.condition.wait(self.reopen_at - now)
+                        continue
+                    self.state = "half_open"
+                    self.log("circuit half-open, probing the server")
+                if not self.probing:
+                    self.probing = True
+                    return True
+                self.condition.wait()
+
+    def record(self, ok, probe=False):
+        """Report the outcome of a request that passed wait(), with the flag wait() returned"""
+        with self.condition:
+            if probe:
+                self.probing = False
+                if ok:
+                    self.state = "closed"
+                    self.cooldown = self.base_cooldown
+                    self.results.clear()
+                    self.log("circuit closed, resuming")
+                else:
+                    self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                    self._open("probe failed")
+                self.condition.notify_all()
+                return
+            if self.state != "closed":
+                return  # Started before the circuit opened, says nothing about the server now
+
+            self.results.append(ok)
+            failures = self.results.count(False)
+            if (len(self.results) >= self.min_samples
+                    and failures / len(self.results) >= self.threshold):
+                self._open(f"failure rate {failures / len(self.results):.0%}")
+
+    def _open(self, reason):
+        self.state = "open"
+        self.trips += 1
+        self.reopen_at = time.monotonic() + self.cooldown
+        self.log(f"circuit open ({reason}), pausing for {self.cooldown:.0f}s")
+
+
+class ThrottledFetcher:
+    """Wrap a backend fetcher with the circuit breaker, rate limiter and concurrency controller"""
+
+    def __init__(self, fetcher, rate_limiter, controller=None, breaker=None, metrics=None):
+        self.fetcher = fetcher
+        self.rate_limiter = rate_limiter
+        self.controller = controller
+        self.breaker = breaker
+        self.metrics = metrics
+        self.name = fetcher.name
+
+    def fetch(self, reg_no, group, year, exam):
+        waiting = time.monotonic()
+        probe = self.breaker.wait() if self.breaker is not None else False
+        ok = False
+        acquired = False
+        started = None
+        try:
+            if self.controller is not None:
+                self.controller.acquire()
+                acquired = True
+            self.rate_limiter.acquire()
+            started = time.monotonic()
+            if self.metrics is not None:
+                # Breaker pause, concurrency slot and token bucket; "fetch" is the backend call alone
+                self.metrics.observe("wait", started - waiting)
+            page = self.fetcher.fetch(reg_no, group, year, exam)
+            ok = True
+            return page
+        finally:
+            elapsed = time.monotonic() - started if started is not None else 0.0
+            if started is not None and self.metrics is not None:
+                self.metrics.observe("fetch", elapsed)
+            if acquired:
+                self.controller.release(elapsed, ok)
+            if self.breaker is not None:
+                self.breaker.record(ok, probe)
+
+    def close(self):
+        self.fetcher.close()